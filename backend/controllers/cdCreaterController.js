@@ -10,6 +10,8 @@ import CD_Section3_Syllabus from "../models/cd/CD_Section3_Syllabus.js";
 import CD_Section4_Resources from "../models/cd/CD_Section4_Resources.js";
 import Admin from "../models/Admin.js";
 import PD from "../models/pd/PD.js";
+import { parseJobHandlers, startParseJob } from "../utils/parseJobs.js";
+import { decodeParserOutput } from "../utils/parserOutput.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -117,9 +119,20 @@ export const uploadAndParseCD = async (req, res) => {
       });
     }
 
-    const pythonProcess = spawn(pythonCommand, [scriptPath, filePath]);
-
-    let dataString = "";
+    const pythonProcess = spawn(pythonCommand, [
+      scriptPath,
+      filePath,
+      "--framed",
+      // Stop reading pages in time to return a partial result before the
+      // 60s kill below.
+      "--deadline-ms",
+      "50000",
+      // One process per upload: cap pathological pages (no RSS ceiling).
+      "--page-limits",
+      "on",
+    ]);
+
+    const stdoutChunks = [];
     let errorString = "";
 
     const timeoutId = setTimeout(() => {
@@ -132,7 +145,7 @@ export const uploadAndParseCD = async (req, res) => {
     }, 60000);
 
     pythonProcess.stdout.on("data", (data) => {
-      dataString += data.toString();
+      stdoutChunks.push(data);
     });
     pythonProcess.stderr.on("data", (data) => {
       errorString += data.toString();
@@ -165,25 +178,20 @@ export const uploadAndParseCD = async (req, res) => {
         });
       }
 
+      const output = Buffer.concat(stdoutChunks);
       try {
-        const jsonStartIndex = dataString.indexOf("{");
-        const jsonEndIndex = dataString.lastIndexOf("}") + 1;
-        if (jsonStartIndex === -1) throw new Error("No JSON found");
-
-        const parsed = JSON.parse(
-          dataString.slice(jsonStartIndex, jsonEndIndex),
-        );
+        const parsed = decodeParserOutput(output);
         if (!parsed.success)
           return res
             .status(400)
             .json({ success: false, message: parsed.message });
 
-        return res.json({ success: true, parsedData: parsed.parsedData });
+        return res.json(cdImportBody(parsed));
       } catch (e) {
         return res.status(500).json({
           success: false,
           message: "Invalid parser response.",
-          raw: dataString,
+          raw: output.toString("utf8"),
         });
       }
     });
@@ -196,6 +204,54 @@ export const uploadAndParseCD = async (req, res) => {
   }
 };
 
+// Response body for a successful parse; `partial` & co. are only present
+// when the parser's deadline cut it short, `throttledPages` when its page
+// guard read pathological pages as text only.
+const cdImportBody = (parsed) => ({
+  success: true,
+  parsedData: parsed.parsedData,
+  partial: parsed.partial,
+  skippedPages: parsed.skippedPages,
+  skippedCDs: parsed.skippedCDs,
+  throttledPages: parsed.throttledPages,
+  warnings: parsed.warnings,
+});
+
+// Async import: returns a job id at once; the client polls
+// /import-jobs/:jobId, listens on /import-jobs/:jobId/events, or cancels.
+export const uploadAndParseCDAsync = async (req, res) => {
+  if (!req.file)
+    return res
+      .status(400)
+      .json({ success: false, message: "No file uploaded" });
+
+  const scriptPath = path.join(__dirname, "..", "scripts", "cd_parser.py");
+  if (!fs.existsSync(scriptPath)) {
+    fs.unlink(req.file.path, () => {});
+    return res.status(500).json({
+      success: false,
+      message: "Parser script not found on server.",
+    });
+  }
+
+  const job = startParseJob({
+    kind: "cd",
+    scriptPath,
+    filePath: req.file.path,
+    owner: req.id,
+    mapResult: (parsed) =>
+      parsed.success
+        ? cdImportBody(parsed)
+        : { success: false, message: parsed.message },
+  });
+  return res.status(202).json({ success: true, jobId: job.id });
+};
+
+const cdParseJobs = parseJobHandlers("cd");
+export const getCDParseJob = cdParseJobs.status;
+export const streamCDParseJob = cdParseJobs.events;
+export const cancelCDParseJob = cdParseJobs.cancel;
+
 // ─────────────────────────────────────────────────────────────────────────────
 // SAVE / UPDATE WORKFLOW (FIXED FOR DUPLICATE KEY ERRORS)
 // ─────────────────────────────────────────────────────────────────────────────
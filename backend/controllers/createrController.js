@@ -15,6 +15,8 @@ import fs from "fs";
 import { fileURLToPath } from "url";
 import Admin from "../models/Admin.js";
 import PD from "../models/pd/PD.js";
+import { parseJobHandlers, startParseJob } from "../utils/parseJobs.js";
+import { decodeParserOutput } from "../utils/parserOutput.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -213,9 +215,17 @@ export const uploadAndParsePD = async (req, res) => {
       scriptPath,
       filePath,
       requestedSchema,
+      "--framed",
+      // Stop reading pages in time to return a partial result before the
+      // 120s kill below.
+      "--deadline-ms",
+      "110000",
+      // One process per upload: cap pathological pages (no RSS ceiling).
+      "--page-limits",
+      "on",
     ]);
 
-    let dataString = "";
+    const stdoutChunks = [];
     let errorString = "";
 
     const timeoutId = setTimeout(() => {
@@ -230,7 +240,7 @@ export const uploadAndParsePD = async (req, res) => {
     }, 120000);
 
     pythonProcess.stdout.on("data", (data) => {
-      dataString += data.toString();
+      stdoutChunks.push(data);
     });
 
     pythonProcess.stderr.on("data", (data) => {
@@ -253,19 +263,18 @@ export const uploadAndParsePD = async (req, res) => {
         });
       }
 
+      const output = Buffer.concat(stdoutChunks);
       try {
-        const start = dataString.indexOf("{");
-        const end = dataString.lastIndexOf("}") + 1;
-
-        if (start === -1) throw new Error("No JSON found in Python output");
-
-        const parsed = JSON.parse(dataString.substring(start, end));
+        const parsed = decodeParserOutput(output);
 
         return res.json({
           success: true,
           schemaVersion: parsed.schemaVersion,
           confidence: parsed.confidence,
           warnings: parsed.warnings,
+          partial: parsed.partial,
+          skippedPages: parsed.skippedPages,
+          throttledPages: parsed.throttledPages,
           parsedData: parsed.data,
         });
       } catch (err) {
@@ -273,7 +282,7 @@ export const uploadAndParsePD = async (req, res) => {
         return res.status(500).json({
           success: false,
           message: "Invalid JSON returned from parser",
-          raw: dataString,
+          raw: output.toString("utf8"),
         });
       }
     });
@@ -289,6 +298,52 @@ export const uploadAndParsePD = async (req, res) => {
   }
 };
 
+// Async import: returns a job id at once; the client polls
+// /pd/import-jobs/:jobId, listens on /pd/import-jobs/:jobId/events, or cancels.
+export const uploadAndParsePDAsync = async (req, res) => {
+  if (!req.file) {
+    return res
+      .status(400)
+      .json({ success: false, message: "No file uploaded" });
+  }
+
+  const scriptPath = path.resolve(__dirname, "..", "scripts", "pd_parser.py");
+  if (!fs.existsSync(scriptPath)) {
+    fs.unlink(req.file.path, () => {});
+    return res.status(500).json({
+      success: false,
+      message: "Unified parser script missing at: " + scriptPath,
+    });
+  }
+
+  const job = startParseJob({
+    kind: "pd",
+    scriptPath,
+    filePath: req.file.path,
+    owner: req.id,
+    options: { schema: req.body.schemaVersion || "auto" },
+    mapResult: (parsed) =>
+      parsed.success
+        ? {
+            success: true,
+            schemaVersion: parsed.schemaVersion,
+            confidence: parsed.confidence,
+            warnings: parsed.warnings,
+            partial: parsed.partial,
+            skippedPages: parsed.skippedPages,
+            throttledPages: parsed.throttledPages,
+            parsedData: parsed.data,
+          }
+        : { success: false, message: parsed.error },
+  });
+  return res.status(202).json({ success: true, jobId: job.id });
+};
+
+const pdParseJobs = parseJobHandlers("pd");
+export const getPDParseJob = pdParseJobs.status;
+export const streamPDParseJob = pdParseJobs.events;
+export const cancelPDParseJob = pdParseJobs.cancel;
+
 const incrementVersion = (version) => {
   if (!version) return "1.0.0";
   const parts = version.split(".");
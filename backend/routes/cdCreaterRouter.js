@@ -5,6 +5,10 @@ import {
   getCDById,
   getLatestCD,
   uploadAndParseCD,
+  uploadAndParseCDAsync,
+  getCDParseJob,
+  streamCDParseJob,
+  cancelCDParseJob,
   getCDDashboardStats,
   getCDCreatorHistory,
   getAdminsForReview,
@@ -50,4 +54,22 @@ cdCreaterRouter.post(
   uploadAndParseCD,
 );
 
+// Async import: 202 + jobId, then poll / stream progress / cancel
+cdCreaterRouter.post(
+  "/import-async",
+  (req, res, next) => {
+    upload.single("cdFile")(req, res, (err) => {
+      if (err) {
+        console.error("Multer Upload Error:", err.message);
+        return res.status(400).json({ success: false, message: err.message });
+      }
+      next();
+    });
+  },
+  uploadAndParseCDAsync,
+);
+cdCreaterRouter.get("/import-jobs/:jobId", getCDParseJob);
+cdCreaterRouter.get("/import-jobs/:jobId/events", streamCDParseJob);
+cdCreaterRouter.post("/import-jobs/:jobId/cancel", cancelCDParseJob);
+
 export default cdCreaterRouter;
@@ -7,6 +7,10 @@ import {
   getPDById,
   getLatestPD,
   uploadAndParsePD,
+  uploadAndParsePDAsync,
+  getPDParseJob,
+  streamPDParseJob,
+  cancelPDParseJob,
   getDashboardStats,
   getCreatorHistory,
   searchCreaters,
@@ -49,5 +53,14 @@ createrRouter.get("/cd/assigned", getAssignedCDs);
 // Parser
 // Add this line with your other PD routes
 createrRouter.post("/pd/import", upload.single("pdFile"), uploadAndParsePD);
+// Async import: 202 + jobId, then poll / stream progress / cancel
+createrRouter.post(
+  "/pd/import-async",
+  upload.single("pdFile"),
+  uploadAndParsePDAsync,
+);
+createrRouter.get("/pd/import-jobs/:jobId", getPDParseJob);
+createrRouter.get("/pd/import-jobs/:jobId/events", streamPDParseJob);
+createrRouter.post("/pd/import-jobs/:jobId/cancel", cancelPDParseJob);
 
 export default createrRouter;
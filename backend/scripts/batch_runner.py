@@ -0,0 +1,247 @@
+"""
+Batch Parser Runner
+Parses a directory (or manifest) of PDFs across one process pool and writes
+one NDJSON line per file, followed by a throughput / latency summary line.
+
+Result line  : {"type": "result", "id": ..., "file": ..., "pages": n,
+                "elapsed_ms": t, "timed_out": false, "result": {...}}
+Summary line : {"type": "summary", "files": n, "succeeded": n, "failed": n,
+                "timed_out": n, "pages": n, "wall_seconds": t,
+                "files_per_second": r, "pages_per_second": r,
+                "latency_ms_per_page": {"p50": t, "p95": t}, "failures": [...]}
+
+A manifest is a text file with one PDF path per line, or one JSON job per
+line ({"file": ..., "schema": ..., "id": ...}); relative paths resolve
+against the manifest's directory and blank / "#" lines are ignored. A line
+that is not a valid job is reported as a failed result naming its line
+number; the rest of the batch still runs.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from preflight import page_count
+
+JobFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Set in each worker by the pool initializer, as in parser_service.
+_worker_job_fn: Optional[JobFn] = None
+_worker_timeout: float = 0
+
+
+class _JobTimeout(BaseException):
+    """BaseException so the parsers' own `except Exception` blocks cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _JobTimeout()
+
+
+def _init_worker(job_fn: JobFn, timeout: float) -> None:
+    global _worker_job_fn, _worker_timeout
+    _worker_job_fn = job_fn
+    _worker_timeout = timeout
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _invalid_record(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "result", "id": job.get("id"), "file": job["file"], "pages": 0,
+            "elapsed_ms": 0.0, "timed_out": False,
+            "result": {"success": False, "error": job["error"]}}
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    timed_out = False
+    t0 = time.perf_counter()
+    if _worker_timeout > 0:
+        signal.setitimer(signal.ITIMER_REAL, _worker_timeout)
+    try:
+        result = _worker_job_fn(job)
+    except _JobTimeout:
+        timed_out = True
+        result = {"success": False,
+                  "error": f"Timed out after {_worker_timeout:g}s"}
+    except Exception as e:
+        print(traceback.format_exc(), file=sys.stderr)
+        result = {"success": False, "error": str(e)}
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "type": "result",
+        "id": job.get("id"),
+        "file": job["file"],
+        "pages": page_count(job["file"]),
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "timed_out": timed_out,
+        "result": result,
+    }
+
+
+# ─────────────────────────────────────────────
+# INPUTS
+# ─────────────────────────────────────────────
+
+def _manifest_jobs(manifest: Path) -> List[Dict[str, Any]]:
+    """
+    Jobs in manifest order. A line that is not a valid job becomes an
+    entry with only "file" (the line itself) and "error", which run_batch
+    reports as a failed result instead of aborting the batch.
+    """
+    jobs = []
+    base = manifest.parent
+    with open(manifest, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line) if line.startswith("{") else {"file": line}
+                target = job.get("file") or job.get("path")
+                if not isinstance(target, str):
+                    raise ValueError('no "file" or "path"')
+            except ValueError as e:
+                jobs.append({"file": line,
+                             "error": f"{manifest.name} line {line_no}: invalid job: {e}"})
+                continue
+            job["file"] = str(base / target)
+            jobs.append(job)
+    return jobs
+
+
+def collect_jobs(source: str, schema: Optional[str] = None,
+                 recursive: bool = False) -> List[Dict[str, Any]]:
+    """Directory → every *.pdf in it (sorted); any other file → manifest."""
+    src = Path(source)
+    if src.is_dir():
+        pattern = "**/*" if recursive else "*"
+        files = sorted(p for p in src.glob(pattern)
+                       if p.is_file() and p.suffix.lower() == ".pdf")
+        jobs = [{"file": str(p)} for p in files]
+    else:
+        jobs = _manifest_jobs(src)
+
+    for i, job in enumerate(jobs):
+        job.setdefault("id", i)
+        if schema is not None:
+            job.setdefault("schema", schema)
+    return jobs
+
+
+# ─────────────────────────────────────────────
+# SUMMARY
+# ─────────────────────────────────────────────
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return round(ordered[rank - 1], 1)
+
+
+def _failure_message(result: Dict[str, Any]) -> str:
+    # PD results report "error", CD results report "message".
+    return str(result.get("error") or result.get("message") or "unknown error")
+
+
+def summarize(records: Iterable[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    records = list(records)
+    per_page = [r["elapsed_ms"] / r["pages"] for r in records if r["pages"]]
+    failures = [{"id": r["id"], "file": r["file"],
+                 "error": _failure_message(r["result"])}
+                for r in records if not r["result"].get("success")]
+    pages = sum(r["pages"] for r in records)
+    return {
+        "type": "summary",
+        "files": len(records),
+        "succeeded": len(records) - len(failures),
+        "failed": len(failures),
+        "timed_out": sum(1 for r in records if r["timed_out"]),
+        "pages": pages,
+        "wall_seconds": round(wall_seconds, 3),
+        "files_per_second": round(len(records) / wall_seconds, 3) if wall_seconds else None,
+        "pages_per_second": round(pages / wall_seconds, 3) if wall_seconds else None,
+        "latency_ms_per_page": {"p50": _percentile(per_page, 50),
+                                "p95": _percentile(per_page, 95)},
+        "failures": failures,
+    }
+
+
+# ─────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────
+
+def run_batch(job_fn: JobFn, argv, default_schema: Optional[str] = None) -> int:
+    """
+    Entry point for `<parser>.py batch SOURCE [--workers N] [--timeout S]
+    [--output FILE] [--recursive] [--no-cache]`. `job_fn` is the parser's
+    module-level run_job, the same adapter the worker service uses.
+    Exits 0 when every file parsed, 1 otherwise.
+    """
+    ap = argparse.ArgumentParser(prog="batch")
+    ap.add_argument("source", help="directory of PDFs or manifest file")
+    if default_schema is not None:
+        ap.add_argument("--schema", default=default_schema)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--timeout", type=float, default=120,
+                    help="per-file timeout in seconds (0 disables)")
+    ap.add_argument("--max-jobs", type=int, default=50,
+                    help="recycle each worker after this many files")
+    ap.add_argument("--output", default=None,
+                    help="write NDJSON here instead of stdout")
+    ap.add_argument("--recursive", action="store_true",
+                    help="include PDFs in subdirectories")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="bypass the on-disk result cache")
+    args = ap.parse_args(argv)
+
+    try:
+        jobs = collect_jobs(args.source, getattr(args, "schema", None),
+                            args.recursive)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"type": "summary", "success": False,
+                          "error": f"Cannot read batch source: {e}"}))
+        return 1
+    if args.no_cache:
+        for job in jobs:
+            job["use_cache"] = False
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    records = []
+    t0 = time.perf_counter()
+
+    def emit(record: Dict[str, Any]) -> None:
+        records.append(record)
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    try:
+        for job in jobs:
+            if "error" in job:
+                emit(_invalid_record(job))
+        runnable = [job for job in jobs if "error" not in job]
+        workers = max(1, min(args.workers, len(runnable) or 1))
+        with multiprocessing.Pool(processes=workers,
+                                  initializer=_init_worker,
+                                  initargs=(job_fn, args.timeout),
+                                  maxtasksperchild=max(1, args.max_jobs)) as pool:
+            for record in pool.imap_unordered(_run_job, runnable):
+                emit(record)
+        summary = summarize(records, time.perf_counter() - t0)
+        out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0 if summary["failed"] == 0 else 1
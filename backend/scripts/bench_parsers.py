@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmarks
+Micro and end-to-end timings for pd_parser.py / cd_parser.py.
+
+Usage:
+    python3 bench_parsers.py regex [--lines N] [--repeat N]
+    python3 bench_parsers.py html [--students N] [--repeat N]
+    python3 bench_parsers.py cells [--cds N] [--wrapped F] [--repeat N]
+    python3 bench_parsers.py wire [--cds N] [--repeat N]
+    python3 bench_parsers.py fasttext [--pages N ...] [--files PDF ...] [--repeat N]
+    python3 bench_parsers.py e2e [--kinds pd2024,pd2026,cd] [--pages N ...]
+                                 [--table-density F] [--wrapped F] [--repeat N]
+                                 [--baseline FILE] [--save-baseline FILE]
+                                 [--tolerance F]
+
+`e2e` generates synthetic PDFs (see synthetic_pdfs.py), times process_pdf /
+parse_cd_pdf and their stages in a fresh process per case, records peak RSS,
+and exits 1 when any case regresses past --tolerance against --baseline.
+tests/test_memory.py asserts that peak RSS does not grow with page count.
+`fasttext` times fast_text.page_text against pdfplumber's extract_text on a
+2026 PD corpus (plus any --files) and exits 1 on any page whose text
+differs; tests/test_fast_text.py holds the same parity on the synthetic
+corpus, rotated pages and ligatures included.
+`cells` counts the objects built to normalise each CD table's cells, once
+into a CellMatrix against once per consumer as before.
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import cd_parser  # noqa: E402
+import fast_text  # noqa: E402
+import table_classifier  # noqa: E402
+from cell_matrix import CellMatrix  # noqa: E402
+import pd_parser  # noqa: E402
+import synthetic_pdfs  # noqa: E402
+import wire_format  # noqa: E402
+
+
+# ─────────────────────────────────────────────
+# SYNTHETIC INPUTS
+# ─────────────────────────────────────────────
+
+def make_2026_semester_block(n_lines):
+    """A 2026-style semester block cycling through every line shape the loop handles."""
+    shapes = [
+        "Academic",
+        "{k} UE26CS{k:03d} Data Structures and Algorithms {c}",
+        "{k} UE26CS{k:03d} Programming Lab {c}",
+        "Professional Elective-1",
+        "UE26CS{k:03d} Machine Learning Basics",
+        "{k} UE26CS{k:03d} {c}",
+        "(Competitive Learning)",
+        "Competency and Skills",
+        "Total 22",
+    ]
+    return [shapes[i % len(shapes)].format(k=(i % 900) + 100, c=3 + i % 2)
+            for i in range(n_lines)]
+
+
+# ─────────────────────────────────────────────
+# REGEX: per-line matching, inline vs registry
+# ─────────────────────────────────────────────
+
+def _inline_line_matches(line):
+    """The pre-registry per-line work: format + look up each pattern on every line."""
+    code = pd_parser.CODE_TOKEN_RE.pattern
+    re.match(r"(?i)^(total|overall)\s+\d", line)
+    re.match(r"(?i)^(Professional|Open)\s+Elective[-\s]?(\d+)\s*$", line)
+    re.match(rf"^({code})\s+(.+?)\s*$", line)
+    re.search(r"\d+\s*$", line.split()[-1])
+    re.match(rf"^(\d+)\s+({code})\s+(.+?)\s+(\d+)\s*$", line)
+    re.match(rf"^(\d+)\s+({code})\s+(\d+)\s*$", line)
+
+
+def _registry_line_matches(line):
+    pd_parser.P26_TOTAL_LINE_RE.match(line)
+    pd_parser.P26_ELECTIVE_HEAD_RE.match(line)
+    pd_parser.P26_BARE_COURSE_RE.match(line)
+    pd_parser.P26_TRAILING_NUMBER_RE.search(line.split()[-1])
+    pd_parser.P26_COURSE_RE.match(line)
+    pd_parser.P26_COURSE_NO_TITLE_RE.match(line)
+
+
+def _time_per_line(fn, lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(lines) * 1e9
+
+
+def bench_regex(args):
+    lines = make_2026_semester_block(args.lines)
+    inline_ns = _time_per_line(_inline_line_matches, lines, args.repeat)
+    registry_ns = _time_per_line(_registry_line_matches, lines, args.repeat)
+    return {
+        "benchmark": "pd_2026_semester_line_matching",
+        "lines": len(lines),
+        "inline_ns_per_line": round(inline_ns, 1),
+        "registry_ns_per_line": round(registry_ns, 1),
+        "speedup": round(inline_ns / registry_ns, 2) if registry_ns else None,
+    }
+
+
+# ─────────────────────────────────────────────
+# HTML: CD table builders, time and allocations
+# ─────────────────────────────────────────────
+
+def make_recording_marks_rows(n_students):
+    """A 'Recording Marks' table as extracted: wrapped 2-row header, N students, total."""
+    rows = [
+        ["S. No.", "USN", "Student", "Quiz", "Test", "Assignment", "SEE", "Marks", "Grade"],
+        ["", "", "Name", "(15%)", "(25%)", "20%", "40%", "Scored", "obtained"],
+    ]
+    for i in range(1, n_students + 1):
+        rows.append([str(i), f"1GM24CS{i:03d}", f"Name {i}", str(10 + i % 5),
+                     str(18 + i % 7), str(15 + i % 5), str(30 + i % 10),
+                     str(73 + i % 20), "ABCD"[i % 4]])
+    rows.append(["Total", "", "", "", "", "", "", str(80 * n_students), ""])
+    rows.append(["Class Average Marks: 80"])
+    return rows
+
+
+def make_outcome_map(n_cos=6):
+    """A full CO × PO/PSO grid: header plus one row per CO, 16 columns."""
+    return [list(cd_parser.DEFAULT_OUTCOME_HEADERS)] + [
+        [f"CO{i}"] + [str((i + j) % 4) for j in range(15)]
+        for i in range(1, n_cos + 1)
+    ]
+
+
+def _concat_outcome_map_html(matrix):
+    """The pre-template outcome map builder: one `html +=` per cell."""
+    html = f'<table {cd_parser._TBL}><thead><tr>'
+    for h in matrix[0]:
+        html += f'<th {cd_parser._TH2}>{h}</th>'
+    html += '</tr></thead><tbody>'
+    for row in matrix[1:]:
+        html += '<tr>'
+        for ci, cell in enumerate(row):
+            style = cd_parser._TDH if ci == 0 else cd_parser._TD
+            html += f'<td {style}>{cell}</td>'
+        html += '</tr>'
+    html += '</tbody></table>'
+    return html
+
+
+def _render_cost(fn, arg, repeat, loops=200):
+    """(best µs per call, peak KiB allocated during one call)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(best / loops * 1e6, 1), round(peak / 1024, 1)
+
+
+def bench_html(args):
+    cases = {
+        "recording_marks": (cd_parser.build_recording_marks_html,
+                            make_recording_marks_rows(args.students)),
+        "outcome_map": (cd_parser.build_outcome_map_html, make_outcome_map()),
+        "outcome_map_concat": (_concat_outcome_map_html, make_outcome_map()),
+    }
+    report = {"benchmark": "cd_html_builders", "students": args.students, "cases": {}}
+    for name, (fn, arg) in cases.items():
+        us, peak_kib = _render_cost(fn, arg, args.repeat)
+        report["cases"][name] = {"us_per_render": us, "peak_alloc_kib": peak_kib,
+                                 "output_bytes": len(fn(arg).encode("utf-8"))}
+    return report
+
+
+# ─────────────────────────────────────────────
+# CELLS: table normalisation, once vs per consumer
+# ─────────────────────────────────────────────
+
+def _kept_clean(c, keep):
+    """cd_parser.clean_text, keeping the string it builds along the way."""
+    if not c:
+        return ""
+    collapsed = cd_parser._WHITESPACE_RE.sub(" ", str(c))
+    cleaned = collapsed.strip()
+    keep += (collapsed, cleaned)
+    return cleaned
+
+
+def _lower_joins(rows, keep, until=None):
+    """The per-row `" ".join(lowered cells)` keyword scans of the teaching parser."""
+    for row in rows:
+        joined = " ".join(row)
+        keep.append(joined)
+        if until and until(joined):
+            break
+
+
+def _per_consumer_cells(table, label):
+    """
+    The cell normalisation cd_parser ran before CellMatrix: the classifier
+    and then each consumer of `label` re-stringified, stripped, cleaned and
+    lowercased the same cells. Every string and list it builds is kept, so
+    the allocation count includes the temporaries.
+    """
+    keep = []
+    header = [str(c).strip() for c in table[0] if c]
+    header_lower = [h.lower() for h in header]
+    body = [str(c).strip() for row in table for c in row if c]
+    joined = " ".join(body)
+    keep += (header, header_lower, " ".join(header_lower), body, joined, joined.lower())
+    if label == "metadata":
+        for r in table:
+            if len(r) >= 2 and r[0]:
+                keep.append(_kept_clean(str(r[0]), keep).lower())
+                if not _kept_clean(r[1], keep) and len(r) >= 4:
+                    _kept_clean(r[3], keep)
+    elif label == "credits" and len(table) >= 2:
+        headers = [_kept_clean(str(c), keep).lower() if c else "" for c in table[0]]
+        keep += (headers, [_kept_clean(str(c), keep) if c else "" for c in table[1]])
+    elif label == "teaching":
+        lowered = [[str(c).lower() for c in r if c] for r in table]
+        keep += lowered
+        _lower_joins(lowered, keep, until=lambda j: "lecture" in j or "topic" in j)
+        keep += [[str(c).lower() if c else "" for c in lowered[0]]]
+        relowered = [[str(c).lower() for c in r if c] for r in table]  # is_header_row
+        keep += relowered
+        _lower_joins(relowered, keep)
+        merged = [[str(c).strip() if c is not None else "" for c in r] for r in table]
+        keep += merged
+        keep += [[_kept_clean(c, keep) for c in r[:4]] for r in merged]
+    elif label in ("assessment", "outcome", "recording_marks"):
+        cleaned = [[_kept_clean(str(c), keep) if c is not None else "" for c in r]
+                   for r in table]
+        keep += cleaned
+        if label == "assessment":
+            keep += [" ".join(r) for r in cleaned]
+    elif label == "attainment_targets":
+        cleaned = [[_kept_clean(str(c), keep) if c else "" for c in r] for r in table]
+        keep += cleaned
+        keep += [[str(c).strip() for c in r] for r in cleaned]  # merge_wrapped_rows
+    return keep
+
+
+def _cell_matrix_cells(table, label):
+    """The same work reading one CellMatrix, kept the same way."""
+    cells = CellMatrix.from_rows(table)
+    header_lower = [c.lower() for c in cells.stripped[0] if c is not None]
+    joined = " ".join(c for row in cells.stripped for c in row if c is not None)
+    keep = [cells, header_lower, " ".join(header_lower), joined, joined.lower()]
+    if label in ("metadata", "credits"):
+        keep.append(cells.lower)
+    elif label == "teaching":
+        _lower_joins(cells.lower, keep, until=lambda j: "lecture" in j or "topic" in j)
+        _lower_joins(cells.lower, keep)
+        keep += [list(t) for t, empty in zip(cells.text, cells.row_empty) if not empty]
+    elif label in ("assessment", "outcome"):
+        rows = [t for t, empty in zip(cells.text, cells.row_empty) if not empty]
+        keep += [" ".join(r) for r in rows] if label == "assessment" else [list(r) for r in rows]
+    return keep
+
+
+def _cells_cost(fn, tables, repeat):
+    """(best µs for all tables, memory blocks held by what the passes built)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for table, label in tables:
+            fn(table, label)
+        best = min(best, time.perf_counter() - t0)
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        kept = [fn(table, label) for table, label in tables]
+        blocks = sys.getallocatedblocks() - before
+    finally:
+        gc.enable()
+    del kept
+    return best * 1e6, blocks
+
+
+def bench_cells(args):
+    workdir = Path(args.workdir or os.path.join(tempfile.gettempdir(), "pdms-bench"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    path = str(workdir / f"cd-bundle-{args.cds}-cells.pdf")
+    synthetic_pdfs.cd_bundle(path, pages=4 * args.cds, wrapped=args.wrapped)
+    _, pages_tables = cd_parser.extract_all_pages(path, use_cache=False)
+    tables = [(t, table_classifier.classify_table(t)[0])
+              for page in pages_tables for t in page if t and t[0]]
+
+    report = {"benchmark": "cell_matrix", "tables": len(tables),
+              "cells": sum(len(r) for t, _ in tables for r in t), "cases": {}}
+    for name, fn in (("per_consumer", _per_consumer_cells),
+                     ("cell_matrix", _cell_matrix_cells)):
+        us, blocks = _cells_cost(fn, tables, args.repeat)
+        report["cases"][name] = {
+            "us_per_table": round(us / max(len(tables), 1), 1),
+            "allocations_per_table": round(blocks / max(len(tables), 1), 1),
+        }
+    return report
+
+
+# ─────────────────────────────────────────────
+# WIRE: result encodings, time and bytes
+# ─────────────────────────────────────────────
+
+def _encode_indented(result):
+    """The pre-wire-format CD output: json.dumps(indent=2)."""
+    return json.dumps(result, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def bench_wire(args):
+    workdir = Path(args.workdir or os.path.join(tempfile.gettempdir(), "pdms-bench"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    path = str(workdir / f"cd-bundle-{args.cds}.pdf")
+    # cd_bundle lays out 4 pages per CD with the default extra_pages=1
+    synthetic_pdfs.cd_bundle(path, pages=4 * args.cds)
+    result = cd_parser.parse_cd_pdf(path, use_cache=False)
+
+    encoders = {
+        "json_indent2": _encode_indented,
+        "json": lambda r: wire_format.encode_result(r, "json"),
+        "gzip": lambda r: wire_format.encode_result(r, "gzip"),
+        "msgpack": lambda r: wire_format.encode_result(r, "msgpack"),
+    }
+    report = {"benchmark": "wire_format", "cds": len(result.get("parsedData", [])),
+              "encodings": {}}
+    for name, encode in encoders.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            payload = encode(result)
+            best = min(best, time.perf_counter() - t0)
+        report["encodings"][name] = {"encode_ms": round(best * 1000, 2),
+                                     "bytes": len(payload)}
+    return report
+
+
+# ─────────────────────────────────────────────
+# E2E: synthetic PDFs, stage timings, peak RSS
+# ─────────────────────────────────────────────
+
+# Stage label → (module or class, attribute) hooks wrapped with a timer.
+# Stages nest (process_pdf includes parse_2024), so times are inclusive.
+def _stage_hooks(kind):
+    import cd_parser
+    from page_cache import PageArtifactCache
+
+    hooks = {
+        "extract_text": [(PageArtifactCache, "text")],
+        "extract_tables": [(PageArtifactCache, "tables")],
+    }
+    if kind == "cd":
+        hooks.update({
+            "parse_cd_pdf": [(cd_parser, "parse_cd_pdf")],
+            "find_cd_boundaries": [(cd_parser, "find_cd_boundaries")],
+            "parse_single_cd": [(cd_parser, "parse_single_cd")],
+            "html_builders": [(cd_parser, name) for name in dir(cd_parser)
+                              if name.startswith("build_") and name.endswith("_html")],
+        })
+    else:
+        hooks.update({
+            "process_pdf": [(pd_parser, "process_pdf")],
+            "detect_schema": [(pd_parser, "detect_schema_version")],
+            "parse_" + kind[2:]: [(pd_parser, "parse_" + kind[2:])],
+        })
+    return hooks
+
+
+class _StageTimer:
+    def __init__(self, hooks):
+        self.totals = {}
+        for label, targets in hooks.items():
+            for owner, name in targets:
+                setattr(owner, name, self._wrap(label, getattr(owner, name)))
+
+    def _wrap(self, label, fn):
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry = self.totals.setdefault(label, [0.0, 0])
+                entry[0] += time.perf_counter() - t0
+                entry[1] += 1
+        return timed
+
+    def reset(self):
+        self.totals = {}
+
+
+def _measure_case(kind, path, repeat, conn):
+    """Runs in a fresh spawned process so ru_maxrss belongs to this case alone."""
+    os.environ["PDMS_PARSE_CACHE"] = "0"
+    os.environ["PDMS_PAGE_CACHE"] = "0"
+    import pdfplumber
+    import cd_parser
+
+    timer = _StageTimer(_stage_hooks(kind))
+    if kind == "cd":
+        def run():
+            return cd_parser.parse_cd_pdf(path, use_cache=False)
+    else:
+        def run():
+            return pd_parser.process_pdf(path, "auto", use_cache=False)
+
+    best = None
+    for _ in range(repeat):
+        timer.reset()
+        t0 = time.perf_counter()
+        result = run()
+        wall = time.perf_counter() - t0
+        if best is None or wall < best[0]:
+            best = (wall, timer.totals, bool(result.get("success")))
+
+    with pdfplumber.open(path) as pdf:
+        pages = len(pdf.pages)
+    wall, totals, success = best
+    conn.send({
+        "pages": pages,
+        "success": success,
+        "wall_ms": round(wall * 1000, 1),
+        "per_page_ms": round(wall * 1000 / max(pages, 1), 2),
+        "stages": {label: {"ms": round(t * 1000, 1), "calls": n}
+                   for label, (t, n) in sorted(totals.items())},
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    conn.close()
+
+
+def _run_case(kind, path, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure_case, args=(kind, path, repeat, send))
+    proc.start()
+    send.close()
+    try:
+        return recv.recv()
+    except EOFError:
+        return {"error": f"benchmark process exited with code {proc.exitcode}"}
+    finally:
+        proc.join()
+
+
+def compare_to_baseline(cases, baseline, tolerance, min_delta_ms):
+    """A case regresses when wall time or peak RSS grows past tolerance."""
+    regressions = []
+    for name, cur in cases.items():
+        ref = baseline.get("cases", {}).get(name)
+        if not ref or "error" in cur or "error" in ref:
+            continue
+        dt = cur["wall_ms"] - ref["wall_ms"]
+        if dt > min_delta_ms and cur["wall_ms"] > ref["wall_ms"] * (1 + tolerance):
+            regressions.append({"case": name, "metric": "wall_ms",
+                                "baseline": ref["wall_ms"], "current": cur["wall_ms"]})
+        if cur["peak_rss_kb"] > ref["peak_rss_kb"] * (1 + tolerance):
+            regressions.append({"case": name, "metric": "peak_rss_kb",
+                                "baseline": ref["peak_rss_kb"], "current": cur["peak_rss_kb"]})
+        if ref.get("success") and not cur["success"]:
+            regressions.append({"case": name, "metric": "success",
+                                "baseline": True, "current": False})
+    return regressions
+
+
+def bench_e2e(args):
+    workdir = Path(args.workdir or os.path.join(tempfile.gettempdir(), "pdms-bench"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    cases = {}
+    for kind in args.kinds.split(","):
+        generate = synthetic_pdfs.GENERATORS[kind]
+        for pages in args.pages:
+            name = f"{kind}-p{pages}-t{args.table_density:g}-w{args.wrapped:g}"
+            path = str(workdir / f"{name}.pdf")
+            generate(path, pages=pages, table_density=args.table_density,
+                     wrapped=args.wrapped)
+            case = {"kind": kind, "table_density": args.table_density,
+                    "wrapped": args.wrapped}
+            case.update(_run_case(kind, path, args.repeat))
+            cases[name] = case
+            print(f"{name}: {case.get('wall_ms', case.get('error'))} ms", file=sys.stderr)
+
+    report = {"benchmark": "e2e", "cases": cases, "regressions": []}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare_to_baseline(
+            cases, baseline, args.tolerance, args.min_delta_ms)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['case']} {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']}", file=sys.stderr)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "e2e", "cases": cases}, f, indent=2)
+    return report
+
+
+# ─────────────────────────────────────────────
+# FAST TEXT: parity and speed against extract_text
+# ─────────────────────────────────────────────
+
+def _page_texts(path, extract, repeat):
+    """(texts, best wall seconds); each run opens the PDF afresh so no font cache carries over."""
+    import pdfplumber
+
+    best, texts = float("inf"), None
+    for _ in range(repeat):
+        with pdfplumber.open(path) as pdf:
+            t0 = time.perf_counter()
+            run = [extract(page) for page in pdf.pages]
+            best = min(best, time.perf_counter() - t0)
+        texts = texts or run
+    return texts, best
+
+
+def bench_fasttext(args):
+    workdir = Path(args.workdir or os.path.join(tempfile.gettempdir(), "pdms-bench"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    paths = list(args.files or [])
+    for pages in args.pages:
+        path = str(workdir / f"pd2026-p{pages}-text.pdf")
+        synthetic_pdfs.pd2026(path, pages=pages)
+        paths.append(path)
+
+    cases, regressions = {}, []
+    for path in paths:
+        layout, layout_s = _page_texts(path, lambda p: p.extract_text() or "", args.repeat)
+        fast, fast_s = _page_texts(path, fast_text.page_text, args.repeat)
+        mismatched = [i + 1 for i, (a, b) in enumerate(zip(layout, fast)) if a != b]
+        cases[Path(path).name] = {
+            "pages": len(layout),
+            "mismatched_pages": mismatched,
+            "layout_ms": round(layout_s * 1000, 1),
+            "fast_ms": round(fast_s * 1000, 1),
+            "speedup": round(layout_s / fast_s, 2) if fast_s else None,
+        }
+        if mismatched:
+            regressions.append({"case": Path(path).name, "metric": "text_parity",
+                                "pages": mismatched})
+            print(f"PARITY {Path(path).name}: pages {mismatched} differ",
+                  file=sys.stderr)
+    return {"benchmark": "fast_text", "cases": cases, "regressions": regressions}
+
+
+def _page_count(value):
+    n = int(value)
+    if not 10 <= n <= 1000:
+        raise argparse.ArgumentTypeError("page count must be between 10 and 1000")
+    return n
+
+
+def _fraction(value):
+    f = float(value)
+    if not 0 <= f <= 1:
+        raise argparse.ArgumentTypeError("must be between 0 and 1")
+    return f
+
+
+# ─────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("regex", help="PD 2026 per-line regex cost")
+    p.add_argument("--lines", type=int, default=5000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_regex)
+
+    p = sub.add_parser("html", help="CD HTML builder render time and allocations")
+    p.add_argument("--students", type=int, default=60)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_html)
+
+    p = sub.add_parser("cells", help="CD table cell normalisation: CellMatrix vs per consumer")
+    p.add_argument("--cds", type=int, default=40)
+    p.add_argument("--wrapped", type=_fraction, default=0.3)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--workdir", default=None,
+                   help="where the generated PDF is written (default: <tmp>/pdms-bench)")
+    p.set_defaults(func=bench_cells)
+
+    p = sub.add_parser("wire", help="result encoding time and size for a CD bundle")
+    p.add_argument("--cds", type=int, default=40)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--workdir", default=None,
+                   help="where the generated PDF is written (default: <tmp>/pdms-bench)")
+    p.set_defaults(func=bench_wire)
+
+    p = sub.add_parser("e2e", help="synthetic PDFs through the full parsers")
+    p.add_argument("--kinds", default="pd2024,pd2026,cd")
+    p.add_argument("--pages", type=_page_count, nargs="+", default=[10, 100])
+    p.add_argument("--table-density", type=_fraction, default=0.5)
+    p.add_argument("--wrapped", type=_fraction, default=0.1)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--workdir", default=None,
+                   help="where generated PDFs are written (default: <tmp>/pdms-bench)")
+    p.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    p.add_argument("--save-baseline", default=None, help="write this run as a baseline")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="allowed relative growth in wall time / peak RSS")
+    p.add_argument("--min-delta-ms", type=float, default=20,
+                   help="ignore wall-time growth smaller than this")
+    p.set_defaults(func=bench_e2e)
+
+    p = sub.add_parser("fasttext", help="fast_text parity and speed against extract_text")
+    p.add_argument("--pages", type=_page_count, nargs="*", default=[10, 100])
+    p.add_argument("--files", nargs="*", default=None,
+                   help="real 2026 PD PDFs to check alongside the synthetic ones")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--workdir", default=None,
+                   help="where generated PDFs are written (default: <tmp>/pdms-bench)")
+    p.set_defaults(func=bench_fasttext)
+
+    args = ap.parse_args(argv)
+    report = args.func(args)
+    print(json.dumps(report, indent=2))
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
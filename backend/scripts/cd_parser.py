@@ -21,7 +21,10 @@ Enhanced Features:
 
 import sys
 import json
+import os
 import re
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -33,15 +36,29 @@ except ImportError:
     }))
     sys.exit(1)
 
+from cell_matrix import CellMatrix
+from html_render import CellTemplate, tr
+from job_control import NULL_CONTROL, NULL_DEADLINE, Deadline, deadline_from
+from page_cache import PageArtifactCache
+from page_guard import NULL_GUARD, PageGuard, guard_from
+from perf_report import NULL_PERF, PerfRecorder, attach_perf
+from preflight import preflight
+from result_cache import ResultCache, local_sources, parser_fingerprint
+from table_classifier import classify_table
+from wire_format import add_wire_arguments, encode_result, write_result
+
 
 # ─────────────────────────────────────────────
 # UTILITIES
 # ─────────────────────────────────────────────
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 def clean_text(text):
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', str(text)).strip()
+    return _WHITESPACE_RE.sub(' ', str(text)).strip()
 
 
 def safe_int(val, default=0):
@@ -65,16 +82,17 @@ def format_bullets_to_html(text):
     return formatted.strip()
 
 
-def merge_wrapped_rows(raw_rows):
+def merge_wrapped_rows(cells, indices=None):
     """
     Fix tables where long cell text wraps into the next PDF row.
     pdfplumber sees the continuation as a new row with an empty first column.
+    Reads the cleaned text of a CellMatrix, of the rows in `indices` if given.
     """
     merged = []
-    for row in raw_rows:
-        cleaned = [str(c).strip() if c is not None else "" for c in row]
-        if not any(cleaned):
+    for i in range(len(cells)) if indices is None else indices:
+        if cells.row_empty[i]:
             continue
+        cleaned = cells.text[i]
         if not cleaned[0] and merged:
             for i in range(1, len(cleaned)):
                 if not cleaned[i]:
@@ -84,7 +102,7 @@ def merge_wrapped_rows(raw_rows):
                 else:
                     merged[-1].append(cleaned[i])
         else:
-            merged.append(cleaned)
+            merged.append(list(cleaned))
     return merged
 
 
@@ -137,6 +155,15 @@ _TDL = 'style="border:1px solid #b0b8cc;padding:8px 12px;text-align:left;vertica
 _TDH = 'style="border:1px solid #b0b8cc;padding:8px 10px;text-align:center;font-weight:bold;background:#f1f5f9;vertical-align:middle"'
 _CAP = 'style="caption-side:top;font-weight:bold;font-size:14px;padding:9px;background:#e3e8f7;border:1px solid #b0b8cc;text-align:center"'
 
+# Precompiled cell templates (see html_render.py)
+_TD_CELL = CellTemplate(f'<td {_TD}>', '</td>')
+_TDL_CELL = CellTemplate(f'<td {_TDL}>', '</td>')
+_TDH_CELL = CellTemplate(f'<td {_TDH}>', '</td>')
+_TD_STRONG = CellTemplate(f'<td {_TD}><strong>', '</strong></td>')
+_TH_CELL = CellTemplate(f'<th {_TH}>', '</th>')
+_TH2_CELL = CellTemplate(f'<th {_TH2}>', '</th>')
+_TD_BLANK = _TD_CELL("&nbsp;")
+
 # Default PO/PSO header list (matches frontend constant)
 DEFAULT_OUTCOME_HEADERS = [
     "CO\\PO",
@@ -150,6 +177,19 @@ DEFAULT_OUTCOME_HEADERS = [
 # HTML BUILDER: 2.3 Course Outcomes (COs)
 # ─────────────────────────────────────────────────────────────────────────────
 
+_COURSE_OUTCOMES_HEAD = (
+    f'<table {_TBL}>'
+    '<thead><tr>'
+    f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;'
+    f'background:#d1d5db;text-align:center;font-weight:bold;'
+    f'vertical-align:middle;width:110px">Course Outcome</th>'
+    f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;'
+    f'background:#d1d5db;text-align:left;font-weight:bold;'
+    f'vertical-align:middle">Description</th>'
+    '</tr></thead><tbody>'
+)
+
+
 def build_course_outcomes_html(cos):
     """
     Build a styled 2-column HTML table from the courseOutcomes list.
@@ -160,30 +200,14 @@ def build_course_outcomes_html(cos):
         {"code": f"CO{i}", "description": ""} for i in range(1, 7)
     ]
 
-    html = f'<table {_TBL}>'
-    html += '<thead><tr>'
-    html += (
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;'
-        f'background:#d1d5db;text-align:center;font-weight:bold;'
-        f'vertical-align:middle;width:110px">Course Outcome</th>'
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;'
-        f'background:#d1d5db;text-align:left;font-weight:bold;'
-        f'vertical-align:middle">Description</th>'
-    )
-    html += '</tr></thead><tbody>'
-
+    html = [_COURSE_OUTCOMES_HEAD]
     for co in rows:
-        code = clean_text(co.get("code", ""))
-        desc = clean_text(co.get("description", ""))
-        html += (
-            f'<tr>'
-            f'<td {_TDH}>{code}</td>'
-            f'<td {_TDL}>{desc}</td>'
-            f'</tr>'
-        )
-
-    html += '</tbody></table>'
-    return html
+        html.append(tr(
+            _TDH_CELL(clean_text(co.get("code", ""))),
+            _TDL_CELL(clean_text(co.get("description", ""))),
+        ))
+    html.append('</tbody></table>')
+    return "".join(html)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -202,22 +226,14 @@ def build_outcome_map_html(matrix):
             *[[f"CO{i}"] + [""] * 15 for i in range(1, 7)]
         ]
 
-    html = f'<table {_TBL}><thead><tr>'
-    for h in matrix[0]:
-        html += f'<th {_TH2}>{h}</th>'
-    html += '</tr></thead><tbody>'
-
-    for row in matrix[1:]:
-        html += '<tr>'
-        for ci, cell in enumerate(row):
-            if ci == 0:
-                html += f'<td {_TDH}>{cell}</td>'
-            else:
-                html += f'<td {_TD}>{cell}</td>'
-        html += '</tr>'
-
-    html += '</tbody></table>'
-    return html
+    html = [f'<table {_TBL}><thead>', tr(_TH2_CELL.many(matrix[0])), '</thead><tbody>']
+    for cells in matrix[1:]:
+        if cells:
+            html.append(tr(_TDH_CELL(cells[0]), _TD_CELL.many(cells[1:])))
+        else:
+            html.append('<tr></tr>')
+    html.append('</tbody></table>')
+    return "".join(html)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -232,6 +248,27 @@ def build_outcome_map_html(matrix):
 #   Footer row   : column totals
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ASSESSMENT_WEIGHT_HEAD = (
+    f'<table {_TBL}><thead>'
+    # Row 1 — group labels
+    '<tr>'
+    f'<th rowspan="2" {_TH}>Cos with<br/>weightage</th>'
+    f'<th colspan="3" {_TH}>Quiz = 15 Marks</th>'
+    f'<th colspan="3" {_TH}>Test = 25 Marks</th>'
+    f'<th colspan="2" {_TH}>Assignment = 20 Marks</th>'
+    f'<th rowspan="2" {_TH}>CIE<br/>=60</th>'
+    f'<th rowspan="2" {_TH}>SEE<br/>=40</th>'
+    '</tr>'
+    # Row 2 — sub-column labels
+    + tr(_TH2_CELL.many(("Q1<br/>=5", "Q2<br/>=4", "Q3<br/>=6",
+                          "T1<br/>=7", "T2<br/>=8", "T3<br/>=10",
+                          "A1 = 10", "A2 = 10")))
+    + '</thead><tbody>'
+)
+
+_ASSESSMENT_WEIGHT_KEYS = ("q1", "q2", "q3", "t1", "t2", "t3", "a1", "a2")
+
+
 def build_assessment_weight_html(aw_list):
     """
     Build the full Assessment Weight Distribution table as HTML, matching
@@ -262,86 +299,64 @@ def build_assessment_weight_html(aw_list):
     if sSEE == 0:
         sSEE = 40
 
-    # ── Two-row merged header ─────────────────────────────────────────────
-    html = f'<table {_TBL}><thead>'
-
-    # Row 1 — group labels
-    html += (
-        '<tr>'
-        f'<th rowspan="2" {_TH}>Cos with<br/>weightage</th>'
-        f'<th colspan="3" {_TH}>Quiz = 15 Marks</th>'
-        f'<th colspan="3" {_TH}>Test = 25 Marks</th>'
-        f'<th colspan="2" {_TH}>Assignment = 20 Marks</th>'
-        f'<th rowspan="2" {_TH}>CIE<br/>=60</th>'
-        f'<th rowspan="2" {_TH}>SEE<br/>=40</th>'
-        '</tr>'
-    )
-
-    # Row 2 — sub-column labels
-    html += (
-        '<tr>'
-        f'<th {_TH2}>Q1<br/>=5</th>'
-        f'<th {_TH2}>Q2<br/>=4</th>'
-        f'<th {_TH2}>Q3<br/>=6</th>'
-        f'<th {_TH2}>T1<br/>=7</th>'
-        f'<th {_TH2}>T2<br/>=8</th>'
-        f'<th {_TH2}>T3<br/>=10</th>'
-        f'<th {_TH2}>A1 = 10</th>'
-        f'<th {_TH2}>A2 = 10</th>'
-        '</tr>'
-    )
-
-    html += '</thead><tbody>'
+    html = [_ASSESSMENT_WEIGHT_HEAD]
 
     # ── Data rows (CO1–CO6) ───────────────────────────────────────────────
-    for row in aw_list:
+    for aw in aw_list:
         def _v(k):
-            val = row.get(k, "")
+            val = aw.get(k, "")
             return "" if val == 0 else (val or "")
 
-        html += (
-            '<tr>'
-            f'<td {_TDH}>{row.get("co", "")}</td>'
-            f'<td {_TD}>{_v("q1")}</td>'
-            f'<td {_TD}>{_v("q2")}</td>'
-            f'<td {_TD}>{_v("q3")}</td>'
-            f'<td {_TD}>{_v("t1")}</td>'
-            f'<td {_TD}>{_v("t2")}</td>'
-            f'<td {_TD}>{_v("t3")}</td>'
-            f'<td {_TD}>{_v("a1")}</td>'
-            f'<td {_TD}>{_v("a2")}</td>'
-            f'<td {_TDH}>{_v("cie")}</td>'
-            f'<td {_TD}>{_v("see")}</td>'
-            '</tr>'
-        )
-
-    html += '</tbody>'
+        html.append(tr(
+            _TDH_CELL(aw.get("co", "")),
+            _TD_CELL.many(_v(k) for k in _ASSESSMENT_WEIGHT_KEYS),
+            _TDH_CELL(_v("cie")),
+            _TD_CELL(_v("see")),
+        ))
+
+    html.append('</tbody>')
 
     # ── Footer / totals row ───────────────────────────────────────────────
-    html += (
-        '<tfoot><tr>'
-        f'<td {_TDH}></td>'
-        f'<td {_TDH}>{sQ1}</td>'
-        f'<td {_TDH}>{sQ2}</td>'
-        f'<td {_TDH}>{sQ3}</td>'
-        f'<td {_TDH}>{sT1}</td>'
-        f'<td {_TDH}>{sT2}</td>'
-        f'<td {_TDH}>{sT3}</td>'
-        f'<td {_TDH}>{sA1}</td>'
-        f'<td {_TDH}>{sA2}</td>'
-        f'<td {_TDH}>{sCIE}</td>'
-        f'<td {_TDH}>{sSEE}</td>'
-        '</tr></tfoot>'
-    )
+    html.append('<tfoot>' + tr(_TDH_CELL.many(
+        ("", sQ1, sQ2, sQ3, sT1, sT2, sT3, sA1, sA2, sCIE, sSEE))) + '</tfoot>')
 
-    html += '</table>'
-    return html
+    html.append('</table>')
+    return "".join(html)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # HTML BUILDER: Recording Marks and Awarding Grades
 # ─────────────────────────────────────────────────────────────────────────────
 
+_RECORDING_MARKS_HEADERS = [
+    "S. No.", "USN", "Student<br/>Name",
+    "Quiz<br/>(15%)", "Test<br/>(25%)",
+    "Assignment<br/>20%", "SEE<br/>40%",
+    "Marks<br/>Scored", "Grade<br/>obtained"
+]
+
+_RECORDING_MARKS_FOOTER = (
+    '<p style="font-size:12px;margin:6px 0">'
+    '<strong>Class Average Marks:</strong> '
+    'Total marks of All Students (XXXX) / Number of students (N)'
+    '</p>'
+    '<p style="font-size:12px;margin:4px 0"><strong>Average Grade:</strong></p>'
+)
+
+
+def _recording_marks_placeholder_rows(col_count):
+    """Rows 1, 2, 3, …, N with blank mark cells."""
+    return [tr(_TD_CELL(lbl), _TD_BLANK * max(0, col_count - 1))
+            for lbl in ("1", "2", "3", "&nbsp;", "N")]
+
+
+def _recording_marks_total_placeholder(blank_cells):
+    return (f'<tr><td {_TD} colspan="3"><strong>Total</strong></td>'
+            + _TD_BLANK * blank_cells
+            + _TD_STRONG("XXXXX")
+            + _TD_BLANK + '</tr>')
+
+
 def build_recording_marks_html(rows):
     """
     Convert the 'Recording Marks and Awarding Grades' PDF table to HTML.
@@ -350,7 +365,7 @@ def build_recording_marks_html(rows):
     if not rows:
         return _default_recording_marks_html()
 
-    cells = [[clean_text(str(c)) if c else "" for c in row] for row in rows]
+    cells = CellMatrix.of(rows)
 
     kw_re = re.compile(
         r's\.?\s*no|usn|student|quiz|test|assignment|see|marks\s+scor|grade', re.I)
@@ -364,11 +379,11 @@ def build_recording_marks_html(rows):
     footer_lines = []
     in_header = True
 
-    for row in cells:
-        joined = " ".join(row)
-        nonempty = [c for c in row if c]
-        if not nonempty:
+    for r, empty in zip(cells.text, cells.row_empty):
+        if empty:
             continue
+        joined = " ".join(r)
+        nonempty = [c for c in r if c]
 
         if cavg_re.search(joined):
             footer_lines.append(joined)
@@ -376,18 +391,18 @@ def build_recording_marks_html(rows):
             continue
 
         if any(total_re.match(c) for c in nonempty):
-            total_row_out = row
+            total_row_out = r
             in_header = False
             continue
 
         if in_header and kw_re.search(joined):
-            header_parts.append(row)
+            header_parts.append(r)
             continue
 
         if nonempty and data_no_re.match(nonempty[0]):
             in_header = False
 
-        data_rows_out.append(row)
+        data_rows_out.append(r)
 
     # ── Merge 2-row wrapped header ────────────────────────────────────────
     if len(header_parts) >= 2:
@@ -400,95 +415,76 @@ def build_recording_marks_html(rows):
     elif len(header_parts) == 1:
         merged_hdr = header_parts[0]
     else:
-        merged_hdr = [
-            "S. No.", "USN", "Student<br/>Name",
-            "Quiz<br/>(15%)", "Test<br/>(25%)",
-            "Assignment<br/>20%", "SEE<br/>40%",
-            "Marks<br/>Scored", "Grade<br/>obtained"
-        ]
+        merged_hdr = _RECORDING_MARKS_HEADERS
 
     col_count = len(merged_hdr)
 
-    html = f'<table {_TBL}><thead><tr>'
-    html += "".join(f'<th {_TH}>{h}</th>' for h in merged_hdr)
-    html += '</tr></thead><tbody>'
+    html = [f'<table {_TBL}><thead>', tr(_TH_CELL.many(merged_hdr)), '</thead><tbody>']
 
     if data_rows_out:
-        for row in data_rows_out:
-            padded = row + [""] * max(0, col_count - len(row))
-            html += "<tr>" + "".join(
-                f'<td {_TD}>{c}</td>' for c in padded[:col_count]) + "</tr>"
+        for r in data_rows_out:
+            padded = list(r) + [""] * max(0, col_count - len(r))
+            html.append(tr(_TD_CELL.many(padded[:col_count])))
     else:
-        for lbl in ["1", "2", "3", "&nbsp;", "N"]:
-            html += f'<tr><td {_TD}>{lbl}</td>'
-            html += "".join(f'<td {_TD}>&nbsp;</td>' for _ in range(col_count - 1))
-            html += "</tr>"
+        html.extend(_recording_marks_placeholder_rows(col_count))
 
     if total_row_out:
-        padded = total_row_out + [""] * max(0, col_count - len(total_row_out))
-        html += "<tr>" + "".join(
-            f'<td {_TD}><strong>{c}</strong></td>' for c in padded[:col_count]) + "</tr>"
+        padded = list(total_row_out) + [""] * max(0, col_count - len(total_row_out))
+        html.append(tr(_TD_STRONG.many(padded[:col_count])))
     else:
-        html += (
-            f'<tr>'
-            f'<td {_TD} colspan="3"><strong>Total</strong></td>'
-            + "".join(f'<td {_TD}>&nbsp;</td>' for _ in range(max(0, col_count - 5)))
-            + f'<td {_TD}><strong>XXXXX</strong></td>'
-            + f'<td {_TD}>&nbsp;</td></tr>'
-        )
+        html.append(_recording_marks_total_placeholder(max(0, col_count - 5)))
 
-    html += '</tbody></table>'
+    html.append('</tbody></table>')
 
     if footer_lines:
         for line in footer_lines:
-            html += f'<p style="font-size:12px;margin:4px 0"><strong>{line}</strong></p>'
+            html.append(f'<p style="font-size:12px;margin:4px 0"><strong>{line}</strong></p>')
     else:
-        html += (
-            '<p style="font-size:12px;margin:6px 0">'
-            '<strong>Class Average Marks:</strong> '
-            'Total marks of All Students (XXXX) / Number of students (N)'
-            '</p>'
-            '<p style="font-size:12px;margin:4px 0"><strong>Average Grade:</strong></p>'
-        )
+        html.append(_RECORDING_MARKS_FOOTER)
 
-    return html
+    return "".join(html)
 
 
 def _default_recording_marks_html():
-    headers = [
-        "S. No.", "USN", "Student<br/>Name",
-        "Quiz<br/>(15%)", "Test<br/>(25%)",
-        "Assignment<br/>20%", "SEE<br/>40%",
-        "Marks<br/>Scored", "Grade<br/>obtained"
-    ]
-    html = f'<table {_TBL}><thead><tr>'
-    html += "".join(f'<th {_TH}>{h}</th>' for h in headers)
-    html += '</tr></thead><tbody>'
-    for lbl in ["1", "2", "3", "&nbsp;", "N"]:
-        html += f'<tr><td {_TD}>{lbl}</td>'
-        html += "".join(f'<td {_TD}>&nbsp;</td>' for _ in range(8))
-        html += "</tr>"
-    html += (
-        f'<tr><td {_TD} colspan="3"><strong>Total</strong></td>'
-        + "".join(f'<td {_TD}>&nbsp;</td>' for _ in range(3))
-        + f'<td {_TD}><strong>XXXXX</strong></td>'
-        + f'<td {_TD}>&nbsp;</td></tr>'
-    )
-    html += '</tbody></table>'
-    html += (
-        '<p style="font-size:12px;margin:6px 0">'
-        '<strong>Class Average Marks:</strong> '
-        'Total marks of All Students (XXXX) / Number of students (N)'
-        '</p>'
-        '<p style="font-size:12px;margin:4px 0"><strong>Average Grade:</strong></p>'
-    )
-    return html
+    col_count = len(_RECORDING_MARKS_HEADERS)
+    return "".join([
+        f'<table {_TBL}><thead>', tr(_TH_CELL.many(_RECORDING_MARKS_HEADERS)),
+        '</thead><tbody>',
+        *_recording_marks_placeholder_rows(col_count),
+        _recording_marks_total_placeholder(3),
+        '</tbody></table>',
+        _RECORDING_MARKS_FOOTER,
+    ])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # HTML BUILDER: Setting Attainment Targets
 # ─────────────────────────────────────────────────────────────────────────────
 
+_DEFAULT_ATTAINMENT_LEVELS = (
+    "70% of students will score C grade and above - Attainment Level 1 "
+    "60% of students will score C grade and above - Attainment Level 2 "
+    "50% of students will score C grade and above - Attainment Level 3"
+)
+
+
+def _attainment_targets_head(cap, col0, col1):
+    return (
+        f'<table {_TBL}>'
+        f'<caption {_CAP}>{cap}</caption>'
+        f'<thead><tr>'
+        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
+        f'text-align:center;font-weight:bold;vertical-align:middle;width:78%">{col0}</th>'
+        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
+        f'text-align:center;font-weight:bold;vertical-align:middle;width:22%">{col1}</th>'
+        f'</tr></thead><tbody>'
+    )
+
+
+def _attainment_targets_row(outcome_html, level):
+    return tr(_TDL_CELL(outcome_html), _TD_STRONG(level))
+
+
 def build_attainment_targets_html(rows):
     """
     Convert the 'Setting Attainment Targets' PDF table to HTML.
@@ -498,8 +494,7 @@ def build_attainment_targets_html(rows):
     if not rows:
         return _default_attainment_targets_html()
 
-    cells = [[clean_text(str(c)) if c else "" for c in row] for row in rows]
-    merged = merge_wrapped_rows(cells)
+    merged = merge_wrapped_rows(CellMatrix.of(rows))
 
     title_re = re.compile(r'attainment\s+of\s+course\s+outcomes', re.I)
     header_re = re.compile(
@@ -510,19 +505,19 @@ def build_attainment_targets_html(rows):
     header_row = None
     data_rows = []
 
-    for row in merged:
-        joined = " ".join(row)
-        nonempty = [c for c in row if c]
+    for r in merged:
+        joined = " ".join(r)
+        nonempty = [c for c in r if c]
         if not nonempty:
             continue
         if title_re.search(joined):
             title_text = joined
             continue
         if header_re.search(joined) and not data_re.search(joined):
-            header_row = row
+            header_row = r
             continue
         if data_re.search(joined):
-            data_rows.append(row)
+            data_rows.append(r)
 
     cap = title_text or "Attainment of Course Outcomes-COs"
     col0 = header_row[0] if header_row and len(
@@ -530,44 +525,21 @@ def build_attainment_targets_html(rows):
     col1 = header_row[1] if header_row and len(
         header_row) > 1 else "Targeted Attainment Level"
 
-    html = f'<table {_TBL}>'
-    html += f'<caption {_CAP}>{cap}</caption>'
-    html += (
-        f'<thead><tr>'
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
-        f'text-align:center;font-weight:bold;vertical-align:middle;width:78%">{col0}</th>'
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
-        f'text-align:center;font-weight:bold;vertical-align:middle;width:22%">{col1}</th>'
-        f'</tr></thead><tbody>'
-    )
+    html = [_attainment_targets_head(cap, col0, col1)]
 
     if data_rows:
-        for row in data_rows:
-            outcome_txt = row[0] if len(row) > 0 else ""
-            level_val = row[1] if len(row) > 1 else "1"
-            formatted = _format_attainment_levels(outcome_txt)
-            html += (
-                f'<tr>'
-                f'<td {_TDL}>{formatted}</td>'
-                f'<td {_TD}><strong>{level_val}</strong></td>'
-                f'</tr>'
-            )
+        for r in data_rows:
+            outcome_txt = r[0] if len(r) > 0 else ""
+            level_val = r[1] if len(r) > 1 else "1"
+            html.append(_attainment_targets_row(
+                _format_attainment_levels(outcome_txt), level_val))
     else:
-        default_fmt = _format_attainment_levels(
-            "70% of students will score C grade and above - Attainment Level 1 "
-            "60% of students will score C grade and above - Attainment Level 2 "
-            "50% of students will score C grade and above - Attainment Level 3"
-        )
-        for _ in range(6):
-            html += (
-                f'<tr>'
-                f'<td {_TDL}>{default_fmt}</td>'
-                f'<td {_TD}><strong>1</strong></td>'
-                f'</tr>'
-            )
-
-    html += '</tbody></table>'
-    return html
+        default_row = _attainment_targets_row(
+            _format_attainment_levels(_DEFAULT_ATTAINMENT_LEVELS), "1")
+        html.append(default_row * 6)
+
+    html.append('</tbody></table>')
+    return "".join(html)
 
 
 def _format_attainment_levels(text):
@@ -579,30 +551,14 @@ def _format_attainment_levels(text):
 
 
 def _default_attainment_targets_html():
-    default_fmt = _format_attainment_levels(
-        "70% of students will score C grade and above - Attainment Level 1 "
-        "60% of students will score C grade and above - Attainment Level 2 "
-        "50% of students will score C grade and above - Attainment Level 3"
-    )
-    html = (
-        f'<table {_TBL}>'
-        f'<caption {_CAP}>Attainment of Course Outcomes-COs</caption>'
-        f'<thead><tr>'
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
-        f'text-align:center;font-weight:bold;vertical-align:middle;width:78%">Outcomes- Targeted</th>'
-        f'<th {_TH} style="border:1px solid #b0b8cc;padding:8px 10px;background:#d1d5db;'
-        f'text-align:center;font-weight:bold;vertical-align:middle;width:22%">Targeted Attainment Level</th>'
-        f'</tr></thead><tbody>'
+    default_row = _attainment_targets_row(
+        _format_attainment_levels(_DEFAULT_ATTAINMENT_LEVELS), "1")
+    return (
+        _attainment_targets_head("Attainment of Course Outcomes-COs",
+                                 "Outcomes- Targeted", "Targeted Attainment Level")
+        + default_row * 6
+        + '</tbody></table>'
     )
-    for _ in range(6):
-        html += (
-            f'<tr>'
-            f'<td {_TDL}>{default_fmt}</td>'
-            f'<td {_TD}><strong>1</strong></td>'
-            f'</tr>'
-        )
-    html += '</tbody></table>'
-    return html
 
 
 # ─────────────────────────────────────────────
@@ -610,13 +566,13 @@ def _default_attainment_targets_html():
 # ─────────────────────────────────────────────
 
 def parse_metadata_table(table, data):
-    for row in table:
+    for row, lower in zip(table.text, table.lower):
         if len(row) < 2 or not row[0]:
             continue
-        key = clean_text(str(row[0])).lower()
-        val = clean_text(row[1]) if row[1] else ""
-        if not val and len(row) >= 4 and row[3]:
-            val = clean_text(row[3])
+        key = lower[0]
+        val = row[1]
+        if not val and len(row) >= 4:
+            val = row[3]
 
         if "course code" in key:
             data["courseCode"] = val
@@ -644,15 +600,14 @@ def parse_metadata_table(table, data):
         elif "faculty member" in key:
             data["facultyMember"] = val
         elif "semester duration" in key:
-            dur_parts = [str(c) for c in row[1:] if c and str(c).strip()]
-            data["semesterDuration"] = clean_text(" ".join(dur_parts))
+            data["semesterDuration"] = " ".join(c for c in row[1:] if c)
 
 
 def parse_credits_table(table, data):
     if len(table) < 2:
         return
-    headers = [clean_text(str(c)).lower() if c else "" for c in table[0]]
-    vals = [clean_text(str(c)) if c else "" for c in table[1]]
+    headers = table.lower[0]
+    vals = table.text[1]
     for i, h in enumerate(headers):
         if i >= len(vals):
             break
@@ -673,13 +628,14 @@ def process_teaching_rows(rows, data):
     if not rows:
         return
 
+    # Keyword tests on cleaned, lowercased cells: none of the keywords
+    # contains whitespace, so cleaning cannot change whether they match.
     col_map = {"num": 0, "topic": 1, "slides": 2, "videos": 3}
-    for row in rows:
-        joined = " ".join(str(c).lower() for c in row if c)
+    for row in rows.lower:
+        joined = " ".join(row)
         if ("lecture" in joined or "topic" in joined) and (
                 "number" in joined or "no" in joined or "#" in joined or "lecture" in joined):
-            for j, cell in enumerate(row):
-                ct = str(cell).lower() if cell else ""
+            for j, ct in enumerate(row):
                 if "number" in ct or ("lecture" in ct and "no" in ct):
                     col_map["num"] = j
                 elif "topic" in ct or "content" in ct:
@@ -693,12 +649,12 @@ def process_teaching_rows(rows, data):
     max_col = max(col_map.values())
 
     def is_header_row(row):
-        joined = " ".join(str(c).lower() for c in row if c)
+        joined = " ".join(row)
         return ("lecture" in joined and "topic" in joined) or (
             "lecture" in joined and "number" in joined)
 
-    cleaned_rows = [r for r in rows if not is_header_row(r)]
-    merged = merge_wrapped_rows(cleaned_rows)
+    body = [i for i, row in enumerate(rows.lower) if not is_header_row(row)]
+    merged = merge_wrapped_rows(rows, body)
 
     annotation_patterns = [
         r"issue assignment", r"quiz\s*-?\s*\d",
@@ -707,11 +663,11 @@ def process_teaching_rows(rows, data):
     ]
 
     for row in merged:
-        padded = list(row) + [""] * (max_col + 2 - len(row))
-        num = clean_text(padded[col_map["num"]])
-        topic = clean_text(padded[col_map["topic"]])
-        slides = clean_text(padded[col_map["slides"]])
-        videos = clean_text(padded[col_map["videos"]])
+        padded = row + [""] * (max_col + 2 - len(row))
+        num = padded[col_map["num"]]
+        topic = padded[col_map["topic"]]
+        slides = padded[col_map["slides"]]
+        videos = padded[col_map["videos"]]
 
         if not num and (not topic or len(topic) < 3):
             continue
@@ -728,9 +684,8 @@ def process_assessment_rows(rows, data):
     if not rows:
         return
 
-    for row in rows:
-        cleaned = [clean_text(str(c)) if c is not None else "" for c in row]
-        if not any(cleaned):
+    for cleaned, empty in zip(rows.text, rows.row_empty):
+        if empty:
             continue
 
         row_str = " ".join(cleaned)
@@ -801,11 +756,8 @@ def process_outcome_rows(rows, data):
     if not rows:
         return
 
-    matrix = []
-    for row in rows:
-        cleaned = [clean_text(str(c)) if c is not None else "" for c in row]
-        if any(cleaned):
-            matrix.append(cleaned)
+    matrix = [list(cleaned) for cleaned, empty in zip(rows.text, rows.row_empty)
+              if not empty]
 
     if len(matrix) < 2:
         return
@@ -877,7 +829,7 @@ def _section(full_text, start_pattern, end_pattern,
     return m.group(1) if m else ""
 
 
-def extract_rich_sections(full_text, data):
+def extract_rich_sections(full_text, data, perf=NULL_PERF):
     # 2.1 Aims
     raw = _section(full_text,
                    r'2\.1\s+Course\s+Aims\s+and\s+Summary',
@@ -886,6 +838,7 @@ def extract_rich_sections(full_text, data):
         raw = _section(full_text,
                        r'Course\s+Aims\s+and\s+Summary',
                        r'Course\s+Objectives|2\.2')
+    perf.section("aimsSummary", bool(raw))
     data["aimsSummary"] = format_bullets_to_html(raw)
 
     # 2.2 Objectives
@@ -896,6 +849,7 @@ def extract_rich_sections(full_text, data):
         raw = _section(full_text,
                        r'Course\s+Objectives',
                        r'Course\s+Outcomes|2\.3')
+    perf.section("objectives", bool(raw))
     data["objectives"] = format_bullets_to_html(raw)
 
     # 2.4 Course Content
@@ -906,6 +860,7 @@ def extract_rich_sections(full_text, data):
         raw = _section(full_text,
                        r'Course\s+Content',
                        r'Course\s+Resources|2\.5|3\.\s*Teaching')
+    perf.section("courseContent", bool(raw))
     data["courseContent"] = format_bullets_to_html(raw)
 
     # 3.3 / 3.4 Grading Criterion
@@ -916,6 +871,7 @@ def extract_rich_sections(full_text, data):
         raw = _section(full_text,
                        r'Grading\s+Criterion',
                        r'Attainment|Recording\s+Marks|4\.\s*Other')
+    perf.section("gradingCriterion", bool(raw))
     data["gradingCriterion"] = format_bullets_to_html(raw)
 
     # 4.1 Assignment Details
@@ -926,12 +882,14 @@ def extract_rich_sections(full_text, data):
         raw = _section(full_text,
                        r'Assignment\s+Details\s+or\s+Problem\s+Based\s+Learning:?',
                        r'Academic\s+Integrity')
+    perf.section("assignmentDetails", bool(raw))
     data["otherDetails"]["assignmentDetails"] = clean_text(raw)
 
     # 4.2 Academic Integrity
     raw = _section(full_text,
                    r'(?:4\.2\s+)?Academic\s+Integrity\s+Policy:?',
                    r'\Z')
+    perf.section("academicIntegrity", bool(raw))
     data["otherDetails"]["academicIntegrity"] = clean_text(raw)
 
 
@@ -995,136 +953,110 @@ def extract_total_hours_fallback(full_text, data):
             data["totalHours"] = safe_int(m.group(1))
 
 
-# ─────────────────────────────────────────────
-# TABLE CLASSIFIER HELPERS
-# ─────────────────────────────────────────────
-
-def _is_recording_marks_table(all_cells_text):
-    markers = ("s. no", "s.no", "usn", "student name",
-               "marks scored", "grade obtained", "marks\nscored")
-    return any(m in all_cells_text for m in markers)
-
-
-def _is_attainment_targets_table(all_cells_text):
-    return (
-        "attainment of course outcomes" in all_cells_text or
-        "outcomes- targeted" in all_cells_text or
-        "targeted attainment level" in all_cells_text or
-        ("attainment" in all_cells_text and "outcomes" in all_cells_text
-         and "targeted" in all_cells_text)
-    )
-
-
 # ─────────────────────────────────────────────
 # SINGLE CD PARSER  (state machine over tables)
 # ─────────────────────────────────────────────
 
-def parse_single_cd(pages_text, all_tables):
+def parse_single_cd(pages_text, all_tables, perf=NULL_PERF, output="both"):
     data = make_empty_cd()
     full_text = "\n".join(pages_text)
 
     current_section = None
-    teaching_rows = []
-    assessment_rows = []
-    outcome_rows = []
-    recording_marks_rows = []
-    attainment_tgt_rows = []
+    section_rows = {
+        "outcome": [],
+        "assessment": [],
+        "teaching": [],
+        "recording_marks": [],
+        "attainment_targets": [],
+    }
 
     for table in all_tables:
         if not table or not table[0]:
             continue
 
-        all_cells = " ".join(
-            str(c).lower().strip() for row in table for c in row if c
-        )
-        header_cells = [str(c).lower().strip() for c in table[0] if c]
-        header_text = " ".join(header_cells)
+        # Every consumer below reads this one normalised copy of the cells.
+        cells = CellMatrix.from_rows(table)
+        label, confidence = classify_table(cells)
+        perf.count(f"table_labels.{label or 'continuation'}")
+        if label is not None and confidence < 1:
+            # More than one rule fired and the rule order chose the label.
+            perf.count(f"table_labels_tie_broken.{label}")
+
+        if label == "metadata":
+            parse_metadata_table(cells, data)
+        elif label == "credits":
+            parse_credits_table(cells, data)
+        elif label is not None:
+            section_rows[label].append(cells)
+        # ── Multi-page continuation ───────────────────────────────────────
+        elif current_section in section_rows:
+            section_rows[current_section].append(cells)
+        if label is not None:
+            current_section = label
+    sections = {k: CellMatrix.concat(v) for k, v in section_rows.items()}
+
+    # ── PROCESS STRUCTURED TABLE DATA ─────────────────────────────────────
+    with perf.stage("table_rows"):
+        process_teaching_rows(sections["teaching"], data)
+        process_assessment_rows(sections["assessment"], data)
+        process_outcome_rows(sections["outcome"], data)
+        fallback_parse_outcome_map(full_text, data)
 
-        # ── Recording Marks ───────────────────────────────────────────────
-        if _is_recording_marks_table(all_cells):
-            recording_marks_rows.extend(table)
-            current_section = "recording_marks"
-            continue
+    # ── FREE-TEXT SECTIONS ─────────────────────────────────────────────────
+    # Must run before HTML rendering so courseOutcomes is fully populated
+    with perf.stage("regex_sections"):
+        extract_rich_sections(full_text, data, perf)
+        extract_course_outcomes(full_text, data)
+        extract_resources(full_text, data)
+        extract_total_hours_fallback(full_text, data)
+
+    # Raw rows the attainment HTML tables are rendered from; the HTML path
+    # hands the builders the CellMatrix itself, so nothing is re-normalised.
+    attainment = {
+        "recordingMarksRows": sections["recording_marks"],
+        "settingTargetsRows": sections["attainment_targets"],
+    }
+    if output == "structured":
+        # render_cd_html rebuilds the HTML strings; attainmentCalculations
+        # carries the raw rows here instead.
+        for key in HTML_FIELDS:
+            if key.endswith("Html"):
+                del data[key]
+        data["attainmentCalculations"] = {k: m.rows for k, m in attainment.items()}
+        return data
 
-        # ── Attainment Targets ────────────────────────────────────────────
-        if _is_attainment_targets_table(all_cells):
-            attainment_tgt_rows.extend(table)
-            current_section = "attainment_targets"
-            continue
+    data["attainmentCalculations"] = attainment
+    with perf.stage("html_builders"):
+        data = render_cd_html(data)
+    return html_fields(data) if output == "html" else data
 
-        # ── Identity / Metadata ───────────────────────────────────────────
-        if ("course code" in header_text or
-                "program title" in header_text or
-                "school code" in header_text):
-            parse_metadata_table(table, data)
-            current_section = "metadata"
-            continue
 
-        # ── Credits ───────────────────────────────────────────────────────
-        if ("credits" in header_text and
-                any(h in header_cells for h in ("l", "t", "p"))):
-            parse_credits_table(table, data)
-            current_section = "credits"
-            continue
+# ─────────────────────────────────────────────
+# OUTPUT MODES  (structured | html | both)
+# ─────────────────────────────────────────────
 
-        # ── Outcome Map ───────────────────────────────────────────────────
-        is_outcome = (
-            re.search(r'\bco[s]?\s', header_text) and
-            re.search(r'\bpo\b|\bpo\d', header_text)
-        ) or "outcome map" in header_text
-        if is_outcome:
-            outcome_rows.extend(table)
-            current_section = "outcome"
-            continue
+OUTPUT_MODES = ("structured", "html", "both")
 
-        # ── Assessment Weight ─────────────────────────────────────────────
-        is_assessment = (
-            ("quiz" in header_text and ("test" in header_text or "see" in header_text)) or
-            ("weight" in header_text and "outcome" in header_text) or
-            ("co" in header_cells and "quiz" in header_text)
-        )
-        if is_assessment:
-            assessment_rows.extend(table)
-            current_section = "assessment"
-            continue
+# Top-level fields rendered from the structured ones; in "structured" output
+# attainmentCalculations holds the raw table rows instead of HTML.
+HTML_FIELDS = ("courseOutcomesHtml", "outcomeMapHtml", "assessmentWeightHtml",
+               "attainmentCalculations")
 
-        # ── Teaching Schedule ─────────────────────────────────────────────
-        is_teaching = (
-            ("lecture" in header_text and "topic" in header_text) or
-            ("lecture" in header_text and "number" in header_text)
-        )
-        if is_teaching:
-            teaching_rows.extend(table)
-            current_section = "teaching"
-            continue
 
-        # ── Multi-page continuation ───────────────────────────────────────
-        if current_section == "outcome":
-            outcome_rows.extend(table)
-        elif current_section == "assessment":
-            assessment_rows.extend(table)
-        elif current_section == "teaching":
-            teaching_rows.extend(table)
-        elif current_section == "recording_marks":
-            recording_marks_rows.extend(table)
-        elif current_section == "attainment_targets":
-            attainment_tgt_rows.extend(table)
+def render_cd_html(cd):
+    """
+    Fill in the Jodit HTML fields of one CD from its structured fields, e.g.
+    a record produced with --output structured. Fields keep the layout of
+    make_empty_cd(), so the result matches a --output both parse.
+    """
+    template = make_empty_cd()
+    data = {k: cd.get(k, v) for k, v in template.items()}
+    data.update((k, v) for k, v in cd.items() if k not in template)
 
-    # ── PROCESS STRUCTURED TABLE DATA ─────────────────────────────────────
-    process_teaching_rows(teaching_rows, data)
-    process_assessment_rows(assessment_rows, data)
-    process_outcome_rows(outcome_rows, data)
-    fallback_parse_outcome_map(full_text, data)
+    attainment = cd.get("attainmentCalculations") or {}
+    recording_marks_rows = attainment.get("recordingMarksRows") or []
+    attainment_tgt_rows = attainment.get("settingTargetsRows") or []
 
-    # ── FREE-TEXT SECTIONS ─────────────────────────────────────────────────
-    # Must run before HTML builders so courseOutcomes is fully populated
-    extract_rich_sections(full_text, data)
-    extract_course_outcomes(full_text, data)
-    extract_resources(full_text, data)
-    extract_total_hours_fallback(full_text, data)
-
-    # ── GENERATE ALL HTML TABLE STRINGS (Jodit-rendered) ──────────────────
-    #
     #  2.3 Course Outcomes
     data["courseOutcomesHtml"] = build_course_outcomes_html(
         data["courseOutcomes"])
@@ -1138,18 +1070,27 @@ def parse_single_cd(pages_text, all_tables):
         data["assessmentWeight"])
 
     #  Attainment Calculations
-    data["attainmentCalculations"]["recordingMarks"] = (
-        build_recording_marks_html(recording_marks_rows)
-        if recording_marks_rows else _default_recording_marks_html()
-    )
-    data["attainmentCalculations"]["settingTargets"] = (
-        build_attainment_targets_html(attainment_tgt_rows)
-        if attainment_tgt_rows else _default_attainment_targets_html()
-    )
-
+    data["attainmentCalculations"] = {
+        "recordingMarks": (
+            build_recording_marks_html(recording_marks_rows)
+            if recording_marks_rows else _default_recording_marks_html()
+        ),
+        "settingTargets": (
+            build_attainment_targets_html(attainment_tgt_rows)
+            if attainment_tgt_rows else _default_attainment_targets_html()
+        ),
+    }
     return data
 
 
+def html_fields(cd):
+    """The "html" output of one rendered CD: its identity plus the HTML fields."""
+    out = {"courseCode": cd.get("courseCode", ""),
+           "courseTitle": cd.get("courseTitle", "")}
+    out.update((k, cd[k]) for k in HTML_FIELDS if k in cd)
+    return out
+
+
 # ─────────────────────────────────────────────
 # MULTI-CD BOUNDARY DETECTOR
 # ─────────────────────────────────────────────
@@ -1169,64 +1110,269 @@ def find_cd_boundaries(pages_text):
     return boundaries
 
 
+# ─────────────────────────────────────────────
+# PAGE EXTRACTION (serial + page-parallel)
+# ─────────────────────────────────────────────
+
+LINES_STRICT_SETTINGS = {
+    "vertical_strategy":   "lines_strict",
+    "horizontal_strategy": "lines_strict",
+    "snap_tolerance":      3,
+    "join_tolerance":      3,
+}
+
+# Each worker re-opens the PDF, so tiny shards cost more than they save.
+MIN_PAGES_PER_SHARD = 8
+
+
+def extract_page_artifacts(pages, idx):
+    """
+    Text + tables for one page: lines_strict first, default strategy as
+    fallback. The page's layout objects are released afterwards, so memory
+    stays flat however long the bundle is.
+    """
+    text = pages.text(idx)
+    tables = pages.tables(idx, LINES_STRICT_SETTINGS)
+    if not tables:
+        pages.perf.count("table_fallbacks")
+        tables = pages.tables(idx)
+    pages.release(idx)
+    return text, tables
+
+
+def _page_cache(pdf, use_cache, perf=NULL_PERF, guard=NULL_GUARD):
+    # plan_tables: text-only pages (aims, content, resources) skip both table
+    # passes, and a template whose ruling lines_strict cannot read skips it.
+    return PageArtifactCache(
+        pdf, store=PageArtifactCache.default_store() if use_cache else None,
+        perf=perf, plan_tables=True, guard=guard)
+
+
+def _extract_page_range(file_path, start, end, use_cache=True, timings=False,
+                        soft_end=None, limits=None):
+    """
+    Process-pool worker: opens its own pdfplumber handle for pages [start, end).
+    Returns (artifacts, perf snapshot or None, throttled pages or None) so the
+    parent can merge timings and page-guard reports. With `soft_end` (the
+    parent Deadline's), it stops early and returns fewer artifacts than
+    pages; `limits` are the parent PageGuard's.
+    """
+    perf = PerfRecorder() if timings else NULL_PERF
+    deadline = Deadline.until(soft_end) if soft_end else NULL_DEADLINE
+    guard = PageGuard(limits) if limits else NULL_GUARD
+    with pdfplumber.open(file_path) as pdf:
+        pages = _page_cache(pdf, use_cache, perf, guard)
+        artifacts = []
+        for i in range(start, end):
+            if not deadline.allows_page():
+                break
+            artifacts.append(extract_page_artifacts(pages, i))
+        pages.flush()
+        return artifacts, perf.snapshot(), guard.snapshot()
+
+
+def _page_shards(page_count, jobs):
+    shard_count = max(1, min(jobs * 4, page_count // MIN_PAGES_PER_SHARD))
+    size = -(-page_count // shard_count)
+    return [(s, min(s + size, page_count)) for s in range(0, page_count, size)]
+
+
+def extract_all_pages(file_path, jobs=1, use_cache=True, perf=NULL_PERF,
+                      control=NULL_CONTROL, deadline=NULL_DEADLINE, guard=NULL_GUARD):
+    """
+    Returns (pages_text, pages_tables) in page order. With jobs > 1, contiguous
+    page ranges are sharded across a process pool; executor.map preserves shard
+    order, so the result is identical to the serial path. `control` hears
+    about every page (every shard when sharded) and may cancel between them.
+    When `deadline` stops reading, only the leading pages read so far are
+    returned and the rest are recorded as skipped. Pages `guard` throttles
+    come back with no tables (or empty text) and are recorded on it.
+    """
+    jobs = min(jobs, os.cpu_count() or 1)
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        perf.count("pages", page_count)
+        shards = _page_shards(page_count, jobs) if jobs > 1 else []
+        if len(shards) <= 1:
+            pages = _page_cache(pdf, use_cache, perf, guard)
+            artifacts = []
+            for i in range(page_count):
+                if not deadline.allows_page():
+                    deadline.skip_pages(i, page_count)
+                    break
+                artifacts.append(extract_page_artifacts(pages, i))
+                control.progress(i + 1, page_count)
+            pages.flush()
+            return [a[0] for a in artifacts], [a[1] for a in artifacts]
+
+    artifacts = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(shards))) as pool:
+        try:
+            for n, chunk in enumerate(pool.map(_extract_page_range,
+                                  [file_path] * len(shards),
+                                  [s for s, _ in shards],
+                                  [e for _, e in shards],
+                                  [use_cache] * len(shards),
+                                  [perf.enabled] * len(shards),
+                                  [deadline.soft_end] * len(shards),
+                                  [guard.limits] * len(shards))):
+                artifacts.extend(chunk[0])
+                perf.merge(chunk[1])
+                guard.merge(chunk[2])
+                control.progress(len(artifacts), page_count)
+                if len(artifacts) < shards[n][1]:
+                    # A shard hit the deadline: keep the contiguous prefix only.
+                    deadline.skip_pages(len(artifacts), page_count)
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    break
+        except BaseException:
+            # Cancelled (or failed): don't start the shards still queued.
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    return [a[0] for a in artifacts], [a[1] for a in artifacts]
+
+
 # ─────────────────────────────────────────────
 # TOP-LEVEL PDF PARSER
 # ─────────────────────────────────────────────
 
-def parse_cd_pdf(file_path):
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            pages_text = []
-            pages_tables = []
-            for page in pdf.pages:
-                pages_text.append(page.extract_text() or "")
-                tables = page.extract_tables({
-                    "vertical_strategy":   "lines_strict",
-                    "horizontal_strategy": "lines_strict",
-                    "snap_tolerance":      3,
-                    "join_tolerance":      3,
-                })
-                if not tables:
-                    tables = page.extract_tables() or []
-                pages_tables.append(tables)
-
-        boundaries = find_cd_boundaries(pages_text)
+def _parse_cd_chunk(chunk_text, chunk_tables, course_code_hint, perf=NULL_PERF,
+                    output="both"):
+    """Parse one CD slice of a bundle; None when it yields no identity at all."""
+    with perf.stage("parse_single_cd"):
+        parsed = parse_single_cd(chunk_text, chunk_tables, perf, output)
+    if not parsed.get("courseCode"):
+        parsed["courseCode"] = course_code_hint
+    if parsed.get("courseCode") or parsed.get("courseTitle"):
+        return parsed
+    return None
+
+
+_PARSER_SOURCES = local_sources(__file__)
+_fingerprint = None
+
 
+def _parser_fingerprint():
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = parser_fingerprint(_PARSER_SOURCES)
+    return _fingerprint
+
+
+def _preflight_failure(file_path, perf=NULL_PERF):
+    """
+    Message when the layout-free probe rules the upload out (unreadable, or
+    no text layer, i.e. scanned), else None. Runs before any page layout.
+    """
+    with perf.stage("preflight"):
+        probe = preflight(file_path)
+    if probe["error"]:
+        return probe["error"]
+    if not probe["has_text"]:
+        return "No text found in PDF (might be scanned)."
+    perf.count("preflight_cd_markers", probe["cd_markers"])
+    return None
+
+
+def parse_cd_pdf(file_path, jobs=1, use_cache=True, perf=NULL_PERF, output="both",
+                 control=NULL_CONTROL, deadline=NULL_DEADLINE, guard=NULL_GUARD):
+    """
+    Cache-aware entry point: identical uploads skip the pdfplumber pipeline.
+    `control` (job_control.JobControl) receives stage / progress / boundary
+    events and can cancel the parse at the next page or CD. `deadline`
+    (job_control.Deadline) stops it early with a `partial` result, and
+    `guard` (page_guard.PageGuard) reads pathological pages as text only,
+    listing them in `throttledPages`. Partial and throttled results are
+    never cached.
+    """
+    cache = ResultCache.from_env() if use_cache else None
+    cache_key = None
+    if cache:
+        with perf.stage("result_cache_lookup"):
+            schema = "cd" if output == "both" else f"cd.{output}"
+            cache_key = cache.key(file_path, schema, _parser_fingerprint())
+            cached = cache.get(cache_key)
+        if cached is not None:
+            perf.count("result_cache_hits")
+            return cached
+
+    result = _parse_cd_pdf_uncached(file_path, jobs, use_cache, perf, output, control,
+                                    deadline, guard)
+    if (cache and result.get("success") and not result.get("partial")
+            and not result.get("throttledPages")):
+        cache.put(cache_key, result)
+    return result
+
+
+def _parse_cd_pdf_uncached(file_path, jobs=1, use_cache=True, perf=NULL_PERF,
+                           output="both", control=NULL_CONTROL,
+                           deadline=NULL_DEADLINE, guard=NULL_GUARD):
+    control.stage("preflight")
+    failure = _preflight_failure(file_path, perf)
+    if failure:
+        return {"success": False, "message": failure, "parsedData": []}
+    try:
+        control.stage("extract_pages")
+        with perf.stage("extract_pages"):
+            pages_text, pages_tables = extract_all_pages(
+                file_path, jobs, use_cache, perf, control, deadline, guard)
+        if not pages_text and deadline.partial:
+            return {"success": False,
+                    "message": "Deadline reached before any page was read.",
+                    "parsedData": []}
+
+        control.stage("find_cd_boundaries")
+        with perf.stage("find_cd_boundaries"):
+            boundaries = find_cd_boundaries(pages_text)
+        for page, code in boundaries:
+            control.boundary(page, code)
+
+        control.stage("parse_cds")
         # ── Single CD ─────────────────────────────────────────────────────
         if not boundaries:
             all_tables = [t for pt in pages_tables for t in pt]
-            parsed = parse_single_cd(pages_text, all_tables)
-            return {
+            with perf.stage("parse_single_cd"):
+                parsed = parse_single_cd(pages_text, all_tables, perf, output)
+            control.progress(1, 1)
+            return guard.annotate(deadline.annotate({
                 "success":    True,
                 "message":    "Single CD parsed (no boundaries detected)",
                 "parsedData": [parsed]
-            }
+            }))
 
         # ── Multi-CD ──────────────────────────────────────────────────────
-        boundaries.append((len(pages_text), "EOF"))
+        end_page = len(pages_text)
+        if deadline.partial:
+            # The last CD runs into the pages that were never read; its pages
+            # end the CD before it, as its boundary would have.
+            end_page, cut_code = boundaries.pop()
+            deadline.skip_cd(cut_code, "cut off by the deadline; not parsed.")
+        boundaries.append((end_page, "EOF"))
         cd_list = []
 
         for idx in range(len(boundaries) - 1):
+            if deadline.expired():
+                for _, code in boundaries[idx:-1]:
+                    deadline.skip_cd(code, "deadline reached; not parsed.")
+                break
             start_page = boundaries[idx][0]
             end_page = boundaries[idx + 1][0]
-            course_code_hint = boundaries[idx][1]
 
             chunk_text = pages_text[start_page:end_page]
             chunk_tables = [
                 t for pt in pages_tables[start_page:end_page] for t in pt]
 
-            parsed = parse_single_cd(chunk_text, chunk_tables)
-            if not parsed.get("courseCode"):
-                parsed["courseCode"] = course_code_hint
-
-            if parsed.get("courseCode") or parsed.get("courseTitle"):
+            parsed = _parse_cd_chunk(chunk_text, chunk_tables, boundaries[idx][1],
+                                     perf, output)
+            if parsed:
                 cd_list.append(parsed)
+            control.progress(idx + 1, len(boundaries) - 1)
 
-        return {
+        return guard.annotate(deadline.annotate({
             "success":    True,
             "message":    f"Successfully parsed {len(cd_list)} Course Document(s).",
             "parsedData": cd_list
-        }
+        }))
 
     except Exception as e:
         import traceback
@@ -1238,21 +1384,266 @@ def parse_cd_pdf(file_path):
         }
 
 
+# ─────────────────────────────────────────────
+# STREAMING (NDJSON, one record per CD)
+# ─────────────────────────────────────────────
+
+def iter_cd_pdf(file_path, use_cache=True, perf=NULL_PERF, output="both",
+                control=NULL_CONTROL, deadline=NULL_DEADLINE, guard=NULL_GUARD):
+    """
+    Yield parsed CDs one at a time while walking the pages once. A CD is
+    emitted as soon as the next CD_START_RE boundary (or EOF) closes it, and
+    its page artifacts are dropped, so peak memory tracks the largest single
+    CD rather than the whole bundle. Pages before the first boundary are
+    discarded, matching the buffered path. When `deadline` stops the walk,
+    the CD it cut off is recorded as skipped rather than yielded.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        pages = _page_cache(pdf, use_cache, perf, guard)
+        perf.count("pages", len(pages))
+        control.stage("extract_pages")
+        chunk_text, chunk_tables = [], []
+        code_hint = None
+
+        for idx in range(len(pages)):
+            if not deadline.allows_page():
+                deadline.skip_pages(idx, len(pages))
+                break
+            text, tables = extract_page_artifacts(pages, idx)
+            pages.evict(idx)
+            control.progress(idx + 1, len(pages))
+
+            m = CD_START_RE.search(text)
+            if m:
+                control.boundary(idx, m.group(1).upper())
+                if code_hint is not None:
+                    parsed = _parse_cd_chunk(chunk_text, chunk_tables, code_hint,
+                                             perf, output)
+                    if parsed:
+                        yield parsed
+                chunk_text, chunk_tables = [], []
+                code_hint = m.group(1).upper()
+
+            chunk_text.append(text)
+            chunk_tables.extend(tables)
+
+        pages.flush()
+        if deadline.partial and code_hint is not None:
+            deadline.skip_cd(code_hint, "cut off by the deadline; not parsed.")
+        elif deadline.partial and not chunk_text:
+            return  # stopped before the first page
+        elif code_hint is None:
+            # No boundaries at all: the whole file is a single CD.
+            with perf.stage("parse_single_cd"):
+                parsed = parse_single_cd(chunk_text, chunk_tables, perf, output)
+            yield parsed
+        else:
+            parsed = _parse_cd_chunk(chunk_text, chunk_tables, code_hint, perf, output)
+            if parsed:
+                yield parsed
+
+
+def stream_cd_pdf(file_path, out=sys.stdout, use_cache=True, perf=NULL_PERF,
+                  output="both", control=NULL_CONTROL, deadline=NULL_DEADLINE,
+                  guard=NULL_GUARD):
+    """
+    Write one NDJSON record per CD ({"type": "cd", "index", "data"}) as each
+    completes, then a closing {"type": "summary"} record, which carries the
+    perf report when `perf` is a PerfRecorder, `partial` / skipped pages
+    and CDs when `deadline` cut the parse short, and `throttledPages` when
+    `guard` throttled any page.
+    """
+    count = 0
+    written = 0
+    failure = _preflight_failure(file_path, perf)
+    if failure:
+        summary = {"type": "summary", "success": False,
+                   "message": failure, "count": 0}
+        return _write_summary(summary, out, perf, written)
+    try:
+        for parsed in iter_cd_pdf(file_path, use_cache, perf, output, control,
+                                  deadline, guard):
+            line = json.dumps({"type": "cd", "index": count, "data": parsed},
+                              ensure_ascii=False) + "\n"
+            out.write(line)
+            out.flush()
+            written += len(line.encode("utf-8"))
+            count += 1
+        summary = guard.annotate(deadline.annotate({
+            "type":    "summary",
+            "success": True,
+            "message": f"Successfully parsed {count} Course Document(s).",
+            "count":   count
+        }))
+    except Exception as e:
+        import traceback
+        summary = {
+            "type":    "summary",
+            "success": False,
+            "message": f"Parser error: {str(e)}",
+            "trace":   traceback.format_exc(),
+            "count":   count
+        }
+    return _write_summary(summary, out, perf, written)
+
+
+def _write_summary(summary, out, perf, written):
+    if perf.enabled:
+        summary["perf"] = perf.report(output_bytes=written)
+    out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    out.flush()
+    return summary
+
+
+def run_job(job, control=NULL_CONTROL):
+    """
+    Worker-service / batch / --job adapter: {"file": path} → parse_cd_pdf
+    result. A job with "timings": true gets the same `perf` object as
+    --timings, "output" selects structured / html / both like --output, and
+    "deadline_ms" / "page_limits" work like --deadline-ms / --page-limits.
+    """
+    fp = job["file"]
+    if not Path(fp).exists():
+        return {"success": False, "message": f"File not found: {fp}"}
+    output = job.get("output", "both")
+    if output not in OUTPUT_MODES:
+        return {"success": False, "message": f"Unknown output mode: {output}"}
+    try:
+        guard = guard_from(job.get("page_limits"))
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    perf = PerfRecorder() if job.get("timings") else NULL_PERF
+    result = parse_cd_pdf(fp, use_cache=job.get("use_cache", True), perf=perf,
+                          output=output, control=control,
+                          deadline=deadline_from(job.get("deadline_ms")), guard=guard)
+    if perf.enabled:
+        result = attach_perf(result, perf, json.dumps)
+    return result
+
+
+def _render_record(record, output):
+    """Render a parse result, a stream record or a bare CD."""
+    def render(cd):
+        data = render_cd_html(cd)
+        return html_fields(data) if output == "html" else data
+
+    if isinstance(record, list):
+        return [render(cd) for cd in record]
+    if "parsedData" in record:
+        return dict(record, parsedData=[render(cd) for cd in record["parsedData"]])
+    if record.get("type") == "cd":
+        return dict(record, data=render(record["data"]))
+    if record.get("type") == "summary":
+        return record
+    return render(record)
+
+
+def run_render(argv):
+    """
+    Entry point for `cd_parser.py render FILE [--output html|both]`: adds the
+    HTML fields to --output structured results (JSON or --stream NDJSON;
+    FILE "-" reads stdin) and prints them in the same format.
+    """
+    ap = argparse.ArgumentParser(prog="render")
+    ap.add_argument("file", help='structured JSON / NDJSON, or "-" for stdin')
+    ap.add_argument("--output", choices=("html", "both"), default="both")
+    ap.add_argument("--pretty", action="store_true", help="indent JSON output")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.file == "-":
+            raw = sys.stdin.read()
+        else:
+            raw = Path(args.file).read_text(encoding="utf-8")
+    except OSError as e:
+        print(json.dumps({"success": False, "message": f"Cannot read {args.file}: {e}"}))
+        return 1
+
+    try:
+        records = [json.loads(raw)]
+        ndjson = False
+    except json.JSONDecodeError:
+        try:
+            records = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            print(json.dumps({"success": False, "message": f"Invalid JSON: {e}"}))
+            return 1
+        ndjson = True
+
+    for record in records:
+        rendered = _render_record(record, args.output)
+        if ndjson:
+            print(json.dumps(rendered, ensure_ascii=False))
+        else:
+            sys.stdout.buffer.write(encode_result(rendered, pretty=args.pretty) + b"\n")
+    return 0
+
+
 # ─────────────────────────────────────────────
 # ENTRY POINT
 # ─────────────────────────────────────────────
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        from parser_service import serve
+        sys.exit(serve(run_job, sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--job":
+        from job_control import run_job_mode
+        sys.exit(run_job_mode(run_job, sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch_runner import run_batch
+        sys.exit(run_batch(run_job, sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        sys.exit(run_render(sys.argv[2:]))
+
     if len(sys.argv) < 2:
         print(json.dumps(
             {"success": False, "message": "No file path provided"}))
         sys.exit(1)
 
-    fp = sys.argv[1]
+    ap = argparse.ArgumentParser(description="Parse a CD / CD bundle PDF")
+    ap.add_argument("file")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--jobs", type=int, default=1,
+                      help="extract page ranges across N worker processes")
+    mode.add_argument("--stream", action="store_true",
+                      help="emit one NDJSON record per CD as it completes")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="bypass the on-disk result cache")
+    ap.add_argument("--timings", action="store_true",
+                    help="add a per-stage / per-page `perf` report to the result")
+    ap.add_argument("--output", choices=OUTPUT_MODES, default="both",
+                    help="structured fields only, HTML fields only, or both")
+    ap.add_argument("--deadline-ms", type=int, default=None,
+                    help="stop reading pages in time to return a partial result "
+                         "within this many milliseconds")
+    ap.add_argument("--page-limits", default=None,
+                    help='opt-in per-page caps: "on" for the defaults, or e.g. '
+                         '"rects=2000,page_ms=5000" (chars, rects, lines, page_ms, rss_mb)')
+    add_wire_arguments(ap)
+    args = ap.parse_args()
+    perf = PerfRecorder() if args.timings else NULL_PERF
+    deadline = deadline_from(args.deadline_ms)
+    try:
+        guard = guard_from(args.page_limits)
+    except ValueError as e:
+        ap.error(str(e))
+
+    fp = args.file
     if not Path(fp).exists():
         print(json.dumps(
             {"success": False, "message": f"File not found: {fp}"}))
         sys.exit(1)
 
-    result = parse_cd_pdf(fp)
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.stream:
+        stream_cd_pdf(fp, use_cache=not args.no_cache, perf=perf,
+                      output=args.output, deadline=deadline, guard=guard)
+        sys.exit(0)
+
+    result = parse_cd_pdf(fp, jobs=max(1, args.jobs),
+                          use_cache=not args.no_cache, perf=perf,
+                          output=args.output, deadline=deadline, guard=guard)
+    if args.timings:
+        result = attach_perf(result, perf,
+                             lambda r: encode_result(r, args.encoding, args.pretty))
+    write_result(result, args)
@@ -0,0 +1,81 @@
+"""
+Normalised Cell Matrix
+One extracted CD table with every cell normalised once, for the classifier
+and every table consumer in cd_parser to read instead of re-running
+str() / strip() / clean_text() / lower() on the same cells.
+
+Per row it holds the raw cells plus three parallel tuples:
+
+  stripped  str(c).strip(), or None for an empty / missing cell (the
+            classifier's view: it keeps the PDF's inner line breaks)
+  text      clean_text(c): whitespace runs collapsed to one space
+  lower     text.lower(), built on first use: only the metadata, credits
+            and teaching consumers match keywords against it
+
+and whether each row is empty once cleaned. str.strip() and a regex sub
+with nothing to replace return their input unchanged, so a cell that is
+already clean costs no new string for `stripped` or `text`, and a row with
+no empty or unclean cell shares one tuple between the two.
+"""
+
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Whitespace that clean_text would change in a stripped string: a run of
+# two or more, or any single whitespace character other than a space.
+_WS_RUN_RE = re.compile(r'\s{2,}|[^\S ]')
+
+Row = Tuple[str, ...]
+
+
+class CellMatrix:
+    __slots__ = ("rows", "stripped", "text", "row_empty", "_lower")
+
+    def __init__(self, rows: List[Sequence[Any]], stripped: List[Tuple[Optional[str], ...]],
+                 text: List[Row], row_empty: List[bool]):
+        self.rows = rows
+        self.stripped = stripped
+        self.text = text
+        self.row_empty = row_empty
+        self._lower: Optional[List[Row]] = None
+
+    @property
+    def lower(self) -> List[Row]:
+        if self._lower is None:
+            self._lower = [tuple(t.lower() for t in row) for row in self.text]
+        return self._lower
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "CellMatrix":
+        """Normalises the cells of extracted (or JSON round-tripped) table rows."""
+        rows = list(rows)
+        stripped, text, row_empty = [], [], []
+        sub, search = _WS_RUN_RE.sub, _WS_RUN_RE.search
+        for row in rows:
+            s_row = tuple(str(c).strip() if c else None for c in row)
+            if None in s_row or any(map(search, s_row)):
+                t_row = tuple(sub(" ", s) if s else "" for s in s_row)
+            else:
+                t_row = s_row  # already clean: both views share the tuple
+            stripped.append(s_row)
+            text.append(t_row)
+            row_empty.append(not any(t_row))
+        return cls(rows, stripped, text, row_empty)
+
+    @classmethod
+    def of(cls, table) -> "CellMatrix":
+        """`table` itself when it is already a CellMatrix, else from_rows(table)."""
+        return table if isinstance(table, CellMatrix) else cls.from_rows(table)
+
+    @classmethod
+    def concat(cls, matrices: Sequence["CellMatrix"]) -> "CellMatrix":
+        """The rows of several tables, e.g. one section continued across pages."""
+        if len(matrices) == 1:
+            return matrices[0]
+        return cls([r for m in matrices for r in m.rows],
+                   [r for m in matrices for r in m.stripped],
+                   [r for m in matrices for r in m.text],
+                   [e for m in matrices for e in m.row_empty])
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,179 @@
+"""
+Fast Text Extraction
+Line-ordered page text straight from pdfminer's interpreter, for parser
+paths that only ever read text (the 2026 PD parser never extracts tables).
+
+pdfplumber's extract_text() first lays the page out into LTChar / LTCurve /
+LTImage objects, converts every one of them into an attribute dict (colours,
+matrices, font names, path points) and only then groups the char dicts into
+words and lines. TextDevice records one (text, x0, top, x1, bottom, upright)
+tuple per glyph and drops paths and images as they are painted; chars_to_text
+applies pdfplumber's default word and line grouping to those tuples, so
+page_text() returns the same string as page.extract_text().
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, List, Sequence, Tuple
+
+from pdfminer.converter import PDFLayoutAnalyzer
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.utils import apply_matrix_pt
+from pdfplumber.utils.text import DEFAULT_X_TOLERANCE, DEFAULT_Y_TOLERANCE, LIGATURES
+
+TEXT_BACKENDS = ("layout", "fast")
+
+# (text, x0, top, x1, bottom, upright), in pdfplumber's coordinate space.
+Char = Tuple[str, float, float, float, float, bool]
+TEXT, X0, TOP, X1, BOTTOM, UPRIGHT = range(6)
+
+
+class TextDevice(PDFLayoutAnalyzer):
+    """
+    pdfminer device that keeps only glyph boxes. The box arithmetic is
+    LTChar's, and `top` / `bottom` are flipped against the pdfplumber page
+    height exactly as Page.process_object does.
+    """
+
+    def __init__(self, rsrcmgr, height: float):
+        PDFLayoutAnalyzer.__init__(self, rsrcmgr)
+        self.height = height
+        self.chars: List[Char] = []
+
+    def begin_page(self, page, ctm) -> None:
+        pass
+
+    def end_page(self, page) -> None:
+        pass
+
+    def begin_figure(self, name, bbox, matrix) -> None:
+        pass
+
+    def end_figure(self, name) -> None:
+        pass
+
+    def paint_path(self, gstate, stroke, fill, evenodd, path) -> None:
+        pass
+
+    def render_image(self, name, stream) -> None:
+        pass
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs,
+                    graphicstate) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = "(cid:%d)" % cid
+        adv = font.char_width(cid) * fontsize * scaling
+        if font.is_vertical():
+            vx, vy = font.char_disp(cid)
+            vx = fontsize * 0.5 if vx is None else vx * fontsize * 0.001
+            vy = (1000 - vy) * fontsize * 0.001
+            lower_left = (-vx, vy + rise + adv)
+            upper_right = (-vx + fontsize, vy + rise)
+        else:
+            descent = font.get_descent() * fontsize
+            lower_left = (0, descent + rise)
+            upper_right = (adv, descent + rise + fontsize)
+        a, b, c, d, _, _ = matrix
+        upright = 0 < a * d * scaling and b * c <= 0
+        x0, y0 = apply_matrix_pt(matrix, lower_left)
+        x1, y1 = apply_matrix_pt(matrix, upper_right)
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+        self.chars.append((text, x0, self.height - y1, x1, self.height - y0, upright))
+        return adv
+
+
+def _cluster(items: Sequence, key: Callable, tolerance: float,
+             preserve_order: bool = False) -> List[list]:
+    """pdfplumber's cluster_objects: values chained within `tolerance` share a group."""
+    ids, group, last = {}, -1, None
+    for value in sorted(set(map(key, items))):
+        if last is None or value > last + tolerance:
+            group += 1
+        ids[value] = group
+        last = value
+    tagged = [(ids[key(x)], x) for x in items]
+    if not preserve_order:
+        tagged.sort(key=itemgetter(0))
+    return [[x for _, x in run] for _, run in groupby(tagged, key=itemgetter(0))]
+
+
+def _begins_word(prev: Char, curr: Char, upright: bool) -> bool:
+    # WordExtractor.char_begins_new_word for "ltr" (upright) / "ttb" (rotated).
+    if upright:
+        return (curr[X0] < prev[X0] or curr[X0] > prev[X1] + DEFAULT_X_TOLERANCE or
+                curr[TOP] > prev[TOP] + DEFAULT_Y_TOLERANCE)
+    return (curr[TOP] < prev[TOP] or curr[TOP] > prev[BOTTOM] + DEFAULT_Y_TOLERANCE or
+            curr[X0] > prev[X0] + DEFAULT_X_TOLERANCE)
+
+
+def _line_words(line: Sequence[Char], upright: bool) -> List[List[Char]]:
+    words, current = [], []
+    for ch in line:
+        text = ch[TEXT]
+        if text.isspace():
+            if current:
+                words.append(current)
+            current = []
+        elif text == "":
+            # pdfplumber's default split_at_punctuation is "", which every
+            # empty string is "in": such a glyph becomes a word of its own.
+            if current:
+                words.append(current)
+            words.append([ch])
+            current = []
+        elif current and _begins_word(current[-1], ch, upright):
+            words.append(current)
+            current = [ch]
+        else:
+            current.append(ch)
+    if current:
+        words.append(current)
+    return words
+
+
+def _words(chars: Sequence[Char]) -> List[Tuple[float, str]]:
+    """(top, text) per word, in WordExtractor.iter_extract_tuples order."""
+    words = []
+    for upright, run in groupby(chars, key=itemgetter(UPRIGHT)):
+        run = list(run)
+        if upright:
+            lines = _cluster(run, itemgetter(TOP), DEFAULT_Y_TOLERANCE)
+            sort_key = itemgetter(X0)
+        else:
+            lines = _cluster(run, itemgetter(X0), DEFAULT_X_TOLERANCE)
+            sort_key = itemgetter(TOP, BOTTOM)
+        for line in lines:
+            for word in _line_words(sorted(line, key=sort_key), upright):
+                text = "".join(LIGATURES.get(c[TEXT], c[TEXT]) for c in word)
+                words.append((min(c[TOP] for c in word), text))
+    return words
+
+
+def chars_to_text(chars: Sequence[Char]) -> str:
+    """The string pdfplumber's default (non-layout) extract_text() builds from these chars."""
+    lines = []
+    for line in _cluster(_words(chars), itemgetter(0), DEFAULT_Y_TOLERANCE,
+                         preserve_order=True):
+        parts, length = [], 0
+        for _, text in line:
+            if length:
+                parts.append(" ")
+                length += 1
+            parts.append(text)
+            length += len(text)
+        lines.append("".join(parts))
+    return "\n".join(lines)
+
+
+def page_text(page) -> str:
+    """page.extract_text() for a pdfplumber Page, without building its layout objects."""
+    rsrcmgr = page.pdf.rsrcmgr
+    device = TextDevice(rsrcmgr, page.height)
+    PDFPageInterpreter(rsrcmgr, device).process_page(page.page_obj)
+    return chars_to_text(device.chars)
@@ -0,0 +1,37 @@
+"""
+HTML Rendering Helpers
+Precompiled cell templates for the CD parser's HTML table builders.
+
+A CellTemplate holds the fully expanded opening and closing tags of one
+cell style (inline CSS included), built once at import. Builders append
+rendered rows to a list and join it once, so output grows in linear time
+instead of re-copying the whole document on every `html += ...`.
+"""
+
+from typing import Any, Iterable
+
+
+class CellTemplate:
+    """`<open>value<close>` for one cell style, e.g. CellTemplate('<td style="…">', '</td>')."""
+
+    __slots__ = ("open", "close", "_sep")
+
+    def __init__(self, open_tag: str, close_tag: str):
+        self.open = open_tag
+        self.close = close_tag
+        self._sep = close_tag + open_tag
+
+    def __call__(self, value: Any) -> str:
+        return f"{self.open}{value}{self.close}"
+
+    def many(self, values: Iterable[Any]) -> str:
+        """Consecutive cells, one per value, rendered with a single join."""
+        values = [f"{v}" for v in values]
+        if not values:
+            return ""
+        return self.open + self._sep.join(values) + self.close
+
+
+def tr(*cells: str) -> str:
+    """One table row from already rendered cells."""
+    return "<tr>" + "".join(cells) + "</tr>"
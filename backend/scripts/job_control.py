@@ -0,0 +1,274 @@
+"""
+Parse Job Control
+Progress events, cooperative cancellation and a wall-clock deadline for one
+parse, plus the `<parser>.py --job` mode that drives a single job over
+stdin / stdout.
+
+A JobControl is threaded through the parsers next to `perf`. They report
+the current stage, progress within it (pages read, CDs parsed) and each CD
+boundary found. Every progress call is also a cancellation point: once a
+cancel has been requested the next one raises JobCancelled, so work stops
+at a page boundary. JobCancelled derives from BaseException, like
+KeyboardInterrupt, so it unwinds through the parsers' `except Exception`
+handlers, and their `with pdfplumber.open(...)` blocks still close the
+document. NULL_CONTROL has the same interface and does nothing.
+
+A Deadline (--deadline-ms, job key "deadline_ms") is asked before every
+page whether another page still fits. Once it does not, the parsers stop
+reading, finish what they have within the reserved share of the budget and
+mark the result `partial` with the skipped pages / CDs and a warning,
+instead of being killed with nothing to show. NULL_DEADLINE never expires.
+
+Job mode protocol (newline-delimited JSON):
+
+  stdin   first line: the job object, as for --serve
+            {"id": "abc", "file": "/tmp/upload.pdf", "schema": "auto"}
+          later lines: {"type": "cancel"}   (SIGTERM does the same)
+  stdout  one event per line, each carrying the job "id":
+            {"event": "started"}
+            {"event": "stage", "stage": "extract_pages"}
+            {"event": "progress", "stage": "extract_pages", "done": 12, "total": 300}
+            {"event": "boundary", "page": 40, "courseCode": "UE24CS301"}
+          then exactly one of
+            {"event": "result", "result": { ...same JSON the CLI prints... }}
+            {"event": "cancelled", "stage": "extract_pages", "done": 12, "total": 300}
+            {"event": "error", "error": "..."}
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+JobFn = Callable[..., Dict[str, Any]]
+
+
+class JobCancelled(BaseException):
+    """Raised at the first cancellation point after a cancel was requested."""
+
+
+class JobControl:
+    enabled = True
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None]):
+        self._emit = emit
+        self._cancel = threading.Event()
+        self.stage_name: Optional[str] = None
+        self.done = 0
+        self.total = 0
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def stage(self, name: str) -> None:
+        self.check()
+        self.stage_name, self.done, self.total = name, 0, 0
+        self._emit({"event": "stage", "stage": name})
+
+    def progress(self, done: int, total: int) -> None:
+        """`done` of `total` units of the current stage finished; a cancellation point."""
+        self.done, self.total = done, total
+        self._emit({"event": "progress", "stage": self.stage_name,
+                    "done": done, "total": total})
+        self.check()
+
+    def boundary(self, page: int, course_code: str) -> None:
+        self._emit({"event": "boundary", "page": page, "courseCode": course_code})
+
+
+class _NullControl:
+    enabled = False
+    cancelled = False
+
+    def cancel(self) -> None:
+        pass
+
+    def check(self) -> None:
+        pass
+
+    def stage(self, name: str) -> None:
+        pass
+
+    def progress(self, done: int, total: int) -> None:
+        pass
+
+    def boundary(self, page: int, course_code: str) -> None:
+        pass
+
+
+NULL_CONTROL = _NullControl()
+
+
+class Deadline:
+    """
+    Wall-clock budget for one parse. `allows_page()` refuses once the time
+    spent plus the slowest page so far would run into the last `reserve`
+    share of the budget, which is kept for parsing the pages already read.
+    Wall-clock (time.time) so page-range workers can share the same end.
+    """
+
+    enabled = True
+
+    def __init__(self, budget_ms: float, reserve: float = 0.15):
+        now = time.time()
+        budget = budget_ms / 1000
+        self.ends_at = now + budget
+        self.soft_end = now + budget * (1 - reserve)
+        self._last: Optional[float] = None
+        self._slowest = 0.0
+        self.skipped_pages: List[int] = []
+        self.skipped_cds: List[str] = []
+        self.warnings: List[str] = []
+
+    @classmethod
+    def until(cls, soft_end: float) -> "Deadline":
+        """A worker's copy: stop reading at `soft_end`, no reserve of its own."""
+        deadline = cls(0)
+        deadline.ends_at = deadline.soft_end = soft_end
+        return deadline
+
+    def allows_page(self) -> bool:
+        """Call before each page; False once the next page would overrun."""
+        now = time.time()
+        if self._last is not None:
+            self._slowest = max(self._slowest, now - self._last)
+        self._last = now
+        return now + self._slowest <= self.soft_end
+
+    def expired(self) -> bool:
+        return time.time() >= self.ends_at
+
+    def skip_pages(self, start: int, total: int) -> None:
+        """Pages [start, total) (0-based) were not read."""
+        if start >= total:
+            return
+        self.skipped_pages.extend(range(start + 1, total + 1))
+        self.warnings.append(
+            f"Deadline reached after {start} of {total} pages; "
+            f"pages {start + 1}-{total} were not read.")
+
+    def skip_cd(self, course_code: str, reason: str) -> None:
+        self.skipped_cds.append(course_code)
+        self.warnings.append(f"{course_code}: {reason}")
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.skipped_pages or self.skipped_cds)
+
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds partial / skippedPages / skippedCDs / warnings when anything was skipped."""
+        if self.partial:
+            result["partial"] = True
+            result["skippedPages"] = self.skipped_pages
+            if self.skipped_cds:
+                result["skippedCDs"] = self.skipped_cds
+            result.setdefault("warnings", []).extend(self.warnings)
+        return result
+
+
+class _NoDeadline:
+    enabled = False
+    partial = False
+    soft_end = None
+
+    def allows_page(self) -> bool:
+        return True
+
+    def expired(self) -> bool:
+        return False
+
+    def skip_pages(self, start: int, total: int) -> None:
+        pass
+
+    def skip_cd(self, course_code: str, reason: str) -> None:
+        pass
+
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return result
+
+
+NULL_DEADLINE = _NoDeadline()
+
+
+def deadline_from(ms: Optional[float]):
+    """Deadline for a --deadline-ms / "deadline_ms" value; NULL_DEADLINE when unset."""
+    return Deadline(ms) if ms else NULL_DEADLINE
+
+
+class _EventWriter:
+    """Serialises event lines from the job and the stdin reader thread."""
+
+    def __init__(self, stream, job_id):
+        self.stream = stream
+        self.job_id = job_id
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        payload = json.dumps({"id": self.job_id, **event}, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                self.stream.write(payload)
+                self.stream.flush()
+            except (BrokenPipeError, OSError):
+                pass
+
+
+def _read_controls(stream, control: JobControl) -> None:
+    # EOF is not a cancel: `echo '{...}' | parser.py --job` closes stdin at once.
+    for line in stream:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("type") == "cancel":
+            control.cancel()
+
+
+def run_job_mode(job_fn: JobFn, argv) -> int:
+    """
+    Entry point for `<parser>.py --job`. `job_fn(job, control)` is the
+    parser's run_job. Exit status is 0 for a result or a clean cancel,
+    1 when the job line is invalid or the job raised.
+    """
+    argparse.ArgumentParser(prog="--job").parse_args(argv)
+    line = sys.stdin.readline()
+    try:
+        job = json.loads(line)
+        if not isinstance(job, dict) or not (job.get("file") or job.get("path")):
+            raise ValueError("job must be an object with a 'file' path")
+    except ValueError as e:
+        _EventWriter(sys.stdout, None)({"event": "error", "error": f"Invalid job: {e}"})
+        return 1
+    job.setdefault("file", job.get("path"))
+
+    emit = _EventWriter(sys.stdout, job.get("id"))
+    control = JobControl(emit)
+    signal.signal(signal.SIGTERM, lambda *_: control.cancel())
+    threading.Thread(target=_read_controls, args=(sys.stdin, control),
+                     daemon=True).start()
+
+    emit({"event": "started"})
+    try:
+        result = job_fn(job, control)
+    except JobCancelled:
+        emit({"event": "cancelled", "stage": control.stage_name,
+              "done": control.done, "total": control.total})
+        return 0
+    except Exception as e:
+        print(traceback.format_exc(), file=sys.stderr)
+        emit({"event": "error", "error": str(e)})
+        return 1
+    emit({"event": "result", "result": result})
+    return 0
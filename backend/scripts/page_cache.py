@@ -0,0 +1,436 @@
+"""
+Per-Document Page Artifact Cache
+Lazily computes text, words and tables once per page so every parser stage
+reads the same layout results instead of re-running pdfplumber on each pass.
+
+Optionally backed by a persistent page store keyed by a hash of each page's
+content stream: when an edited PDF is re-uploaded, only the pages whose
+content actually changed go through layout analysis again.
+"""
+
+import hashlib
+import json
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from fast_text import TEXT_BACKENDS, page_text
+from page_guard import NULL_GUARD, SKIPPED, TEXT_ONLY, PageBudgetExceeded
+from perf_report import NULL_PERF
+from result_cache import ResultCache
+
+
+def _settings_key(settings: Optional[Dict[str, Any]]) -> str:
+    if not settings:
+        return ""
+    return json.dumps(settings, sort_keys=True)
+
+
+def strategy_label(settings: Optional[Dict[str, Any]]) -> str:
+    """Short name for a table-settings dict: "default", "lines_strict", "text/lines"…"""
+    if not settings:
+        return "default"
+    v = settings.get("vertical_strategy", "lines")
+    h = settings.get("horizontal_strategy", "lines")
+    return v if v == h else f"{v}/{h}"
+
+
+def _table_text(table, chars: List[Dict[str, Any]], text_settings: Dict[str, Any]):
+    """
+    Same cells as pdfplumber's Table.extract(), but each row only scans the
+    chars whose vertical midpoint falls in that row (found by bisection)
+    instead of every char on the page. Chars keep their page order, and the
+    same half-open midpoint test is used, so the text is identical.
+    """
+    from pdfplumber import utils
+
+    x0, top, x1, bottom = table.bbox
+    inside = []
+    for i, c in enumerate(chars):
+        v_mid = (c["top"] + c["bottom"]) / 2
+        h_mid = (c["x0"] + c["x1"]) / 2
+        if x0 <= h_mid < x1 and top <= v_mid < bottom:
+            inside.append((v_mid, h_mid, i, c))
+    inside.sort(key=lambda t: (t[0], t[2]))
+    v_mids = [t[0] for t in inside]
+
+    def in_bbox(entry, bbox):
+        return bbox[0] <= entry[1] < bbox[2] and bbox[1] <= entry[0] < bbox[3]
+
+    out = []
+    for row in table.rows:
+        rb = row.bbox
+        lo, hi = bisect_left(v_mids, rb[1]), bisect_left(v_mids, rb[3])
+        row_chars = sorted((e for e in inside[lo:hi] if rb[0] <= e[1] < rb[2]),
+                           key=lambda e: e[2])
+        arr = []
+        for cell in row.cells:
+            if cell is None:
+                arr.append(None)
+                continue
+            cell_chars = [e[3] for e in row_chars if in_bbox(e, cell)]
+            if not cell_chars:
+                arr.append("")
+                continue
+            kwargs = dict(text_settings)
+            if "layout" in kwargs:
+                kwargs["layout_width"] = cell[2] - cell[0]
+                kwargs["layout_height"] = cell[3] - cell[1]
+                kwargs["layout_bbox"] = cell
+            arr.append(utils.extract_text(cell_chars, **kwargs))
+        out.append(arr)
+    return out
+
+
+def find_table_cells(page, settings: Optional[Dict[str, Any]] = None) -> List[List[tuple]]:
+    """Cell bboxes of every table page.find_tables(settings) detects."""
+    from pdfplumber.table import TableSettings
+
+    return [list(t.cells) for t in page.find_tables(TableSettings.resolve(settings))]
+
+
+def tables_from_cells(page, cell_groups: List[List[tuple]],
+                      settings: Optional[Dict[str, Any]] = None) -> List[List[List[Any]]]:
+    """
+    Text of tables whose geometry is already known (one list of cell bboxes
+    per table), extracted the way page.extract_tables(settings) would.
+    """
+    from pdfplumber.table import Table, TableSettings
+
+    if not cell_groups:
+        return []
+    text_settings = TableSettings.resolve(settings).text_settings or {}
+    chars = page.chars
+    return [_table_text(Table(page, cells), chars, text_settings) for cells in cell_groups]
+
+
+def extract_tables_clipped(page, settings: Optional[Dict[str, Any]] = None) -> List[List[List[Any]]]:
+    """
+    page.extract_tables(settings) with cell text read only from each table's
+    own region: find_tables gives the bounding boxes, and only the chars
+    inside them are scanned, row by row.
+    """
+    return tables_from_cells(page, find_table_cells(page, settings), settings)
+
+
+_EDGE_STRATEGIES = {"lines": None, "lines_strict": "line"}
+
+
+class TableStrategyPlanner:
+    """
+    Per-document memory of table geometry, keyed by layout fingerprint.
+    For the "lines" / "lines_strict" strategies, table detection depends only
+    on the page bbox and the ruling edges the strategy reads (the page's
+    fingerprint), so without changing any result
+      - a pass is skipped when the page has no vertical or no horizontal
+        ruling for that strategy (no intersections, no cells, no tables),
+        or when a page with the same fingerprint already came back empty
+        under the same settings (same template, same losing strategy);
+      - a page whose fingerprint was already seen reuses the learned table
+        cells, so only the text inside them is extracted and line
+        detection is not run again.
+    `avoided` counts the skipped passes by reason, `reused` the passes that
+    used learned geometry.
+    """
+
+    def __init__(self):
+        self._templates: Dict[tuple, List[List[tuple]]] = {}
+        self.avoided = {"no_ruling": 0, "template": 0}
+        self.reused = 0
+
+    @staticmethod
+    def _ruling_signature(page, settings: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        settings = settings or {}
+        if settings.get("explicit_vertical_lines") or settings.get("explicit_horizontal_lines"):
+            return None
+        v_type = settings.get("vertical_strategy", "lines")
+        h_type = settings.get("horizontal_strategy", "lines")
+        if v_type not in _EDGE_STRATEGIES or h_type not in _EDGE_STRATEGIES:
+            return None
+
+        def base(orientation, edge_type):
+            dim = "height" if orientation == "v" else "width"
+            return tuple(
+                (e["object_type"], e["x0"], e["top"], e["x1"], e["bottom"])
+                for e in page.edges
+                if e["orientation"] == orientation and e[dim] >= 1
+                and (edge_type is None or e["object_type"] == edge_type))
+
+        return (tuple(page.bbox),
+                base("v", _EDGE_STRATEGIES[v_type]),
+                base("h", _EDGE_STRATEGIES[h_type]))
+
+    def plan(self, page, settings: Optional[Dict[str, Any]]):
+        """
+        (skip_reason, cells) for one pass: ("no_ruling" / "template", None)
+        when it can be skipped, (None, learned cells) when the fingerprint is
+        known, (None, None) when tables must be detected.
+        """
+        sig = self._ruling_signature(page, settings)
+        if sig is None:
+            return None, None
+        if not sig[1] or not sig[2]:
+            self.avoided["no_ruling"] += 1
+            return "no_ruling", None
+        cells = self._templates.get((_settings_key(settings), sig))
+        if cells is None:
+            return None, None
+        if not cells:
+            self.avoided["template"] += 1
+            return "template", None
+        self.reused += 1
+        return None, cells
+
+    def record(self, page, settings: Optional[Dict[str, Any]], cells: List[List[tuple]]) -> None:
+        """Learns the table cells detected on a page with a new fingerprint."""
+        sig = self._ruling_signature(page, settings)
+        if sig is not None:
+            self._templates[(_settings_key(settings), sig)] = cells
+
+
+def _stream_bytes(obj) -> bytes:
+    from pdfminer.pdftypes import resolve1
+    obj = resolve1(obj)
+    try:
+        return obj.get_data()
+    except Exception:
+        return repr(obj).encode("utf-8")
+
+
+def page_content_hash(page) -> str:
+    """
+    Identity of everything layout depends on, read straight from the page
+    dictionary: geometry, content streams, form XObjects, and each font's
+    name, encoding and ToUnicode map. No character layout is performed.
+    """
+    import pdfplumber
+    from pdfminer.pdftypes import resolve1
+
+    h = hashlib.sha256()
+    h.update(str(getattr(pdfplumber, "__version__", "")).encode("utf-8"))
+    h.update(repr((page.mediabox, page.cropbox)).encode("utf-8"))
+
+    page_obj = page.page_obj
+    for stream in page_obj.contents or []:
+        h.update(_stream_bytes(stream))
+
+    resources = resolve1(page_obj.resources) or {}
+    fonts = resolve1(resources.get("Font")) or {}
+    for name in sorted(fonts):
+        font = resolve1(fonts[name]) or {}
+        h.update(name.encode("utf-8"))
+        h.update(repr((font.get("BaseFont"), font.get("Subtype"),
+                       font.get("Encoding"))).encode("utf-8"))
+        if font.get("ToUnicode") is not None:
+            h.update(_stream_bytes(font["ToUnicode"]))
+
+    xobjects = resolve1(resources.get("XObject")) or {}
+    for name in sorted(xobjects):
+        xobj = resolve1(xobjects[name])
+        attrs = getattr(xobj, "attrs", {})
+        if str(attrs.get("Subtype", "")).endswith("Form"):
+            h.update(name.encode("utf-8"))
+            h.update(_stream_bytes(xobj))
+    return h.hexdigest()
+
+
+class PageArtifactCache:
+    """
+    Wraps an open pdfplumber document. Artifacts are computed on first access
+    and memoised per page; `layout_calls` records how many times each page was
+    actually laid out (page_index → {"text": n, "words": n, "tables": n}) and
+    `store_hits` how many pages were served from the persistent page store.
+    A PerfRecorder passed as `perf` times every layout call per page and
+    counts the tables each strategy found. `release` drops pdfplumber's own
+    per-page layout objects once a consumer has the artifacts it needs. With `plan_tables`, a
+    TableStrategyPlanner skips table passes that cannot find anything and
+    reuses table geometry across pages with the same layout fingerprint.
+    `text_backend` "fast" serves text() from fast_text instead of pdfplumber's
+    layout; it may be switched once the caller knows no tables will be read.
+    A page_guard.PageGuard passed as `guard` caps each page's objects, time
+    and memory: pages over an object or memory cap are read by fast_text,
+    throttled pages get no tables (and, if skipped, no text), and nothing is
+    memoised for what was not extracted. Text read by fast_text is never
+    written to the page store.
+    """
+
+    def __init__(self, pdf, store: Optional[ResultCache] = None, perf=NULL_PERF,
+                 plan_tables: bool = False, text_backend: str = "layout",
+                 guard=NULL_GUARD):
+        if text_backend not in TEXT_BACKENDS:
+            raise ValueError(f"Unknown text backend: {text_backend}")
+        self.pdf = pdf
+        self.pages = pdf.pages
+        self.store = store
+        self.perf = perf
+        self.planner = TableStrategyPlanner() if plan_tables else None
+        self.text_backend = text_backend
+        self.guard = guard
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._dirty: Dict[int, str] = {}
+        self.layout_calls: Dict[int, Dict[str, int]] = {}
+        self.store_hits = 0
+
+    @staticmethod
+    def default_store() -> Optional[ResultCache]:
+        return ResultCache.from_env("PDMS_PAGE_CACHE", "pdms-page-cache")
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def _count(self, idx: int, kind: str) -> None:
+        calls = self.layout_calls.setdefault(
+            idx, {"text": 0, "words": 0, "tables": 0})
+        calls[kind] += 1
+
+    def _store_key(self, idx: int) -> Optional[str]:
+        try:
+            return page_content_hash(self.pages[idx])
+        except Exception:
+            return None
+
+    def _record(self, idx: int) -> Dict[str, Any]:
+        rec = self._records.get(idx)
+        if rec is not None:
+            return rec
+        rec = {"tables": {}}
+        if self.store is not None:
+            key = self._store_key(idx)
+            stored = self.store.get(key)
+            if stored is not None:
+                rec = stored
+                rec.setdefault("tables", {})
+                self.store_hits += 1
+                self.perf.count("page_store_hits")
+            rec["_key"] = key
+        self._records[idx] = rec
+        return rec
+
+    def _mark_dirty(self, idx: int, rec: Dict[str, Any]) -> None:
+        if self.store is not None and rec.get("_key"):
+            self._dirty[idx] = rec["_key"]
+
+    def text(self, idx: int) -> str:
+        rec = self._record(idx)
+        if "text" not in rec:
+            if self.guard.action(idx) == SKIPPED:
+                return ""
+            reason = self.guard.over_memory() or self.guard.over_objects(idx, self.pages[idx])
+            if reason:
+                self._throttle(idx, TEXT_ONLY, reason)
+            self._count(idx, "text")
+            try:
+                with self.perf.stage("extract_text"), self.perf.page(idx), \
+                        self.guard.budget(idx):
+                    if self.text_backend == "fast" or reason:
+                        self.perf.count("fast_text_pages")
+                        rec["text"] = page_text(self.pages[idx])
+                        rec["_fast_text"] = True
+                    else:
+                        rec["text"] = self.pages[idx].extract_text() or ""
+            except PageBudgetExceeded:
+                self._throttle(idx, SKIPPED, self.guard.time_reason())
+                return ""
+            if not rec.get("_fast_text"):
+                self._mark_dirty(idx, rec)
+        return rec["text"]
+
+    def words(self, idx: int) -> List[Dict[str, Any]]:
+        rec = self._record(idx)
+        if "words" not in rec:
+            self._count(idx, "words")
+            with self.perf.stage("extract_words"), self.perf.page(idx):
+                rec["words"] = self.pages[idx].extract_words() or []
+            self._mark_dirty(idx, rec)
+        return rec["words"]
+
+    def tables(self, idx: int, settings: Optional[Dict[str, Any]] = None) -> List[List[List[Any]]]:
+        rec = self._record(idx)
+        key = _settings_key(settings)
+        if key not in rec["tables"]:
+            if self.guard.action(idx):
+                return []
+            page = self.pages[idx]
+            reason = (self.guard.out_of_time(idx) or self.guard.over_memory()
+                      or self.guard.over_objects(idx, page))
+            if reason:
+                self._throttle(idx, TEXT_ONLY, reason)
+                return []
+            label = strategy_label(settings)
+            skipped, cells = self.planner.plan(page, settings) if self.planner else (None, None)
+            if skipped:
+                self.perf.count(f"table_passes_avoided.{skipped}")
+                rec["tables"][key] = []
+            else:
+                self._count(idx, "tables")
+                try:
+                    with self.perf.stage(f"extract_tables.{label}"), self.perf.page(idx), \
+                            self.guard.budget(idx):
+                        if cells is None:
+                            cells = find_table_cells(page, settings)
+                            if self.planner:
+                                self.planner.record(page, settings, cells)
+                        else:
+                            self.perf.count("table_templates_reused")
+                        rec["tables"][key] = tables_from_cells(page, cells, settings)
+                except PageBudgetExceeded:
+                    self._throttle(idx, TEXT_ONLY, self.guard.time_reason())
+                    return []
+                self.perf.count(f"tables.{label}", len(rec["tables"][key]))
+            self._mark_dirty(idx, rec)
+        return rec["tables"][key]
+
+    def _throttle(self, idx: int, action: str, reason: str) -> None:
+        self.guard.throttle(idx, action, reason)
+        self.perf.count(f"pages_throttled.{action}")
+
+    def _persist(self, idx: int) -> None:
+        key = self._dirty.pop(idx, None)
+        if key is None:
+            return
+        # The store is keyed by page content alone and serves every backend,
+        # so it only ever holds layout text: fast_text output (the fast
+        # backend, or a throttled page) stays in memory.
+        memo = self._records[idx]
+        rec = {k: v for k, v in memo.items() if not k.startswith("_")}
+        if memo.get("_fast_text"):
+            del rec["text"]
+        self.store.put(key, rec, evict=False)
+
+    def release(self, idx: int) -> None:
+        """
+        Frees pdfplumber's cached layout for one page (chars, lines, rects,
+        the LTPage and the text map) while keeping the memoised artifacts.
+        pdfplumber holds these for the life of the document otherwise, so
+        memory would grow with page count. A later layout call on the page
+        re-parses it.
+        """
+        page = self.pages[idx]
+        page.close()
+        textmap = getattr(page, "get_textmap", None)
+        if hasattr(textmap, "cache_clear"):
+            textmap.cache_clear()
+
+    def truncate(self, n: int) -> None:
+        """Limits the document to its first `n` pages, e.g. once a deadline stops reading."""
+        self.pages = self.pages[:n]
+
+    def evict(self, idx: int) -> None:
+        """Drops every memoised artifact for one page once its consumer is done."""
+        self._persist(idx)
+        self._records.pop(idx, None)
+        self.release(idx)
+
+    def flush(self) -> None:
+        """Writes newly computed page artifacts to the page store, then trims it."""
+        if self.store is None:
+            return
+        for idx in list(self._dirty):
+            self._persist(idx)
+        self.store.evict()
+
+    def texts(self, limit: Optional[int] = None) -> List[str]:
+        n = len(self.pages) if limit is None else min(limit, len(self.pages))
+        return [self.text(i) for i in range(n)]
+
+    def full_text(self) -> str:
+        return "\n".join(self.texts())
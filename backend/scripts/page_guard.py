@@ -0,0 +1,250 @@
+"""
+Per-Page Resource Governor
+Caps on what a single page may cost, so one pathological page (vector
+hatching, a malformed table drawn from thousands of tiny rects) cannot
+stall the host with pdfplumber's table finder.
+
+The governor is opt-in: --page-limits on (job key "page_limits") enables
+DEFAULT_LIMITS, "rects=2000,page_ms=5000" overrides single limits. Without
+it the parsers run with NULL_GUARD, which has the same interface and never
+throttles. PageArtifactCache asks its PageGuard before each layout call:
+
+  - object caps: more chars, rects or lines (lines + curves) on the page
+    than allowed → the page's text is read by fast_text (no layout objects
+    are built) and its tables are not extracted. The objects are counted
+    from pdfplumber's layout when the page already has one, else from the
+    page's content stream (preflight.count_objects), so the check never
+    forces a layout;
+  - RSS ceiling (off unless `rss_mb` is given): the process is already over
+    `rss_mb` → the same text-only read. In a long-lived --serve worker this
+    stays true for every later page, so set it only where losing tables is
+    better than losing the worker;
+  - time budget: layout work on one page (text + tables) may take
+    `page_ms`. Running over it during the table passes downgrades the page
+    to text only; running over it while reading the text skips the page.
+
+In the main thread the budget is enforced with SIGALRM, which interrupts
+the layout call itself; elsewhere it is checked between calls. Throttled
+pages are listed in the result's `throttledPages` with a warning each.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, Optional, Union
+
+from preflight import count_objects
+
+DEFAULT_LIMITS: Dict[str, float] = {
+    "chars": 40000,
+    "rects": 5000,
+    "lines": 5000,
+    "page_ms": 20000,
+    "rss_mb": 0,
+}
+
+# Layout object types counted against each object cap.
+_OBJECT_KINDS = {"chars": ("char",), "rects": ("rect",), "lines": ("line", "curve")}
+
+# Throttle actions, mildest first.
+TEXT_ONLY, SKIPPED = "text_only", "skipped"
+
+
+class PageBudgetExceeded(BaseException):
+    """BaseException so pdfminer's / the parsers' `except Exception` blocks cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise PageBudgetExceeded()
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+
+class PageGuard:
+    enabled = True
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.throttled: Dict[int, Dict[str, str]] = {}  # page index → {"action", "reason"}
+        self._spent: Dict[int, float] = {}
+        self._over_objects: Dict[int, Optional[str]] = {}
+
+    def action(self, idx: int) -> Optional[str]:
+        """TEXT_ONLY / SKIPPED once page `idx` has been throttled, else None."""
+        info = self.throttled.get(idx)
+        return info["action"] if info else None
+
+    def throttle(self, idx: int, action: str, reason: str) -> None:
+        if self.action(idx) != SKIPPED:
+            self.throttled[idx] = {"action": action, "reason": reason}
+
+    def over_memory(self) -> Optional[str]:
+        cap = self.limits.get("rss_mb")
+        rss = rss_mb() if cap else None
+        if rss is not None and rss > cap:
+            return f"process RSS {rss:.0f} MB over the {cap:g} MB ceiling"
+        return None
+
+    def over_objects(self, idx: int, page) -> Optional[str]:
+        """Reason when pdfplumber page `idx` exceeds an object cap; never lays the page out."""
+        if idx not in self._over_objects:
+            self._over_objects[idx] = self._object_reason(page)
+        return self._over_objects[idx]
+
+    def _object_reason(self, page) -> Optional[str]:
+        caps = {name: self.limits.get(name) for name in _OBJECT_KINDS}
+        if not any(caps.values()):
+            return None
+        objects = getattr(page, "_objects", None)  # set once pdfplumber has laid it out
+        if objects is not None:
+            counts = {name: sum(len(objects.get(kind, ())) for kind in kinds)
+                      for name, kinds in _OBJECT_KINDS.items()}
+        else:
+            counts = count_objects(page.page_obj)
+        for name, cap in caps.items():
+            if cap and counts[name] > cap:
+                return f"{counts[name]} {name} over the cap of {cap:g}"
+        return None
+
+    def out_of_time(self, idx: int) -> Optional[str]:
+        budget = self.limits.get("page_ms")
+        if budget and self._spent.get(idx, 0.0) * 1000 >= budget:
+            return self.time_reason()
+        return None
+
+    def time_reason(self) -> str:
+        return f"over the {self.limits.get('page_ms'):g} ms page budget"
+
+    @contextmanager
+    def budget(self, idx: int) -> Iterator[None]:
+        """
+        Charges the block's time to page `idx`. In the main thread an alarm
+        raises PageBudgetExceeded once the page's budget runs out; an alarm
+        already armed by the caller (batch_runner's per-file timeout) is
+        left to fire first if it is due sooner, and re-armed afterwards.
+        """
+        budget = self.limits.get("page_ms")
+        remaining = (budget / 1000 - self._spent.get(idx, 0.0)) if budget else 0.0
+        if budget and remaining <= 0:
+            raise PageBudgetExceeded()
+        armed, outer, previous = False, 0.0, None
+        if (budget and hasattr(signal, "setitimer")
+                and threading.current_thread() is threading.main_thread()):
+            outer = signal.getitimer(signal.ITIMER_REAL)[0]
+            if not outer or outer > remaining:
+                previous = signal.signal(signal.SIGALRM, _on_alarm)
+                signal.setitimer(signal.ITIMER_REAL, remaining)
+                armed = True
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._spent[idx] = self._spent.get(idx, 0.0) + elapsed
+            if armed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+                if outer:
+                    signal.setitimer(signal.ITIMER_REAL, max(outer - elapsed, 0.001))
+
+    def snapshot(self) -> Dict[int, Dict[str, str]]:
+        """Picklable state, so page-range workers can report back to the parent."""
+        return self.throttled
+
+    def merge(self, snap: Optional[Dict[int, Dict[str, str]]]) -> None:
+        if snap:
+            self.throttled.update(snap)
+
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds throttledPages (1-based) and one warning per page when any page was throttled."""
+        if self.throttled:
+            pages = [{"page": idx + 1, **info} for idx, info in sorted(self.throttled.items())]
+            result["throttledPages"] = pages
+            result.setdefault("warnings", []).extend(
+                f"Page {p['page']} "
+                f"{'read as text only' if p['action'] == TEXT_ONLY else 'skipped'} "
+                f"({p['reason']})." for p in pages)
+        return result
+
+
+class _NullGuard:
+    enabled = False
+    limits: Dict[str, float] = {}
+
+    def action(self, idx: int) -> Optional[str]:
+        return None
+
+    def throttle(self, idx: int, action: str, reason: str) -> None:
+        pass
+
+    def over_memory(self) -> Optional[str]:
+        return None
+
+    def over_objects(self, idx: int, page) -> Optional[str]:
+        return None
+
+    def out_of_time(self, idx: int) -> Optional[str]:
+        return None
+
+    def time_reason(self) -> str:
+        return ""
+
+    def budget(self, idx: int):
+        return nullcontext()
+
+    def snapshot(self) -> None:
+        return None
+
+    def merge(self, snap) -> None:
+        pass
+
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return result
+
+
+NULL_GUARD = _NullGuard()
+
+
+def parse_limits(spec: Union[None, str, Dict[str, float]]) -> Optional[Dict[str, float]]:
+    """
+    --page-limits / "page_limits" value → limits dict. None, "" and "off"
+    leave the governor off (return None), "on" takes the defaults, otherwise
+    "rects=2000,page_ms=5000" or a dict overrides single limits (0 = no cap).
+    """
+    if spec in (None, "", "off"):
+        return None
+    if spec == "on":
+        return dict(DEFAULT_LIMITS)
+    if isinstance(spec, str):
+        try:
+            spec = {k.strip(): float(v) for k, v in
+                    (item.split("=", 1) for item in spec.split(",") if item.strip())}
+        except ValueError:
+            raise ValueError(f"Invalid page limits: {spec!r}")
+    unknown = set(spec) - set(DEFAULT_LIMITS)
+    if unknown:
+        raise ValueError(f"Unknown page limit(s): {', '.join(sorted(unknown))}")
+    return {**DEFAULT_LIMITS, **spec}
+
+
+def guard_from(spec: Union[None, str, Dict[str, float]]):
+    """PageGuard for a --page-limits / "page_limits" value; NULL_GUARD when off."""
+    limits = parse_limits(spec)
+    return PageGuard(limits) if limits is not None else NULL_GUARD
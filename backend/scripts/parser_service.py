@@ -0,0 +1,187 @@
+"""
+Long-Lived Parser Worker Service
+Keeps a bounded pool of warm Python workers (pdfplumber already imported,
+regexes already compiled) and feeds them newline-delimited JSON jobs from
+stdin or a Unix socket, streaming one JSON result line back per job.
+
+Job line    : {"id": "abc", "file": "/tmp/upload.pdf", "schema": "auto"}
+Result line : {"id": "abc", "result": { ...same JSON the CLI prints... }}
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+JobFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Set in each worker by the pool initializer so jobs only ship the job dict.
+_worker_job_fn: Optional[JobFn] = None
+
+
+def _init_worker(job_fn: JobFn) -> None:
+    global _worker_job_fn
+    _worker_job_fn = job_fn
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        result = _worker_job_fn(job)
+    except Exception as e:
+        print(traceback.format_exc(), file=sys.stderr)
+        result = {"success": False, "error": str(e)}
+    return {"id": job.get("id"), "result": result}
+
+
+def _decode_job(line: str) -> Dict[str, Any]:
+    job = json.loads(line)
+    if not isinstance(job, dict) or not (job.get("file") or job.get("path")):
+        raise ValueError("job must be an object with a 'file' path")
+    job.setdefault("file", job.get("path"))
+    return job
+
+
+class _ResultSink:
+    """Serialises result lines onto one output stream and tracks jobs in flight."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._cond = threading.Condition()
+        self._pending = 0
+
+    def expect(self) -> None:
+        with self._cond:
+            self._pending += 1
+
+    def write(self, obj: Dict[str, Any], finished: bool = False) -> None:
+        payload = json.dumps(obj, ensure_ascii=False) + "\n"
+        with self._cond:
+            try:
+                self.stream.write(payload)
+                self.stream.flush()
+            except (BrokenPipeError, OSError):
+                pass
+            if finished:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def drain(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending == 0)
+
+
+class _JobDispatcher:
+    """Submits decoded job lines to the pool and writes results as they finish."""
+
+    def __init__(self, pool, max_in_flight: int):
+        self.pool = pool
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def submit(self, line: str, sink: _ResultSink) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            job = _decode_job(line)
+        except ValueError as e:
+            sink.write({"id": None, "result": {
+                "success": False, "error": f"Invalid job: {e}"}})
+            return
+
+        # Backpressure: never queue more than max_in_flight jobs in the pool.
+        self._slots.acquire()
+        sink.expect()
+
+        def _done(out):
+            self._slots.release()
+            sink.write(out, finished=True)
+
+        def _failed(exc):
+            self._slots.release()
+            sink.write({"id": job.get("id"), "result": {
+                "success": False, "error": f"Worker failure: {exc}"}}, finished=True)
+
+        self.pool.apply_async(_run_job, (job,), callback=_done,
+                              error_callback=_failed)
+
+
+class _Utf8Writer:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def write(self, s: str) -> None:
+        self.raw.write(s.encode("utf-8"))
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+def _serve_stdin(dispatcher: _JobDispatcher) -> None:
+    sink = _ResultSink(sys.stdout)
+    for line in sys.stdin:
+        dispatcher.submit(line, sink)
+    sink.drain()
+
+
+def _serve_socket(dispatcher: _JobDispatcher, socket_path: str) -> None:
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            sink = _ResultSink(_Utf8Writer(self.wfile))
+            for raw in self.rfile:
+                dispatcher.submit(raw.decode("utf-8", "replace"), sink)
+            # Client half-closed: finish its jobs before dropping the connection.
+            sink.drain()
+
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with _Server(socket_path, _Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def serve(job_fn: JobFn, argv) -> int:
+    """
+    Entry point for `<parser>.py --serve [--workers N] [--max-jobs N] [--socket PATH]`.
+    `job_fn` must be a module-level function so it can be shipped to workers.
+    """
+    ap = argparse.ArgumentParser(prog="--serve")
+    ap.add_argument("--workers", type=int,
+                    default=max(1, min(4, os.cpu_count() or 1)))
+    ap.add_argument("--max-jobs", type=int, default=50,
+                    help="recycle each worker after this many jobs")
+    ap.add_argument("--socket", default=None,
+                    help="listen on a Unix socket instead of stdin/stdout")
+    args = ap.parse_args(argv)
+
+    workers = max(1, args.workers)
+    pool = multiprocessing.Pool(processes=workers,
+                                initializer=_init_worker,
+                                initargs=(job_fn,),
+                                maxtasksperchild=max(1, args.max_jobs))
+    dispatcher = _JobDispatcher(pool, max_in_flight=workers * 2)
+    # SIGTERM from the supervising Node process → unwind and remove the socket.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        if args.socket:
+            _serve_socket(dispatcher, args.socket)
+        else:
+            _serve_stdin(dispatcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
+        pool.join()
+    return 0
@@ -7,7 +7,6 @@ Supports both 2024 (Legacy/Flat) and 2026 (Merged Categories) Schemas.
 import sys
 import json
 import re
-from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
 try:
@@ -19,15 +18,31 @@ except ImportError:
     }))
     sys.exit(1)
 
+from fast_text import TEXT_BACKENDS
+from job_control import NULL_CONTROL, NULL_DEADLINE, deadline_from
+from page_cache import PageArtifactCache
+from page_guard import NULL_GUARD, guard_from
+from perf_report import NULL_PERF, PerfRecorder, attach_perf
+from preflight import preflight
+from result_cache import ResultCache, local_sources, parser_fingerprint
+from wire_format import add_wire_arguments, encode_result, write_result
+
 # ════════════════════════════════════════════════════════════════════════
 # § 1. SHARED HELPERS & DATA STRUCTURES
 # ════════════════════════════════════════════════════════════════════════
 
 
+WS_RE = re.compile(r"\s+")
+INT_RE = re.compile(r"-?\d+")
+NUMBERED_SPLIT_RE = re.compile(r"\n?\s*\d+\.\s+")
+NUMBER_PREFIX_RE = re.compile(r"^(\d+\.\s*)+")
+BULLET_SPLIT_RE = re.compile(r"\n\s*[-*•]\s+")
+
+
 def clean_text(text: str) -> str:
     if not text:
         return ""
-    return re.sub(r"\s+", " ", str(text)).strip()
+    return WS_RE.sub(" ", str(text)).strip()
 
 
 def safe_int(val, default: int = 0) -> int:
@@ -38,7 +53,7 @@ def safe_int(val, default: int = 0) -> int:
             return int(val)
         except (ValueError, TypeError):
             return default
-    m = re.search(r"-?\d+", str(val))
+    m = INT_RE.search(str(val))
     return int(m.group()) if m else default
 
 
@@ -61,16 +76,16 @@ def extract_numbered_or_bulleted_items(block: str) -> List[str]:
     if not block:
         return []
     block = block.strip()
-    items = re.split(r"\n?\s*\d+\.\s+", "\n" + block)
+    items = NUMBERED_SPLIT_RE.split("\n" + block)
     items = [clean_text(i) for i in items if len(clean_text(i)) > 2]
     if len(items) > 1:
         deduped = []
         for it in items:
-            it = re.sub(r"^(\d+\.\s*)+", "", it).strip()
+            it = NUMBER_PREFIX_RE.sub("", it).strip()
             if it:
                 deduped.append(it)
         return deduped
-    items = re.split(r"\n\s*[-*•]\s+", "\n" + block)
+    items = BULLET_SPLIT_RE.split("\n" + block)
     items = [clean_text(i) for i in items if len(clean_text(i)) > 2]
     if len(items) > 1:
         return items
@@ -126,124 +141,190 @@ def create_blank_pd_data() -> Dict[str, Any]:
 # ════════════════════════════════════════════════════════════════════════
 
 
-def parse_2024(pdf, full_text: str, data: Dict[str, Any]) -> None:
+# Precompiled registry for every 2024 extractor: nothing below builds or
+# looks up a pattern string at call time, least of all inside per-line loops.
+_I = re.IGNORECASE
+_ID = re.IGNORECASE | re.DOTALL
+
+P24_DETAIL_PATTERNS = [
+    (re.compile(r'Faculty\s+(.+?)(?:\n|School)', _I), "faculty"),
+    (re.compile(r'School\s+(.+?)(?:\n|Department)', _I), "school"),
+    (re.compile(r'Department\s+(.+?)(?:\n|Program)', _I), "department"),
+    (re.compile(r'Director of School\s+(.+?)(?:\n|Head)', _I), "director"),
+    (re.compile(r'Head of Department\s+(.+?)(?:\n|\d+\.)', _I), "hod"),
+]
+P24_PROGRAM_NAME_RE = re.compile(r'B\.Tech\.?\s+in\s+(.+?)(?:\n|$)', _I)
+P24_AWARD_PATTERNS = [
+    (re.compile(r'1\.\s*Title of the Award\s+(.+?)(?:\n|2\.)', _ID), 'title'),
+    (re.compile(r'2\.\s*Modes of Study\s+(.+?)(?:\n|3\.)', _ID), 'mode'),
+    (re.compile(r'3\.\s*Awarding Institution.*?\s+(.+?)(?:\n|4\.)', _ID), 'awarding_body'),
+    (re.compile(r'4\.\s*Joint Award\s+(.+?)(?:\n|5\.)', _ID), 'joint_award'),
+    (re.compile(r'5\.\s*Teaching Institution\s+(.+?)(?:\n|6\.)', _ID), 'teaching_institution'),
+    (re.compile(r'6\.\s*Date of Program Specifications\s+(.+?)(?:\n|7\.)', _ID), 'date_program_specs')
+]
+P24_OVERVIEW_RE = re.compile(
+    r'14\.\s*Program Overview.*?\n(.+?)(?=15\.|Program Educational)', _ID)
+# One alternation that finds every PEO / PO / PSO heading and block terminator
+# in a single pass; see _p24_outcome_blocks.
+P24_OUTCOME_MARKERS_RE = re.compile(
+    r'(?P<peo>Program Educational Objectives)|(?P<pso>Program Specific Outcomes)'
+    r'|(?P<ps>Program Specific)|(?P<po>Program Outcomes)'
+    r'|(?P<end>Programme Structure|Definition of Credit|Courses and Credits)', _I)
+P24_OUTCOME_BLOCK_STOPS = {
+    "peo": ("po", "pso", "ps"),
+    "po": ("pso", "ps"),
+    "pso": ("end",),
+}
+P24_PEO_ITEM_RE = re.compile(
+    r'PEO-(\d+):\s*([^\n]+)\n(.*?)(?=PEO-\d+:|Program Outcomes|Program Specific|$)', re.DOTALL)
+P24_PO_ITEM_RE = re.compile(
+    r'PO-(\d+):\s*([^:]+?):\s*(.*?)(?=PO-\d+:|Program Specific|$)', re.DOTALL)
+P24_PSO_ITEM_RE = re.compile(
+    r'PSO-(\d+):\s*([^\n]+)\n(.*?)(?=PSO-\d+:|Programme Structure|Definition of Credit|$)', re.DOTALL)
+P24_CREDIT_PATTERNS = [
+    (re.compile(r'(\d+)\s*Hr\.?\s*Lecture.*?(\d+)\s*Credit', _I), "L"),
+    (re.compile(r'(\d+)\s*Hr\.?\s*Tutorial.*?(\d+)\s*Credit', _I), "T"),
+    (re.compile(r'(\d+)\s*Hr\.?\s*Practical.*?(\d+)\s*Credit', _I), "P"),
+]
+P24_STRUCTURE_BLOCK_RE = re.compile(
+    r'Sl\. No\. Program -?Category Credits(.+?)(?=Semester|Total|$)', _ID)
+P24_STRUCTURE_ROW_RE = re.compile(
+    r'^(\d+)\.\s+(.*?)\s+(\d+)(?:\s*\(([^)]+)\))?\s*$')
+P24_SEMESTER_RE = re.compile(r'Semester[- ](\d+)', _I)
+P24_ELECTIVE_SEMESTER_RE = re.compile(r'(\d+)(?:th|st|nd|rd)?\s*Semester', _I)
+P24_COURSE_CODE_RE = re.compile(r'^UE\d{2}[A-Z]{2}\d{4}$')
+P24_SPECIAL_CODES = {"SDTCD", "CASP", "CIBI", "SA", "SASP"}
+
+# Page routes: each page is classified once from its text layer, and only the
+# matching table extractor runs on it. The structure table is read from the
+# full text, since its block can run onto the next page, so it has no route.
+ROUTE_SEMESTER = "semester_table"
+ROUTE_ELECTIVE = "elective_table"
+ROUTE_NARRATIVE = "narrative"
+
+
+def _p24_outcome_blocks(full_text: str) -> Dict[str, str]:
+    """
+    Locate the PEO, PO and PSO blocks in one linear scan. Each block runs from
+    the first occurrence of its heading to the first terminator after it, or
+    to the end of the text, where a trailing newline is excluded as `$` would
+    exclude it.
+    """
+    markers = [(m.lastgroup, m.start(), m.end())
+               for m in P24_OUTCOME_MARKERS_RE.finditer(full_text)]
+    text_end = len(full_text) - 1 if full_text.endswith("\n") else len(full_text)
+
+    blocks = {}
+    for kind, stops in P24_OUTCOME_BLOCK_STOPS.items():
+        head = next((mk for mk in markers if mk[0] == kind), None)
+        if head is None:
+            continue
+        _, start, head_end = head
+        stop = next((mk[1] for mk in markers
+                     if mk[0] in stops and mk[1] >= head_end), None)
+        blocks[kind] = full_text[start:stop if stop is not None else max(text_end, head_end)]
+    return blocks
+
+
+def route_2024_page(text: str) -> Tuple[str, ...]:
+    """
+    Routes for one page, from its text alone. A table row can only contain
+    "course code" / "course title" if the page text contains those words, so
+    pages without them are never table-extracted; the remaining gates are the
+    ones the semester and elective extractors already applied.
+    """
+    low = text.lower()
+    has_course_code = "course" in low and "code" in low
+    routes = []
+    if ("semester" in low and has_course_code and "title" in low
+            and P24_SEMESTER_RE.search(text)):
+        routes.append(ROUTE_SEMESTER)
+    if ("elective" in low and has_course_code
+            and ("professional" in low or "open" in low)
+            and P24_ELECTIVE_SEMESTER_RE.search(text)):
+        routes.append(ROUTE_ELECTIVE)
+    return tuple(routes) or (ROUTE_NARRATIVE,)
+
+
+def parse_2024(pages: PageArtifactCache, full_text: str, data: Dict[str, Any]) -> None:
     """Extraction logic for 2024 flat-schema PDFs."""
 
     # --- Metadata ---
-    m = re.search(r'Faculty\s+(.+?)(?:\n|School)', full_text, re.IGNORECASE)
-    if m:
-        data["details"]["faculty"] = clean_text(m.group(1))
-
-    m = re.search(r'School\s+(.+?)(?:\n|Department)', full_text, re.IGNORECASE)
-    if m:
-        data["details"]["school"] = clean_text(m.group(1))
-
-    m = re.search(r'Department\s+(.+?)(?:\n|Program)',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["details"]["department"] = clean_text(m.group(1))
-
-    m = re.search(r'Director of School\s+(.+?)(?:\n|Head)',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["details"]["director"] = clean_text(m.group(1))
-
-    m = re.search(r'Head of Department\s+(.+?)(?:\n|\d+\.)',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["details"]["hod"] = clean_text(m.group(1))
+    for pattern, key in P24_DETAIL_PATTERNS:
+        m = pattern.search(full_text)
+        if m:
+            data["details"][key] = clean_text(m.group(1))
 
-    m = re.search(r'B\.Tech\.?\s+in\s+(.+?)(?:\n|$)', full_text, re.IGNORECASE)
+    m = P24_PROGRAM_NAME_RE.search(full_text)
     if m:
         data["details"]["program_name"] = clean_text(m.group(1))
     else:
         data["details"]["program_name"] = "Computer Science & Engineering"
 
     # --- Award ---
-    award_patterns = [
-        (r'1\.\s*Title of the Award\s+(.+?)(?:\n|2\.)', 'title'),
-        (r'2\.\s*Modes of Study\s+(.+?)(?:\n|3\.)', 'mode'),
-        (r'3\.\s*Awarding Institution.*?\s+(.+?)(?:\n|4\.)', 'awarding_body'),
-        (r'4\.\s*Joint Award\s+(.+?)(?:\n|5\.)', 'joint_award'),
-        (r'5\.\s*Teaching Institution\s+(.+?)(?:\n|6\.)', 'teaching_institution'),
-        (r'6\.\s*Date of Program Specifications\s+(.+?)(?:\n|7\.)', 'date_program_specs')
-    ]
-    for pattern, key in award_patterns:
-        match = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
+    for pattern, key in P24_AWARD_PATTERNS:
+        match = pattern.search(full_text)
         if match:
             data["award"][key] = clean_text(match.group(1))
 
     # --- Outcomes ---
-    m = re.search(r'14\.\s*Program Overview.*?\n(.+?)(?=15\.|Program Educational)',
-                  full_text, re.IGNORECASE | re.DOTALL)
+    m = P24_OVERVIEW_RE.search(full_text)
+    pages.perf.section("overview", bool(m))
     if m:
         data["overview"] = clean_text(m.group(1))
 
-    peo = re.search(r'Program Educational Objectives.*?(?=Program Outcomes|Program Specific|$)',
-                    full_text, re.IGNORECASE | re.DOTALL)
-    if peo:
-        peos = re.findall(
-            r'PEO-(\d+):\s*([^\n]+)\n(.*?)(?=PEO-\d+:|Program Outcomes|Program Specific|$)', peo.group(0), re.DOTALL)
+    blocks = _p24_outcome_blocks(full_text)
+    for kind in P24_OUTCOME_BLOCK_STOPS:
+        pages.perf.section(kind, kind in blocks)
+    if "peo" in blocks:
+        peos = P24_PEO_ITEM_RE.findall(blocks["peo"])
         data["peos"] = [
             f"<b>{t.strip()}</b><br/>{d.strip()}" for _, t, d in peos]
 
-    po = re.search(r'Program Outcomes.*?(?=Program Specific|$)',
-                   full_text, re.IGNORECASE | re.DOTALL)
-    if po:
-        pos = re.findall(
-            r'PO-(\d+):\s*([^:]+?):\s*(.*?)(?=PO-\d+:|Program Specific|$)', po.group(0), re.DOTALL)
+    if "po" in blocks:
+        pos = P24_PO_ITEM_RE.findall(blocks["po"])
         data["pos"] = [f"<b>{t.strip()}</b>: {d.strip()}" for _, t, d in pos]
 
-    pso = re.search(r'Program Specific Outcomes.*?(?=Programme Structure|Definition of Credit|Courses and Credits|$)',
-                    full_text, re.IGNORECASE | re.DOTALL)
-    if pso:
-        psos = re.findall(
-            r'PSO-(\d+):\s*([^\n]+)\n(.*?)(?=PSO-\d+:|Programme Structure|Definition of Credit|$)', pso.group(0), re.DOTALL)
+    if "pso" in blocks:
+        psos = P24_PSO_ITEM_RE.findall(blocks["pso"])
         data["psos"] = [
             f"<b>{t.strip()}</b><br/>{d.strip()}" for _, t, d in psos]
 
     # --- Credit Defs ---
-    m = re.search(r'(\d+)\s*Hr\.?\s*Lecture.*?(\d+)\s*Credit',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["credit_def"]["L"] = safe_int(m.group(2))
-    m = re.search(r'(\d+)\s*Hr\.?\s*Tutorial.*?(\d+)\s*Credit',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["credit_def"]["T"] = safe_int(m.group(2))
-    m = re.search(r'(\d+)\s*Hr\.?\s*Practical.*?(\d+)\s*Credit',
-                  full_text, re.IGNORECASE)
-    if m:
-        data["credit_def"]["P"] = safe_int(m.group(2))
+    for pattern, key in P24_CREDIT_PATTERNS:
+        m = pattern.search(full_text)
+        if m:
+            data["credit_def"][key] = safe_int(m.group(2))
 
     # --- Structure Table ---
-    struct = re.search(r'Sl\. No\. Program -?Category Credits(.+?)(?=Semester|Total|$)',
-                       full_text, re.IGNORECASE | re.DOTALL)
+    struct = P24_STRUCTURE_BLOCK_RE.search(full_text)
+    pages.perf.section("structure_table", bool(struct))
     if struct:
         lines = struct.group(1).strip().split('\n')
         for line in lines:
             line = line.strip()
             if not line or not line[0].isdigit():
                 continue
-            m = re.match(
-                r'^(\d+)\.\s+(.*?)\s+(\d+)(?:\s*\(([^)]+)\))?\s*$', line)
+            m = P24_STRUCTURE_ROW_RE.match(line)
             if m:
                 _, cat, cred, code = m.groups()
                 data["structure_table"].append({"category": clean_text(
                     cat), "credits": safe_int(cred), "code": code.strip() if code else ""})
 
-    # --- Semesters (Tables) ---
-    for page in pdf.pages:
-        text = page.extract_text() or ""
-        if 'semester' not in text.lower():
-            continue
+    # --- Page routing ---
+    routes = [route_2024_page(pages.text(i)) for i in range(len(pages))]
+    for route in routes:
+        for label in route:
+            pages.perf.count(f"pages_routed.{label}")
 
-        sem_match = re.search(r'Semester[- ](\d+)', text, re.IGNORECASE)
-        if not sem_match:
+    # --- Semesters (Tables) ---
+    for page_idx, route in enumerate(routes):
+        if ROUTE_SEMESTER not in route:
             continue
-        sem_no = int(sem_match.group(1))
+        text = pages.text(page_idx)
+        sem_no = int(P24_SEMESTER_RE.search(text).group(1))
 
-        tables = page.extract_tables()
+        tables = pages.tables(page_idx)
         if not tables:
             continue
 
@@ -278,7 +359,7 @@ def parse_2024(pdf, full_text: str, data: Dict[str, Any]) -> None:
 
             code = ""
             for cell in cells:
-                if re.match(r'^UE\d{2}[A-Z]{2}\d{4}$', cell) or cell in ["SDTCD", "CASP", "CIBI", "SA", "SASP"]:
+                if P24_COURSE_CODE_RE.match(cell) or cell in P24_SPECIAL_CODES:
                     code = cell
                     break
             if not code:
@@ -294,23 +375,14 @@ def parse_2024(pdf, full_text: str, data: Dict[str, Any]) -> None:
             })
 
     # --- Electives (Tables) ---
-    for page in pdf.pages:
-        text = page.extract_text() or ""
-        if "elective" not in text.lower():
+    for page_idx, route in enumerate(routes):
+        if ROUTE_ELECTIVE not in route:
             continue
-
+        text = pages.text(page_idx)
         is_prof = "professional" in text.lower()
-        is_open = "open" in text.lower()
-        if not is_prof and not is_open:
-            continue
+        semester = int(P24_ELECTIVE_SEMESTER_RE.findall(text)[0])
 
-        sem_numbers = re.findall(
-            r'(\d+)(?:th|st|nd|rd)?\s*Semester', text, re.IGNORECASE)
-        if not sem_numbers:
-            continue
-        semester = int(sem_numbers[0])
-
-        tables = page.extract_tables()
+        tables = pages.tables(page_idx)
         if not tables:
             continue
 
@@ -333,8 +405,8 @@ def parse_2024(pdf, full_text: str, data: Dict[str, Any]) -> None:
                     continue
                 cells = [str(c).strip() if c else "" for c in row]
 
-                code = next((c for c in cells if re.match(
-                    r'^UE\d{2}[A-Z]{2}\d{4}$', c)), "")
+                code = next(
+                    (c for c in cells if P24_COURSE_CODE_RE.match(c)), "")
                 if not code:
                     continue
 
@@ -373,15 +445,86 @@ CATEGORY_DIVIDER_LINES = {"academic", "competency and skills",
                           "professional skills", "sports, culture and environment"}
 NOISE_LINE_RE = re.compile(
     r"^(s\.?\s*no\.?\s*course code\s*course title\s*credits|page\s*\|\s*\d+|note:.*)$", re.IGNORECASE)
+CATEGORY_NAMES = {"academic": "Academic", "competency and skills": "Competency and Skills",
+                  "professional skills": "Professional Skills",
+                  "sports, culture and environment": "Sports, Culture and Environment"}
+
+# Precompiled registry for every 2026 extractor. Per-line semester and
+# technical-competency patterns are built once here, never inside loops.
+#
+# All 13 numbered headings in one alternation; the captured gap between the
+# number and the title tells a spaced heading ("10 Program Overview") from a
+# tight one ("10Program Overview").
+SECTION_HEADING_SCAN_RE = re.compile(r"(?m)^\s*(?:" + "|".join(
+    rf"{sec_no}(?P<s{sec_no}>\s*)(?={pattern})"
+    for sec_no, pattern in SECTION_HEADING_PATTERNS) + ")")
+SECTION_NUMBER_LINE_RE = re.compile(r"^\s*\d+\s+[^\n]*\n")
+
+P26_AWARD_TITLE_RE = re.compile(
+    r"(?i)Title of the Award\s+(B\.?\s?Tech\.?,?\s*(?:in\s*)?.+?)(?:\n|\s{2,}\d|$)")
+P26_BTECH_PREFIX_RE = re.compile(r"(?i)^B\.?\s?Tech\.?,?\s*(in\s*)?")
+P26_DETAIL_PATTERNS = [
+    (re.compile(r"(?i)Faculty\s+(?:of\s+)?(.+?)(?:\n|(?=School))"), "faculty"),
+    (re.compile(r"(?i)School\s+(School of .+?)(?:\n|(?=Department))"), "school"),
+    (re.compile(r"(?i)Department\s+(.+?)(?:\n|(?=Program\b))"), "department"),
+    (re.compile(r"(?i)Director of (?:the )?School\s+(Dr\.?.+?|Prof\.?.+?|Mr\.?.+?|Ms\.?.+?|[A-Z].+?)(?:\n|(?=Head))"), "director"),
+    (re.compile(r"(?i)Head of the\s*\n?\s*Department\s+(.+?)(?:\n|(?=\d+\s+Title))"), "hod")
+]
+P26_PEO_INTRO_RE = re.compile(r"(?i)^The Program Educational Objectives include:?\s*")
+P26_PEO_ITEM_RE = re.compile(r"(PEO-\d+\s*:.*?)(?=PEO-\d+\s*:|\Z)", re.DOTALL)
+P26_PO_ITEM_RE = re.compile(r"(PO-\d+\s*:.*?)(?=PO-\d+\s*:|\Z)", re.DOTALL)
+P26_PSO_INTRO_RE = re.compile(r"(?i)^Upon completion of the program.*?:?\s*")
+P26_PSO_ITEM_RE = re.compile(r"(PSO-\d+\s*:.*?)(?=PSO-\d+\s*:|\Z)", re.DOTALL)
+P26_CREDIT_PATTERNS = [
+    (re.compile(r"(?i)Lecture\s*\(L\)\s*per week\s*(\d+)\s*Credit"), "L"),
+    (re.compile(r"(?i)Tutorial\s*\(T\)\s*per week\s*(\d+)\s*Credit"), "T"),
+    (re.compile(r"(?i)Practical\s*\(P\)\s*per week\s*(\d+)\s*Credit"), "P"),
+]
+P26_STRUCTURE_BLOCK_RE = re.compile(
+    r"(?i)Program\s*-\s*Category\s+Credits(.*?)(?=Total\s+130|\n\d+\.\s*Courses and Credits|\Z)", re.DOTALL)
+P26_STRUCTURE_ROW_RE = re.compile(r"^(\d+)\s+(.*?)\s+(\d+)\s*(\([A-Z0-9]+\))?\s*$")
+P26_SEMESTER_HEADING_RE = re.compile(r"(?im)^Semester[\s-]*([IVX\d]+)\s*$")
+P26_TECH_CUTOFF_RE = re.compile(r"(?im)^\s*15\s+(?:List of )?Technical Competency Courses")
+P26_TOTAL_LINE_RE = re.compile(r"(?i)^(total|overall)\s+\d")
+P26_ELECTIVE_HEAD_RE = re.compile(r"(?i)^(Professional|Open)\s+Elective[-\s]?(\d+)\s*$")
+P26_BARE_COURSE_RE = re.compile(rf"^({CODE_TOKEN_RE.pattern})\s+(.+?)\s*$")
+P26_TRAILING_NUMBER_RE = re.compile(r"\d+\s*$")
+P26_TITLE_ENDS_NUMBER_RE = re.compile(r".*\s\d+$")
+P26_COURSE_RE = re.compile(rf"^(\d+)\s+({CODE_TOKEN_RE.pattern})\s+(.+?)\s+(\d+)\s*$")
+P26_COURSE_NO_TITLE_RE = re.compile(rf"^(\d+)\s+({CODE_TOKEN_RE.pattern})\s+(\d+)\s*$")
+P26_LEADING_DIGIT_RE = re.compile(r"^\d")
+P26_TECH_NOISE_RE = re.compile(r"(?i)^(course|s\.?no|note:)")
+TECH_CODE_RE = re.compile(r"\bCS\d{2}TSCS\d{2}\b", re.IGNORECASE)
+P26_TECH_NUMBERED_RE = re.compile(
+    rf"^(\d+)\s+({TECH_CODE_RE.pattern})\s+(.+?)\s+(\d+)\s+(\S+)\s*$")
+P26_TECH_BARE_RE = re.compile(rf"^({TECH_CODE_RE.pattern})\s+(.+?)\s+(\S+)\s*$")
+P26_TECH_CREDIT_LINE_RE = re.compile(r"^\d+\s+\d+\s*$")
+P26_ASSESSMENT_COMPONENT_RE = re.compile(
+    r"^(.+?)\s*:\s*(\d+%)[^\n]*?(\d+%)\s*$", re.MULTILINE)
+P26_ASSESSMENT_DESC_RE = re.compile(
+    r"^(.*?)(?=Assessment Component\s+Weightage)", re.DOTALL)
+P26_GRADE_RULES_RE = re.compile(
+    r"(?i)(Based on total marks scored.*?)(?=A minimum of overall|\Z)", re.DOTALL)
+P26_PASSING_RE = re.compile(r"(?i)(A minimum of overall.*?)(?=\d+\.\s|\Z)", re.DOTALL)
 
 
 def _get_section_spans(full_text: str) -> Dict[int, Tuple[int, int]]:
+    """
+    One linear scan over full_text. Per section, the first spaced heading wins;
+    a tight heading is used only when no spaced one exists anywhere.
+    """
+    spaced, tight = {}, {}
+    for m in SECTION_HEADING_SCAN_RE.finditer(full_text):
+        group = m.lastgroup
+        sec_no = int(group[1:])
+        target = spaced if m.group(group) else tight
+        target.setdefault(sec_no, m.start())
+
     found = []
-    for sec_no, pattern in SECTION_HEADING_PATTERNS:
-        m = re.search(rf"(?m)^\s*{sec_no}\s+(?={pattern})", full_text) or re.search(
-            rf"(?m)^\s*{sec_no}\s*{pattern}", full_text)
-        if m:
-            found.append((sec_no, m.start(), m.end()))
+    for sec_no, _ in SECTION_HEADING_PATTERNS:
+        start = spaced.get(sec_no, tight.get(sec_no))
+        if start is not None:
+            found.append((sec_no, start, None))
     found.sort(key=lambda x: x[1])
     spans = {}
     for idx, (sec_no, start, _) in enumerate(found):
@@ -395,78 +538,60 @@ def _get_section_text(full_text: str, spans: Dict[int, Tuple[int, int]], sec_no:
         return ""
     start, end = spans[sec_no]
     text = full_text[start:end]
-    return re.sub(r"^\s*\d+\s+[^\n]*\n", "", text, count=1).strip()
+    return SECTION_NUMBER_LINE_RE.sub("", text, count=1).strip()
 
 
-def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
-    spans = _get_section_spans(full_text)
+def parse_2026(pages: PageArtifactCache, full_text: str, data: Dict[str, Any]) -> None:
+    with pages.perf.stage("section_scan"):
+        spans = _get_section_spans(full_text)
+    for sec_no, _ in SECTION_HEADING_PATTERNS:
+        pages.perf.section(f"section_{sec_no}", sec_no in spans)
 
     # --- Metadata ---
-    m = re.search(
-        r"(?i)Title of the Award\s+(B\.?\s?Tech\.?,?\s*(?:in\s*)?.+?)(?:\n|\s{2,}\d|$)", full_text)
+    m = P26_AWARD_TITLE_RE.search(full_text)
     if m:
         data["award"]["title"] = clean_text(m.group(1))
-        prog = re.sub(r"(?i)^B\.?\s?Tech\.?,?\s*(in\s*)?",
-                      "", data["award"]["title"]).strip()
+        prog = P26_BTECH_PREFIX_RE.sub("", data["award"]["title"]).strip()
         if prog:
             data["details"]["program_name"] = prog
 
-    for regex, key in [
-        (r"(?i)Faculty\s+(?:of\s+)?(.+?)(?:\n|(?=School))", "faculty"),
-        (r"(?i)School\s+(School of .+?)(?:\n|(?=Department))", "school"),
-        (r"(?i)Department\s+(.+?)(?:\n|(?=Program\b))", "department"),
-        (r"(?i)Director of (?:the )?School\s+(Dr\.?.+?|Prof\.?.+?|Mr\.?.+?|Ms\.?.+?|[A-Z].+?)(?:\n|(?=Head))", "director"),
-        (r"(?i)Head of the\s*\n?\s*Department\s+(.+?)(?:\n|(?=\d+\s+Title))", "hod")
-    ]:
-        m = re.search(regex, full_text)
+    for regex, key in P26_DETAIL_PATTERNS:
+        m = regex.search(full_text)
         if m:
             data["details"][key] = clean_text(m.group(1))
 
     # --- Outcomes ---
     data["overview"] = clean_text(_get_section_text(full_text, spans, 10))
 
-    peo_text = re.sub(r"(?i)^The Program Educational Objectives include:?\s*",
-                      "", _get_section_text(full_text, spans, 11))
-    data["peos"] = [clean_text(p) for p in re.findall(
-        r"(PEO-\d+\s*:.*?)(?=PEO-\d+\s*:|\Z)", peo_text, re.DOTALL) if len(clean_text(p)) > 10]
+    peo_text = P26_PEO_INTRO_RE.sub("", _get_section_text(full_text, spans, 11))
+    data["peos"] = [clean_text(p) for p in P26_PEO_ITEM_RE.findall(
+        peo_text) if len(clean_text(p)) > 10]
 
     po_text = _get_section_text(full_text, spans, 12)
-    data["pos"] = [clean_text(p) for p in re.findall(
-        r"(PO-\d+\s*:.*?)(?=PO-\d+\s*:|\Z)", po_text, re.DOTALL) if len(clean_text(p)) > 10]
+    data["pos"] = [clean_text(p) for p in P26_PO_ITEM_RE.findall(
+        po_text) if len(clean_text(p)) > 10]
 
-    pso_text = re.sub(r"(?i)^Upon completion of the program.*?:?\s*",
-                      "", _get_section_text(full_text, spans, 13))
-    data["psos"] = [clean_text(p) for p in re.findall(
-        r"(PSO-\d+\s*:.*?)(?=PSO-\d+\s*:|\Z)", pso_text, re.DOTALL) if len(clean_text(p)) > 10]
+    pso_text = P26_PSO_INTRO_RE.sub("", _get_section_text(full_text, spans, 13))
+    data["psos"] = [clean_text(p) for p in P26_PSO_ITEM_RE.findall(
+        pso_text) if len(clean_text(p)) > 10]
 
     # --- Credit Def ---
-    l_m = re.search(
-        r"(?i)Lecture\s*\(L\)\s*per week\s*(\d+)\s*Credit", full_text)
-    t_m = re.search(
-        r"(?i)Tutorial\s*\(T\)\s*per week\s*(\d+)\s*Credit", full_text)
-    p_m = re.search(
-        r"(?i)Practical\s*\(P\)\s*per week\s*(\d+)\s*Credit", full_text)
-    if l_m:
-        data["credit_def"]["L"] = safe_int(l_m.group(1))
-    if t_m:
-        data["credit_def"]["T"] = safe_int(t_m.group(1))
-    if p_m:
-        data["credit_def"]["P"] = safe_int(p_m.group(1))
+    for regex, key in P26_CREDIT_PATTERNS:
+        m = regex.search(full_text)
+        if m:
+            data["credit_def"][key] = safe_int(m.group(1))
 
     # --- Structure Table ---
-    st_m = re.search(
-        r"(?i)Program\s*-\s*Category\s+Credits(.*?)(?=Total\s+130|\n\d+\.\s*Courses and Credits|\Z)", full_text, re.DOTALL)
+    st_m = P26_STRUCTURE_BLOCK_RE.search(full_text)
     if st_m:
         for line in [l.strip() for l in st_m.group(1).split("\n") if l.strip()]:
-            rm = re.match(
-                r"^(\d+)\s+(.*?)\s+(\d+)\s*(\([A-Z0-9]+\))?\s*$", line)
+            rm = P26_STRUCTURE_ROW_RE.match(line)
             if rm:
                 data["structure_table"].append({"category": clean_text(rm.group(
                     2)), "credits": safe_int(rm.group(3)), "code": (rm.group(4) or "").strip("()")})
 
     # --- Semesters (2026 Line-Based Logic) ---
-    sem_matches = list(re.finditer(
-        r"(?im)^Semester[\s-]*([IVX\d]+)\s*$", full_text))
+    sem_matches = list(P26_SEMESTER_HEADING_RE.finditer(full_text))
     for idx, m in enumerate(sem_matches):
         sem_no = roman_to_int(m.group(1))
         if sem_no <= 0 or sem_no > 12:
@@ -475,8 +600,7 @@ def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
         start = m.end()
         end = sem_matches[idx + 1].start() if idx + \
             1 < len(sem_matches) else len(full_text)
-        cutoff = re.search(
-            r"(?im)^\s*15\s+(?:List of )?Technical Competency Courses", full_text[start:end])
+        cutoff = P26_TECH_CUTOFF_RE.search(full_text[start:end])
         block_text = full_text[start:start +
                                cutoff.start()] if cutoff else full_text[start:end]
 
@@ -498,34 +622,31 @@ def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
             line = lines[i]
             low = line.lower()
 
-            if low in DIVIDER_LINES:
-                current_cat = {"academic": "Academic", "competency and skills": "Competency and Skills", "professional skills":
-                               "Professional Skills", "sports, culture and environment": "Sports, Culture and Environment"}.get(low, "Academic")
+            if low in CATEGORY_DIVIDER_LINES:
+                current_cat = CATEGORY_NAMES.get(low, "Academic")
                 i += 1
                 continue
 
-            if re.match(r"(?i)^(total|overall)\s+\d", line):
+            if P26_TOTAL_LINE_RE.match(line):
                 i += 1
                 continue
 
-            el_head = re.match(
-                r"(?i)^(Professional|Open)\s+Elective[-\s]?(\d+)\s*$", line)
+            el_head = P26_ELECTIVE_HEAD_RE.match(line)
             if el_head:
                 pending_group_courses, pending_group_active = [], True
                 i += 1
                 continue
 
-            bare_m = re.match(rf"^({CODE_TOKEN_RE.pattern})\s+(.+?)\s*$", line)
-            if pending_group_active and bare_m and not re.search(r"\d+\s*$", line.split()[-1]):
+            bare_m = P26_BARE_COURSE_RE.match(line)
+            if pending_group_active and bare_m and not P26_TRAILING_NUMBER_RE.search(line.split()[-1]):
                 title = clean_text(bare_m.group(2))
-                if not re.match(r".*\s\d+$", title):
+                if not P26_TITLE_ENDS_NUMBER_RE.match(title):
                     pending_group_courses.append(
                         (bare_m.group(1).upper(), title))
                     i += 1
                     continue
 
-            std_m = re.match(
-                rf"^(\d+)\s+({CODE_TOKEN_RE.pattern})\s+(.+?)\s+(\d+)\s*$", line)
+            std_m = P26_COURSE_RE.match(line)
             if std_m:
                 code, title, credits = std_m.group(2).upper(), clean_text(
                     std_m.group(3)), safe_int(std_m.group(4))
@@ -545,13 +666,12 @@ def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
                 i += 1
                 continue
 
-            no_title_m = re.match(
-                rf"^(\d+)\s+({CODE_TOKEN_RE.pattern})\s+(\d+)\s*$", line)
+            no_title_m = P26_COURSE_NO_TITLE_RE.match(line)
             if no_title_m:
                 code, credits = no_title_m.group(
                     2).upper(), safe_int(no_title_m.group(3))
                 title = ""
-                if i + 1 < n and (lines[i + 1].startswith("(") or not re.match(r"^\d", lines[i + 1])):
+                if i + 1 < n and (lines[i + 1].startswith("(") or not P26_LEADING_DIGIT_RE.match(lines[i + 1])):
                     title = clean_text(lines[i + 1].strip("()"))
                     i += 1
                 _get_cat(current_cat)["courses"].append(
@@ -573,27 +693,25 @@ def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
     tc = _get_section_text(full_text, spans, 15)
     if tc:
         tlines = [l.strip() for l in tc.split("\n") if l.strip()
-                  and not re.match(r"(?i)^(course|s\.?no|note:)", l)]
-        tech_re = re.compile(r"\bCS\d{2}TSCS\d{2}\b", re.IGNORECASE)
+                  and not P26_TECH_NOISE_RE.match(l)]
         i, n = 0, len(tlines)
         while i < n:
             l = tlines[i]
-            m1 = re.match(
-                rf"^(\d+)\s+({tech_re.pattern})\s+(.+?)\s+(\d+)\s+(\S+)\s*$", l)
+            m1 = P26_TECH_NUMBERED_RE.match(l)
             if m1:
                 s4["technicalCompetencyCourses"].append({"code": m1.group(2).upper(), "title": clean_text(
                     m1.group(3)), "credits": safe_int(m1.group(4)), "resource": clean_text(m1.group(5))})
                 i += 1
                 continue
 
-            m2 = re.match(rf"^({tech_re.pattern})\s+(.+?)\s+(\S+)\s*$", l)
+            m2 = P26_TECH_BARE_RE.match(l)
             if m2:
                 code, title, res, cr, desc = m2.group(1).upper(), clean_text(
                     m2.group(2)), clean_text(m2.group(3)), 2, ""
-                if i+1 < n and re.match(r"^\d+\s+\d+\s*$", tlines[i+1]):
+                if i+1 < n and P26_TECH_CREDIT_LINE_RE.match(tlines[i+1]):
                     cr = safe_int(tlines[i+1].split()[-1])
                     i += 1
-                    if i+1 < n and not tech_re.search(tlines[i+1]):
+                    if i+1 < n and not TECH_CODE_RE.search(tlines[i+1]):
                         desc = clean_text(tlines[i+1])
                         i += 1
                 s4["technicalCompetencyCourses"].append(
@@ -615,22 +733,18 @@ def parse_2026(pdf, full_text: str, data: Dict[str, Any]) -> None:
 
     ag_txt = _get_section_text(full_text, spans, 19)
     if ag_txt:
-        comps = re.findall(
-            r"^(.+?)\s*:\s*(\d+%)[^\n]*?(\d+%)\s*$", ag_txt, re.MULTILINE)
+        comps = P26_ASSESSMENT_COMPONENT_RE.findall(ag_txt)
         if comps:
             s4["assessmentGrading"]["components"] = [
                 {"name": clean_text(n), "weightage": safe_int(t)} for n, _, t in comps]
-        d_m = re.search(
-            r"^(.*?)(?=Assessment Component\s+Weightage)", ag_txt, re.DOTALL)
+        d_m = P26_ASSESSMENT_DESC_RE.search(ag_txt)
         if d_m:
             s4["assessmentGrading"]["description"] = " ".join(
                 extract_numbered_or_bulleted_items(d_m.group(1)))
-        g_m = re.search(
-            r"(?i)(Based on total marks scored.*?)(?=A minimum of overall|\Z)", ag_txt, re.DOTALL)
+        g_m = P26_GRADE_RULES_RE.search(ag_txt)
         if g_m:
             s4["assessmentGrading"]["gradeRules"] = clean_text(g_m.group(1))
-        p_m = re.search(
-            r"(?i)(A minimum of overall.*?)(?=\d+\.\s|\Z)", ag_txt, re.DOTALL)
+        p_m = P26_PASSING_RE.search(ag_txt)
         if p_m:
             s4["assessmentGrading"]["passingCriteria"] = clean_text(
                 p_m.group(1))
@@ -658,31 +772,160 @@ def _infer_course_type(title: str) -> str:
 # ════════════════════════════════════════════════════════════════════════
 
 
-def detect_schema_version(file_path: str) -> str:
+SCHEME_2026_RE = re.compile(r'(?i)2026\s*Scheme')
+UE26_RE = re.compile(r'UE26')
+
+
+def _detect_schema_from_pages(pages: PageArtifactCache) -> str:
+    text = "".join(pages.texts(limit=5))
+    if SCHEME_2026_RE.search(text) or UE26_RE.search(text):
+        return "2026"
+    return "2024"
+
+
+def detect_schema_version(source) -> str:
+    """
+    Accepts a file path or an already-open PageArtifactCache. A path is
+    answered by the layout-free preflight probe when it can decode the text.
+    """
     try:
-        with pdfplumber.open(file_path) as pdf:
-            text = "".join([p.extract_text() or "" for p in pdf.pages[:5]])
-            if re.search(r'(?i)2026\s*Scheme', text) or re.search(r'UE26', text):
-                return "2026"
-            return "2024"
+        if isinstance(source, PageArtifactCache):
+            return _detect_schema_from_pages(source)
+        schema = preflight(source)["schema"]
+        if schema:
+            return schema
+        with pdfplumber.open(source) as pdf:
+            return _detect_schema_from_pages(PageArtifactCache(pdf))
     except Exception:
         return "2024"
 
 
-def process_pdf(file_path: str, requested_schema: str = "auto") -> Dict[str, Any]:
+def read_full_text(pages: PageArtifactCache, schema: str, control=NULL_CONTROL,
+                   deadline=NULL_DEADLINE) -> str:
+    """
+    Full document text in one visit per page. On 2024 documents, pages routed
+    to the semester / elective tables get those tables in the same visit, so
+    each page's layout objects are released as soon as it has been read and
+    memory stays flat however many pages the document has. `control` hears
+    about every page and may cancel between them. When `deadline` refuses a
+    page, reading stops and `pages` is truncated to the pages read, so the
+    parse stages never lay out the rest.
+    """
+    texts = []
+    total = len(pages)
+    for idx in range(total):
+        if not deadline.allows_page():
+            deadline.skip_pages(idx, total)
+            pages.truncate(idx)
+            break
+        text = pages.text(idx)
+        if schema != "2026":
+            route = route_2024_page(text)
+            if ROUTE_SEMESTER in route or ROUTE_ELECTIVE in route:
+                pages.tables(idx)
+        pages.release(idx)
+        texts.append(text)
+        control.progress(idx + 1, total)
+    return "\n".join(texts)
+
+
+_PARSER_SOURCES = local_sources(__file__)
+_fingerprint: Optional[str] = None
+
+
+def _parser_fingerprint() -> str:
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = parser_fingerprint(_PARSER_SOURCES)
+    return _fingerprint
+
+
+def process_pdf(file_path: str, requested_schema: str = "auto", use_cache: bool = True,
+                perf=NULL_PERF, text_backend: str = "layout",
+                control=NULL_CONTROL, deadline=NULL_DEADLINE,
+                guard=NULL_GUARD) -> Dict[str, Any]:
+    """
+    Cache-aware entry point: identical uploads skip the pdfplumber pipeline.
+    `text_backend` "fast" reads 2026 documents through fast_text, which
+    produces the same text without pdfplumber's per-char object model; the
+    2024 path extracts tables and always uses the layout backend. `control`
+    (job_control.JobControl) receives stage / progress events and can cancel
+    the parse at the next page; a job_control.Deadline stops reading pages in
+    time to return a `partial` result. A page_guard.PageGuard reads pages
+    that are too large, slow or memory-hungry as text only (or skips them)
+    and lists them in `throttledPages`. Partial and throttled results are
+    not cached.
+    """
+    cache = ResultCache.from_env() if use_cache else None
+    cache_key = None
+    if cache:
+        with perf.stage("result_cache_lookup"):
+            schema_key = f"pd:{requested_schema}"
+            if text_backend != "layout":
+                schema_key += f":{text_backend}"
+            cache_key = cache.key(file_path, schema_key, _parser_fingerprint())
+            cached = cache.get(cache_key)
+        if cached is not None:
+            perf.count("result_cache_hits")
+            return cached
+
+    result = _process_pdf_uncached(file_path, requested_schema, use_cache, perf,
+                                   text_backend, control, deadline, guard)
+    if (cache and result.get("success") and not result.get("partial")
+            and not result.get("throttledPages")):
+        cache.put(cache_key, result)
+    return result
+
+
+def _process_pdf_uncached(file_path: str, requested_schema: str, use_cache: bool = True,
+                          perf=NULL_PERF, text_backend: str = "layout",
+                          control=NULL_CONTROL, deadline=NULL_DEADLINE,
+                          guard=NULL_GUARD) -> Dict[str, Any]:
     data = create_blank_pd_data()
     schema = requested_schema if requested_schema in [
-        "2024", "2026"] else detect_schema_version(file_path)
+        "2024", "2026"] else None
+
+    # Content-stream probe: a scanned or unreadable upload is rejected before
+    # any layout runs, and auto schema detection needs no extract_text().
+    control.stage("preflight")
+    with perf.stage("preflight"):
+        probe = preflight(file_path)
+    if probe["error"]:
+        return {"success": False, "error": probe["error"]}
+    if not probe["has_text"]:
+        return {"success": False, "error": "No text found in PDF (might be scanned)."}
+    if schema is None:
+        schema = probe["schema"]
 
     try:
         with pdfplumber.open(file_path) as pdf:
-            full_text = "\n".join([(p.extract_text() or "")
-                                  for p in pdf.pages])
+            # One cache per document: schema detection, full_text and the
+            # table passes below all share the same per-page layout results.
+            # The page store lets an edited re-upload skip unchanged pages.
+            pages = PageArtifactCache(
+                pdf, store=PageArtifactCache.default_store() if use_cache else None,
+                perf=perf, plan_tables=True, guard=guard)
+            perf.count("pages", len(pages))
+            if schema is None:
+                control.stage("detect_schema")
+                with perf.stage("detect_schema"):
+                    schema = detect_schema_version(pages)
+            if schema == "2026":
+                pages.text_backend = text_backend
+
+            control.stage("full_text")
+            with perf.stage("full_text"):
+                full_text = read_full_text(pages, schema, control, deadline)
             if not full_text.strip():
+                if deadline.partial:
+                    return {"success": False,
+                            "error": "Deadline reached before any text was read."}
                 return {"success": False, "error": "No text found in PDF (might be scanned)."}
 
+            control.stage(f"parse_{schema}")
             if schema == "2026":
-                parse_2026(pdf, full_text, data)
+                with perf.stage("parse_2026"):
+                    parse_2026(pages, full_text, data)
 
                 # 🔴 STRICT 2026 DB SCHEMA SEPARATION 🔴
                 # Remove 2024 flat structures so it parses and saves cleanly as 2026
@@ -699,7 +942,8 @@ def process_pdf(file_path: str, requested_schema: str = "auto") -> Dict[str, Any
                         sem["categories"] = []
 
             else:
-                parse_2024(pdf, full_text, data)
+                with perf.stage("parse_2024"):
+                    parse_2024(pages, full_text, data)
 
                 # 🔴 STRICT 2024 DB SCHEMA SEPARATION 🔴
                 # Remove 2026 dynamic structures so it parses and saves cleanly as 2024
@@ -717,6 +961,9 @@ def process_pdf(file_path: str, requested_schema: str = "auto") -> Dict[str, Any
                     if "courses" not in sem:
                         sem["courses"] = []
 
+            with perf.stage("page_store_flush"):
+                pages.flush()
+
         # Standardize 8 Semesters minimum
         while len(data["semesters"]) < 8:
             sem_base = {"sem_no": len(data["semesters"]) + 1}
@@ -752,15 +999,18 @@ def process_pdf(file_path: str, requested_schema: str = "auto") -> Dict[str, Any
         if schema == "2026" and not data["section4"].get("technicalCompetencyCourses"):
             warnings.append("Technical Competency Courses not found.")
 
+        if probe["kind"] in ("cd", "cd_bundle"):
+            warnings.append("This looks like a Course Document, not a Program Document.")
+
         data["parserWarnings"] = warnings
 
-        return {
+        return guard.annotate(deadline.annotate({
             "success": True,
             "schemaVersion": schema,
             "confidence": max(0, score),
             "warnings": warnings,
             "data": data
-        }
+        }))
 
     except Exception as e:
         import traceback
@@ -769,15 +1019,74 @@ def process_pdf(file_path: str, requested_schema: str = "auto") -> Dict[str, Any
         return {"success": False, "error": str(e)}
 
 
+def run_job(job: Dict[str, Any], control=NULL_CONTROL) -> Dict[str, Any]:
+    """
+    Worker-service / batch / --job adapter: {"file": path, "schema": "auto"}
+    → process_pdf result. A job with "timings": true gets the same `perf`
+    object as --timings; "text_backend": "fast" is --text-backend fast,
+    "deadline_ms" is --deadline-ms and "page_limits" is --page-limits.
+    """
+    try:
+        guard = guard_from(job.get("page_limits"))
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    perf = PerfRecorder() if job.get("timings") else NULL_PERF
+    result = process_pdf(job["file"], job.get("schema") or "auto",
+                         use_cache=job.get("use_cache", True), perf=perf,
+                         text_backend=job.get("text_backend") or "layout",
+                         control=control, deadline=deadline_from(job.get("deadline_ms")),
+                         guard=guard)
+    if perf.enabled:
+        result = attach_perf(result, perf, json.dumps)
+    return result
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        from parser_service import serve
+        sys.exit(serve(run_job, sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--job":
+        from job_control import run_job_mode
+        sys.exit(run_job_mode(run_job, sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch_runner import run_batch
+        sys.exit(run_batch(run_job, sys.argv[2:], default_schema="auto"))
+
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "No file path provided"}))
         sys.exit(1)
 
-    pdf_path = sys.argv[1]
-    schema_arg = sys.argv[2] if len(sys.argv) > 2 else "auto"
+    import argparse
+    ap = argparse.ArgumentParser(description="Parse a Program Document PDF")
+    ap.add_argument("file")
+    ap.add_argument("schema", nargs="?", default="auto")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="bypass the on-disk result cache")
+    ap.add_argument("--timings", action="store_true",
+                    help="add a per-stage / per-page `perf` report to the result")
+    ap.add_argument("--text-backend", choices=TEXT_BACKENDS, default="layout",
+                    help="text extraction for 2026 documents: pdfplumber layout "
+                         "(default) or the equivalent, faster fast_text path")
+    ap.add_argument("--deadline-ms", type=int, default=None,
+                    help="stop reading pages in time to return a partial result "
+                         "within this many milliseconds")
+    ap.add_argument("--page-limits", default=None,
+                    help='opt-in per-page caps: "on" for the defaults, or e.g. '
+                         '"rects=2000,page_ms=5000" (chars, rects, lines, page_ms, rss_mb)')
+    add_wire_arguments(ap)
+    args = ap.parse_args()
+    deadline = deadline_from(args.deadline_ms)
+    try:
+        guard = guard_from(args.page_limits)
+    except ValueError as e:
+        ap.error(str(e))
 
-    result = process_pdf(pdf_path, schema_arg)
+    perf = PerfRecorder() if args.timings else NULL_PERF
+    result = process_pdf(args.file, args.schema, use_cache=not args.no_cache, perf=perf,
+                         text_backend=args.text_backend, deadline=deadline, guard=guard)
 
     # GUARANTEE ONLY JSON GOES TO STDOUT
-    print(json.dumps(result, ensure_ascii=False))
+    if args.timings:
+        result = attach_perf(result, perf,
+                             lambda r: encode_result(r, args.encoding, args.pretty))
+    write_result(result, args)
@@ -0,0 +1,133 @@
+"""
+Per-Stage Timing & Counter Report
+Opt-in instrumentation behind the parsers' --timings flag. A PerfRecorder
+collects wall / CPU time per stage and per page plus named counters, and
+renders them as the `perf` object added to the JSON result.
+
+Stages may nest (parse_2024 contains extract_tables), so stage times are
+inclusive. Page times cover the layout work (text, words, tables) done for
+that page. NULL_PERF has the same interface and records nothing, so
+un-timed runs pay no bookkeeping cost.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class PerfRecorder:
+    enabled = True
+
+    def __init__(self):
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._stages: Dict[str, List[float]] = {}   # name → [wall, cpu, calls]
+        self._pages: Dict[int, List[float]] = {}    # page index → [wall, cpu]
+        self.counters: Dict[str, int] = {}
+        self.sections: Dict[str, List[str]] = {"matched": [], "missed": []}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self._stages.setdefault(name, [0.0, 0.0, 0])
+            entry[0] += time.perf_counter() - w0
+            entry[1] += time.process_time() - c0
+            entry[2] += 1
+
+    @contextmanager
+    def page(self, idx: int) -> Iterator[None]:
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self._pages.setdefault(idx, [0.0, 0.0])
+            entry[0] += time.perf_counter() - w0
+            entry[1] += time.process_time() - c0
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def section(self, name: str, matched: bool) -> None:
+        self.sections["matched" if matched else "missed"].append(name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Picklable state, so page-range workers can report back to the parent."""
+        return {"stages": self._stages, "pages": self._pages,
+                "counters": self.counters, "sections": self.sections}
+
+    def merge(self, snap: Optional[Dict[str, Any]]) -> None:
+        if not snap:
+            return
+        for name, (wall, cpu, calls) in snap["stages"].items():
+            entry = self._stages.setdefault(name, [0.0, 0.0, 0])
+            entry[0] += wall
+            entry[1] += cpu
+            entry[2] += calls
+        for idx, (wall, cpu) in snap["pages"].items():
+            entry = self._pages.setdefault(idx, [0.0, 0.0])
+            entry[0] += wall
+            entry[1] += cpu
+        for name, n in snap["counters"].items():
+            self.count(name, n)
+        for kind in ("matched", "missed"):
+            self.sections[kind].extend(snap["sections"][kind])
+
+    def report(self, output_bytes: Optional[int] = None) -> Dict[str, Any]:
+        counts = dict(sorted(self.counters.items()))
+        counts["sections_matched"] = len(self.sections["matched"])
+        counts["sections_missed"] = len(self.sections["missed"])
+        if output_bytes is not None:
+            counts["output_bytes"] = output_bytes
+        return {
+            "wall_ms": _ms(time.perf_counter() - self._wall0),
+            "cpu_ms": _ms(time.process_time() - self._cpu0),
+            "stages": {name: {"wall_ms": _ms(w), "cpu_ms": _ms(c), "calls": n}
+                       for name, (w, c, n) in self._stages.items()},
+            "pages": [{"page": idx + 1, "wall_ms": _ms(w), "cpu_ms": _ms(c)}
+                      for idx, (w, c) in sorted(self._pages.items())],
+            "counts": counts,
+            "sections_missed": list(self.sections["missed"]),
+        }
+
+
+class _NullRecorder:
+    enabled = False
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def page(self, idx: int):
+        return nullcontext()
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def section(self, name: str, matched: bool) -> None:
+        pass
+
+    def snapshot(self) -> None:
+        return None
+
+    def merge(self, snap) -> None:
+        pass
+
+
+NULL_PERF = _NullRecorder()
+
+
+def attach_perf(result: Dict[str, Any], perf: PerfRecorder, dumps) -> Dict[str, Any]:
+    """
+    Copy of `result` with a `perf` report whose output_bytes is the size of
+    `result` as serialised by `dumps` (str or bytes), i.e. without the
+    report itself.
+    """
+    data = dumps(result)
+    size = len(data if isinstance(data, bytes) else data.encode("utf-8"))
+    return dict(result, perf=perf.report(output_bytes=size))
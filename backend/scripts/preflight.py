@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+PDF Preflight Probe
+Answers the cheap questions about an upload before any layout runs: page
+count, encryption, whether there is a text layer, schema version and
+document kind (PD, single CD or CD bundle).
+
+Only the document catalog, the page tree and each page's raw content
+streams (plus the form XObjects they draw) are read. Text is recovered from
+the string operands of the text-showing operators (Tj, TJ, ', "), with no
+character layout, so a probe takes milliseconds where pdfplumber's
+extract_text() takes tens of milliseconds per page.
+
+String bytes are read as latin-1. That is exact for simple fonts in a
+standard encoding (WinAnsi, MacRoman, Standard), which is all the schema
+and kind markers need. Composite (Type0) and Type3 fonts, a /ToUnicode map,
+a /Differences or other custom /Encoding, or an embedded font program with
+its own built-in encoding can map bytes to any glyph: such pages still
+count as having a text layer, but `schema` / `kind` are left as None so the
+caller falls back to its layout-based detection.
+"""
+
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFStream, resolve1
+from pdfminer.psparser import PSLiteral
+
+KINDS = ("pd", "cd", "cd_bundle", "unknown")
+
+# Same markers as pd_parser.detect_schema_version (first five pages).
+SCHEMA_PAGES = 5
+SCHEME_2026_RE = re.compile(r'(?i)2026\s*Scheme')
+UE26_RE = re.compile(r'UE26')
+
+# cd_parser.CD_START_RE without the start-of-line anchor: content streams
+# carry no line structure, so pieces are joined with single spaces.
+CD_MARKER_RE = re.compile(r'\b([A-Z0-9]{6,12})\s+Course\s+Document', re.IGNORECASE)
+PD_MARKER_RE = re.compile(
+    r'(?i)Program(?:me)?\s+(?:Educational\s+Objectives|Outcomes|Overview)'
+    r'|Title\s+of\s+the\s+Award')
+
+# Content-stream tokens: literal string (one level of nested parentheses),
+# hex string, array brackets, name, number, operator.
+_TOKEN_RE = re.compile(rb"""
+    \((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)
+  | <[0-9A-Fa-f\s]*>
+  | [\[\]]
+  | /[^\s/\[\]()<>{}%]*
+  | [+-]?(?:\d+\.?\d*|\.\d+)
+  | [A-Za-z'"*]+
+""", re.S | re.X)
+# Inline image data is binary and may contain anything; drop it first.
+_INLINE_IMAGE_RE = re.compile(rb"\bBI\b.*?\bID\s.*?\bEI\b", re.S)
+_ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|\r\n|[\s\S])")
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+            b"\r\n": b"", b"\n": b"", b"\r": b""}
+
+# Font encodings whose codes read correctly as latin-1 (for ASCII text).
+_STANDARD_ENCODINGS = frozenset({"StandardEncoding", "WinAnsiEncoding", "MacRomanEncoding"})
+_FONT_FILES = ("FontFile", "FontFile2", "FontFile3")
+
+# TJ offsets below this (thousandths of an em) read as a word gap.
+_TJ_SPACE = -200
+_MAX_FORM_DEPTH = 4
+
+
+def _unescape(m: "re.Match") -> bytes:
+    esc = m.group(1)
+    if esc[:1].isdigit():
+        return bytes((int(esc, 8) & 0xff,))
+    return _ESCAPES.get(esc, esc)
+
+
+def _string(token: bytes) -> str:
+    if token[:1] == b"(":
+        raw = _ESCAPE_RE.sub(_unescape, token[1:-1])
+    else:
+        digits = re.sub(rb"\s", b"", token[1:-1])
+        raw = bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+    return raw.decode("latin-1")
+
+
+def _is_string(token: bytes) -> bool:
+    return token[:1] == b"(" or token[:1] == b"<"
+
+
+def _show_operands(op: bytes, operands: List[bytes]) -> List[str]:
+    """Text pieces drawn by one text-showing operator."""
+    if op in (b"Tj", b"'", b'"'):
+        for token in reversed(operands):
+            if _is_string(token):
+                return [_string(token)]
+        return []
+    pieces = []
+    for token in operands:
+        if _is_string(token):
+            pieces.append(_string(token))
+        elif token[:1] not in (b"[", b"]", b"/"):
+            try:
+                if float(token) < _TJ_SPACE and pieces:
+                    pieces.append(" ")
+            except ValueError:
+                pass
+    return ["".join(pieces)]
+
+
+def scan_content(data: bytes) -> List[str]:
+    """Text pieces shown by a content stream, in drawing order."""
+    if b"BI" in data:
+        data = _INLINE_IMAGE_RE.sub(b" ", data)
+    pieces, operands = [], []
+    for token in _TOKEN_RE.findall(data):
+        head = token[:1]
+        if head.isalpha() or head in (b"'", b'"', b"*"):
+            if token in (b"Tj", b"TJ", b"'", b'"'):
+                pieces.extend(_show_operands(token, operands))
+            operands = []
+        else:
+            operands.append(token)
+    return pieces
+
+
+def _stream_data(obj) -> bytes:
+    obj = resolve1(obj)
+    if isinstance(obj, PDFStream):
+        return obj.get_data()
+    if isinstance(obj, list):
+        return b"\n".join(_stream_data(o) for o in obj)
+    return b""
+
+
+def _name(obj) -> str:
+    obj = resolve1(obj)
+    return obj.name if isinstance(obj, PSLiteral) else str(obj)
+
+
+def _decodable_font(font: Dict[str, Any]) -> bool:
+    """Whether latin-1 gives the text of the font's string bytes."""
+    if (_name(font.get("Subtype")) in ("Type0", "Type3")
+            or font.get("ToUnicode") is not None):
+        return False
+    encoding = resolve1(font.get("Encoding"))
+    if encoding is None:
+        # No /Encoding: an embedded font program uses its own built-in one.
+        descriptor = resolve1(font.get("FontDescriptor"))
+        return not (isinstance(descriptor, dict) and
+                    any(descriptor.get(k) is not None for k in _FONT_FILES))
+    return isinstance(encoding, PSLiteral) and encoding.name in _STANDARD_ENCODINGS
+
+
+def _undecodable_fonts(resources) -> bool:
+    fonts = resolve1((resolve1(resources) or {}).get("Font")) or {}
+    return any(not _decodable_font(resolve1(f))
+               for f in fonts.values() if isinstance(resolve1(f), dict))
+
+
+def _forms(resources, seen: set, depth: int = 1) -> Iterator[PDFStream]:
+    """The form XObjects in `resources`, each followed by the forms it draws."""
+    if depth > _MAX_FORM_DEPTH:
+        return
+    xobjects = resolve1((resolve1(resources) or {}).get("XObject")) or {}
+    for ref in xobjects.values():
+        xobj = resolve1(ref)
+        if (not isinstance(xobj, PDFStream) or id(xobj) in seen or
+                _name(xobj.get("Subtype")) != "Form"):
+            continue
+        seen.add(id(xobj))
+        yield xobj
+        yield from _forms(xobj.get("Resources"), seen, depth + 1)
+
+
+def page_text(page: PDFPage) -> Tuple[List[str], bool]:
+    """(text pieces, uses a font the pieces cannot be decoded for) for one page."""
+    resources = page.resources
+    pieces = scan_content(_stream_data(page.attrs.get("Contents")))
+    undecodable = _undecodable_fonts(resources)
+    for form in _forms(resources, set()):
+        undecodable = undecodable or _undecodable_fonts(form.get("Resources"))
+        pieces.extend(scan_content(form.get_data()))
+    return pieces, undecodable
+
+
+# Path construction operators counted as one pdfplumber object each.
+_PATH_OBJECTS = {b"re": "rects", b"l": "lines", b"c": "lines", b"v": "lines", b"y": "lines"}
+
+
+def count_objects(page: PDFPage) -> Dict[str, int]:
+    """
+    Rough counts of what pdfplumber's chars, rects and lines + curves would
+    hold for one page, from its content streams alone: string bytes (one per
+    glyph for simple fonts, two for most composite ones), `re` rectangles
+    and line / curve segments.
+    """
+    counts = {"chars": 0, "rects": 0, "lines": 0}
+    streams = [_stream_data(page.attrs.get("Contents"))]
+    for form in _forms(page.resources, set()):
+        try:
+            streams.append(form.get_data())
+        except Exception:
+            continue  # pdfplumber only decodes the forms a page draws
+    for data in streams:
+        if b"BI" in data:
+            data = _INLINE_IMAGE_RE.sub(b" ", data)
+        for token in _TOKEN_RE.findall(data):
+            if _is_string(token):
+                counts["chars"] += len(_string(token))
+            elif token in _PATH_OBJECTS:
+                counts[_PATH_OBJECTS[token]] += 1
+    return counts
+
+
+def _kind(spaced_pages: List[str]) -> Tuple[str, int]:
+    cd_pages = sum(1 for text in spaced_pages if CD_MARKER_RE.search(text))
+    if cd_pages > 1:
+        return "cd_bundle", cd_pages
+    if cd_pages == 1:
+        return "cd", cd_pages
+    if any(PD_MARKER_RE.search(text) for text in spaced_pages):
+        return "pd", 0
+    return "unknown", 0
+
+
+def page_count(file_path: str) -> int:
+    """
+    Pages in the PDF, from the page tree alone: no content stream is read.
+    0 when the file cannot be opened.
+    """
+    try:
+        with open(file_path, "rb") as fh:
+            return sum(1 for _ in PDFPage.create_pages(PDFDocument(PDFParser(fh))))
+    except Exception:
+        return 0
+
+
+def preflight(file_path: str) -> Dict[str, Any]:
+    """
+    {"pages", "encrypted", "has_text", "text_pages", "schema", "kind",
+     "cd_markers", "error", "elapsed_ms"} for one PDF. `error` is set only
+    when the document or its page tree cannot be read (not a PDF, needs a
+    password). `schema` / `kind` are None when the text could not be
+    decoded; when a page's streams cannot be read at all, `has_text` is
+    also assumed True, so the caller's layout path decides.
+    """
+    started = time.perf_counter()
+    report: Dict[str, Any] = {
+        "pages": 0, "encrypted": False, "has_text": False, "text_pages": 0,
+        "schema": None, "kind": None, "cd_markers": 0, "error": None,
+    }
+    try:
+        fh = open(file_path, "rb")
+    except OSError as e:
+        report["error"] = f"Cannot read PDF: {e}"
+        return _finish(report, started)
+    with fh:
+        try:
+            doc = PDFDocument(PDFParser(fh))
+            pages = list(PDFPage.create_pages(doc))
+        except PDFPasswordIncorrect:
+            report["encrypted"] = True
+            report["error"] = "PDF is password-protected."
+            return _finish(report, started)
+        except Exception as e:
+            report["error"] = f"Cannot read PDF: {e}"
+            return _finish(report, started)
+        report["encrypted"] = doc.encryption is not None
+        report["pages"] = len(pages)
+
+        tight, spaced, decodable = [], [], True
+        for page in pages:
+            try:
+                pieces, undecodable = page_text(page)
+            except Exception:
+                # A stream the probe cannot read (an unsupported filter, say)
+                # need not stop pdfplumber: leave every answer to the layout
+                # path rather than reject the upload.
+                report["has_text"] = True
+                return _finish(report, started)
+            text = "".join(pieces)
+            if text.strip():
+                report["text_pages"] += 1
+            decodable = decodable and not undecodable
+            tight.append(text)
+            spaced.append(" ".join(pieces))
+
+    report["has_text"] = report["text_pages"] > 0
+    if report["has_text"] and decodable:
+        head = "".join(tight[:SCHEMA_PAGES])
+        report["schema"] = ("2026" if SCHEME_2026_RE.search(head) or UE26_RE.search(head)
+                            else "2024")
+        report["kind"], report["cd_markers"] = _kind(spaced)
+    return _finish(report, started)
+
+
+def _finish(report: Dict[str, Any], started: float) -> Dict[str, Any]:
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "Usage: preflight.py FILE [FILE ...]"}))
+        sys.exit(1)
+    reports = {path: preflight(path) for path in sys.argv[1:]}
+    out: Optional[Dict[str, Any]] = reports[sys.argv[1]] if len(reports) == 1 else reports
+    print(json.dumps(out, indent=2))
@@ -0,0 +1,171 @@
+"""
+Content-Addressed Parse Result Cache
+Stores finished parser results on disk keyed by the PDF's SHA-256, the
+requested schema and a fingerprint of the parser source, so re-uploading an
+unchanged file returns the stored JSON without opening the PDF.
+
+The same store backs the per-page artifact cache (see page_cache.py),
+configured under the PDMS_PAGE_CACHE prefix instead.
+
+Environment (PREFIX = PDMS_PARSE_CACHE or PDMS_PAGE_CACHE):
+    PREFIX            "0" disables the cache
+    PREFIX_DIR        cache directory (default: <tmp>/pdms-parse-cache or
+                      <tmp>/pdms-page-cache)
+    PREFIX_MAX_MB     total size budget before LRU eviction (default 256)
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_CHUNK = 1 << 20
+
+
+def file_sha256(file_path: str) -> str:
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def local_sources(entry_file: str) -> List[str]:
+    """
+    `entry_file` and every module next to it that it imports, directly or
+    through another local module, at any level of the code: the parsers
+    import each other as top-level modules from this one directory.
+    """
+    entry = Path(entry_file).resolve()
+    found = {entry}
+    pending = [entry]
+    while pending:
+        tree = ast.parse(pending.pop().read_bytes())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                path = entry.with_name(name.split(".")[0] + ".py")
+                if path not in found and path.is_file():
+                    found.add(path)
+                    pending.append(path)
+    return [str(entry)] + sorted(str(p) for p in found - {entry})
+
+
+def parser_fingerprint(source_files: Iterable[str]) -> str:
+    """
+    Hash of the parser source files plus the pdfplumber version, so any code
+    or dependency change invalidates previously cached results.
+    """
+    h = hashlib.sha256()
+    for path in source_files:
+        try:
+            h.update(Path(path).read_bytes())
+        except OSError:
+            h.update(path.encode("utf-8"))
+    try:
+        import pdfplumber
+        h.update(str(getattr(pdfplumber, "__version__", "")).encode("utf-8"))
+    except ImportError:
+        pass
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """Flat directory of <key>.json files; mtime doubles as the LRU clock."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls, prefix: str = "PDMS_PARSE_CACHE",
+                 default_dirname: str = "pdms-parse-cache") -> Optional["ResultCache"]:
+        if os.environ.get(prefix, "1") == "0":
+            return None
+        cache_dir = os.environ.get(f"{prefix}_DIR") or os.path.join(
+            tempfile.gettempdir(), default_dirname)
+        try:
+            max_mb = float(os.environ.get(f"{prefix}_MAX_MB", "256"))
+        except ValueError:
+            max_mb = 256
+        return cls(cache_dir, int(max_mb * 1024 * 1024))
+
+    def key(self, file_path: str, schema: str, fingerprint: str) -> Optional[str]:
+        try:
+            digest = file_sha256(file_path)
+        except OSError:
+            return None
+        return hashlib.sha256(
+            f"{digest}:{schema}:{fingerprint}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not key:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # mark as recently used
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: Optional[str], result: Dict[str, Any], evict: bool = True) -> None:
+        """Atomic write; pass evict=False when storing many entries and call evict() once."""
+        if not key:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(result, f, ensure_ascii=False)
+                os.replace(tmp, self._path(key))  # atomic on POSIX
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            if evict:
+                self.evict()
+        except OSError:
+            # A cache that cannot be written must never fail the parse.
+            pass
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        try:
+            scan = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in scan:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,403 @@
+"""
+Synthetic PD / CD PDF Generator
+Writes deterministic Program Documents (2024 and 2026 schemas) and multi-CD
+bundles of a requested size for bench_parsers.py, using nothing but the
+standard library: one Helvetica font, text runs and stroked ruling lines,
+which is all pdfplumber needs to find words and lines-strategy tables.
+
+Knobs shared by every generator:
+    pages          target page count (10 … 1000)
+    table_density  fraction (0 … 1) of filler pages that carry a ruled table
+    wrapped        fraction (0 … 1) of table rows whose text cell wraps
+                   onto a second line
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+FONT_SIZE = 9
+ROW_HEIGHT = 16
+LINE_HEIGHT = 11
+
+Page = Dict[str, List[Tuple]]
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+
+
+# ─────────────────────────────────────────────
+# PDF WRITER
+# ─────────────────────────────────────────────
+
+def _escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# ROT13 over ASCII letters: with `differences` the bytes in the content
+# stream are rotated and the font's /Differences maps them back, the way a
+# subsetting producer reorders codes. Only a reader that honours the
+# encoding recovers the text. The same encoding gives the ligature glyphs
+# U+FB01 / U+FB02 codes 1 and 2, which WinAnsi has no room for.
+_ROT13 = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz\ufb01\ufb02",
+    "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm\x01\x02")
+_ROT13_DIFFERENCES = (
+    "[1 /fi /fl 65 " + " ".join("/" + chr(c).translate(_ROT13) for c in range(65, 91))
+    + " 97 " + " ".join("/" + chr(c).translate(_ROT13) for c in range(97, 123)) + "]")
+
+
+def write_pdf(path: str, pages: Sequence[Page],
+              width: int = PAGE_WIDTH, height: int = PAGE_HEIGHT,
+              differences: bool = False) -> None:
+    """
+    pages: [{"text": [(x, y, str)], "lines": [(x0, y0, x1, y1)]}], with y
+    measured from the top of the page as pdfplumber reports it. Optional page
+    keys: "rects" [(x0, top, x1, bottom)] stroked rectangles, "vertical"
+    [(x, y, str)] runs drawn turned 90° (bottom to top), "rotate", the
+    page's /Rotate, and "broken_form", an unused form XObject whose stream
+    has a filter pdfminer cannot decode. `differences` writes the font with a
+    /Differences encoding (see _ROT13).
+    """
+    objs: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objs.append(body)
+        return len(objs)
+
+    encoding = (f"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding "
+                f"/Differences {_ROT13_DIFFERENCES} >>" if differences else "/WinAnsiEncoding")
+    font_id = add(f"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+                  f"/Encoding {encoding} >>".encode())
+    pages_id = add(b"")  # filled in once the kids are known
+    page_ids = []
+    for page in pages:
+        ops = [f"{x0} {height - y0} m {x1} {height - y1} l S"
+               for x0, y0, x1, y1 in page.get("lines", [])]
+        ops += [f"{x0} {height - y1} {x1 - x0} {y1 - y0} re S"
+                for x0, y0, x1, y1 in page.get("rects", [])]
+        show = (lambda s: _escape(s.translate(_ROT13))) if differences else _escape
+        ops += [f"BT /F1 {FONT_SIZE} Tf {x} {height - y} Td ({show(s)}) Tj ET"
+                for x, y, s in page.get("text", [])]
+        ops += [f"BT /F1 {FONT_SIZE} Tf 0 1 -1 0 {x} {height - y} Tm ({show(s)}) Tj ET"
+                for x, y, s in page.get("vertical", [])]
+        data = "\n".join(ops).encode("cp1252", "replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        xobjects = ""
+        if page.get("broken_form"):
+            form_id = add(b"<< /Type /XObject /Subtype /Form /BBox [0 0 10 10] "
+                          b"/Filter /BogusDecode /Length 4 >>\nstream\nxxxx\nendstream")
+            xobjects = f" /XObject << /Fm0 {form_id} 0 R >>"
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Rotate {page.get('rotate', 0)} /Contents {content_id} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >>{xobjects} >> >>"
+            .encode()))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objs[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    catalog_id = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objs) + 1} /Root {catalog_id} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def ruled_table(x: float, y: float, col_widths: Sequence[float],
+                rows: Sequence[Sequence[str]], row_height: float = ROW_HEIGHT
+                ) -> Tuple[List[Tuple], List[Tuple]]:
+    """Text runs + ruling lines for a fully ruled grid. A "\\n" in a cell wraps it."""
+    text, lines = [], []
+    heights = [row_height * max(1, max(str(c).count("\n") + 1 for c in row))
+               for row in rows]
+    total_w = sum(col_widths)
+    top = y
+    for row, h in zip(rows, heights):
+        cx = x
+        for cell, w in zip(row, col_widths):
+            for j, part in enumerate(str(cell).split("\n") if cell else []):
+                text.append((cx + 2, top + 11 + j * LINE_HEIGHT, part))
+            cx += w
+        lines.append((x, top, x + total_w, top))
+        top += h
+    lines.append((x, top, x + total_w, top))
+    cx = x
+    for w in list(col_widths) + [0]:
+        lines.append((cx, y, cx, top))
+        cx += w
+    return text, lines
+
+
+def _every(fraction: float, i: int) -> bool:
+    """Deterministic spread: True for round(fraction * n) of the first n indices."""
+    fraction = min(1.0, max(0.0, fraction))
+    return int((i + 1) * fraction) > int(i * fraction)
+
+
+def _text_page(lines: Sequence[str], top: int = 40, step: int = 15) -> Page:
+    return {"text": [(40, top + step * j, s) for j, s in enumerate(lines)], "lines": []}
+
+
+def _narrative_page(n: int, heading: str) -> Page:
+    # Real narrative pages name semesters and electives in passing, and carry
+    # a ruled header band, so keyword and ruling checks alone cannot skip them.
+    body = [f"{heading} {n}: paragraph {k} describing curriculum delivery in "
+            f"Semester-{(n + k) % 8 + 1} and professional / open elective options."
+            for k in range(1, 40)]
+    page = _text_page(body)
+    page["lines"] = [(36, 28, 560, 28), (36, 28, 36, 34), (560, 28, 560, 34)]
+    return page
+
+
+# ─────────────────────────────────────────────
+# PD 2024 (flat schema, semester tables)
+# ─────────────────────────────────────────────
+
+_PD2024_HEADER = [
+    "Faculty Engineering and Technology", "School School of Computing",
+    "Department Computer Science", "Director of School Dr. A B",
+    "Head of Department Dr. C D",
+    "1. Title of the Award B.Tech in Computer Science", "2. Modes of Study Full Time",
+    "14. Program Overview", "The program builds a broad foundation in computing.",
+    "Program Educational Objectives", "PEO-1: Professional practice",
+    "Graduates practise engineering responsibly.", "PEO-2: Lifelong learning",
+    "Graduates pursue research and higher studies.",
+    "Program Outcomes", "PO-1: Knowledge: apply engineering knowledge.",
+    "PO-2: Analysis: analyse complex problems.",
+    "Program Specific Outcomes", "PSO-1: Design", "Design software systems.",
+    "Definition of Credit", "1 Hr. Lecture per week 1 Credit",
+    "1 Hr. Tutorial per week 1 Credit", "2 Hr. Practical per week 1 Credit",
+    "Sl. No. Program -Category Credits", "1. Basic Sciences 20 (BS)",
+    "2. Engineering Sciences 30 (ES)", "Total 160",
+]
+_COURSE_COLS = [30, 100, 250, 60]
+
+
+def _pd2024_course_table(sem: int, first: int, count: int, wrapped: float,
+                         prefix: str = "Course") -> Tuple[List[Tuple], List[Tuple]]:
+    rows = [["Sl", "Course Code", "Course Title", "Credits"]]
+    for k in range(first, first + count):
+        title = f"{prefix} {sem}-{k} title"
+        if _every(wrapped, k):
+            title += "\nwith a continuation line"
+        rows.append([str(k), f"UE24CS{sem}{k:03d}", title, str(3 + k % 2)])
+    return ruled_table(40, 120, _COURSE_COLS, rows)
+
+
+def pd2024_pages(pages: int = 20, table_density: float = 0.5,
+                 wrapped: float = 0.0, courses: int = 6) -> List[Page]:
+    """Header page, one table page per semester, two elective pages, then filler."""
+    out = [_text_page(_PD2024_HEADER)]
+    nsem = min(8, max(1, pages - 3))
+    for s in range(1, nsem + 1):
+        t, l = _pd2024_course_table(s, 1, courses, wrapped)
+        out.append({"text": [(40, 60, f"Semester-{s}"),
+                             (40, 80, "Courses offered in this semester")] + t, "lines": l})
+    for s in (5, 6):
+        t, l = _pd2024_course_table(s, 501, 4, wrapped, prefix="Elective")
+        out.append({"text": [(40, 60, f"Professional Elective courses for {s}th Semester")] + t,
+                    "lines": l})
+
+    # Filler: continuation tables for the semesters, or narrative pages.
+    i = 0
+    while len(out) < pages:
+        if _every(table_density, i):
+            s = i % nsem + 1
+            t, l = _pd2024_course_table(s, 100 + (i // nsem) * 30 % 800, 30, wrapped)
+            out.append({"text": [(40, 60, f"Semester-{s} (continued)")] + t, "lines": l})
+        else:
+            out.append(_narrative_page(i, "Note"))
+        i += 1
+    return out
+
+
+def pd2024(path: str, pages: int = 20, table_density: float = 0.5,
+           wrapped: float = 0.0) -> None:
+    write_pdf(path, pd2024_pages(pages, table_density, wrapped))
+
+
+# ─────────────────────────────────────────────
+# PD 2026 (merged categories, text-driven)
+# ─────────────────────────────────────────────
+
+_PD2026_LINES_PER_PAGE = 50
+
+
+def _pd2026_semester(s: int, courses: int, wrapped: float) -> List[str]:
+    lines = [f"Semester {ROMAN[s - 1]}", "S. No. Course Code Course Title Credits", "Academic"]
+    for k in range(1, courses + 1):
+        title = ("Programming Lab" if k == 3 else "Mini Project" if k == 4
+                 else f"Subject {s} {k} Fundamentals")
+        if _every(wrapped, k) and k > 4:
+            lines.append(f"{k} UE26CS{s}{k:02d} {title}")
+            lines.append(f"and Applications {3 + k % 2}")
+        else:
+            lines.append(f"{k} UE26CS{s}{k:02d} {title} {3 + k % 2}")
+    lines += ["Competency and Skills", f"{courses + 1} UE26CS{s}90 2",
+              "(Competitive Learning)", "Professional Elective-1",
+              f"UE26CS{s}71 Machine Learning Basics", f"UE26CS{s}72 Cloud Computing",
+              f"{courses + 2} UE26CS{s}73 Data Mining 3", "Total 22", "Page | 3"]
+    return lines
+
+
+def pd2026_lines(pages: int = 10, wrapped: float = 0.0) -> List[str]:
+    budget = pages * _PD2026_LINES_PER_PAGE
+    head = [
+        "Faculty Faculty of Engineering and Technology", "School School of Computing",
+        "Department Computer Science and Engineering", "Program B.Tech",
+        "Director of the School Dr. Ravi Kumar", "Head of the", "Department Dr. Meena Rao",
+        "9 Title of the Award B.Tech in Computer Science and Engineering", "2026 Scheme",
+        "10 Program Overview", "The program offers a broad foundation in computing.",
+        "11 Program Educational Objectives", "The Program Educational Objectives include:",
+        "PEO-1: Graduates will excel in professional careers.",
+        "PEO-2: Graduates will pursue lifelong learning and research.",
+        "12 Program Outcomes", "PO-1: Engineering knowledge applied to solve problems.",
+        "PO-2: Problem analysis of complex problems.",
+        "13 Program Specific Outcomes", "PSO-1: Design software systems effectively.",
+        "Lecture (L) per week 1 Credit", "Tutorial (T) per week 1 Credit",
+        "Practical (P) per week 1 Credit", "Program - Category Credits",
+        "1 Academic Core 60 (AC)", "2 Professional Electives 12 (PE)", "Total 130",
+        "14 Courses and Credits",
+    ]
+    tail = [
+        "15 Technical Competency Courses", "S.No Course code",
+        "1 CS26TSCS01 Cloud Practitioner 2 AWS", "CS26TSCS02 Data Analyst Google", "2 2",
+        "16 Program Delivery and Attainment", "Delivered via lectures and labs.",
+        "17 Teaching and Learning Methods", "1. Lectures with slides", "2. Laboratory sessions",
+        "18 Attendance", "Minimum 75% attendance is required.",
+        "19 Assessment and Grading", "1. Continuous evaluation is done.",
+        "Assessment Component Weightage", "Quiz : 10% of marks 15%", "Test : 20% of marks 25%",
+        "Based on total marks scored grades are assigned.", "A minimum of overall 40% is needed.",
+        "20 Award of Degree", "Degree is awarded on completion.",
+        "21 Student Support for Learning", "1. Mentoring by faculty", "2. Library access",
+        "22 Quality Control Measures", "1. Course audits", "2. Feedback",
+    ]
+    # Grow the semester blocks first (up to 90 courses each), then pad the
+    # delivery section with narrative so the page count is met.
+    fixed = len(head) + len(tail) + 8 * 12
+    courses = max(8, min(90, (budget - fixed) // 8))
+    body = [line for s in range(1, 9) for line in _pd2026_semester(s, courses, wrapped)]
+    lines = head + body + tail
+    pad = budget - len(lines)
+    if pad > 0:
+        at = lines.index("17 Teaching and Learning Methods")
+        lines[at:at] = [f"Delivery note {k}: courses are reviewed every semester."
+                        for k in range(pad)]
+    return lines
+
+
+def pd2026_pages(pages: int = 10, table_density: float = 0.0,
+                 wrapped: float = 0.0) -> List[Page]:
+    """Text lines paginated 50 per page; dense pages get a ruled grid behind the text."""
+    lines = pd2026_lines(pages, wrapped)
+    out = []
+    for n, i in enumerate(range(0, len(lines), _PD2026_LINES_PER_PAGE)):
+        page = _text_page(lines[i:i + _PD2026_LINES_PER_PAGE])
+        if _every(table_density, n):
+            rows = len(page["text"])
+            page["lines"] = [(36, 28 + 15 * r, 560, 28 + 15 * r) for r in range(rows + 1)]
+            page["lines"] += [(x, 28, x, 28 + 15 * rows) for x in (36, 60, 130, 500, 560)]
+        out.append(page)
+    return out
+
+
+def pd2026(path: str, pages: int = 10, table_density: float = 0.0,
+           wrapped: float = 0.0) -> None:
+    write_pdf(path, pd2026_pages(pages, table_density, wrapped))
+
+
+# ─────────────────────────────────────────────
+# CD BUNDLE (one or more Course Documents)
+# ─────────────────────────────────────────────
+
+def _cd_pages(c: int, extra_pages: int, students: int, wrapped: float,
+              table_density: float) -> List[Page]:
+    code = f"UE24CS{c + 2:02d}01"
+    meta = [["Course Code", code], ["Course Title", f"Course Title {c}"],
+            ["Program Code", "UE24"], ["Program Title", "B.Tech CSE"],
+            ["School Code", "SOC"], ["Department", "CSE"],
+            ["Faculty Member", "Dr X"], ["Semester Duration", "16 weeks"]]
+    t1, l1 = ruled_table(40, 100, [150, 300], meta)
+    t2, l2 = ruled_table(40, 250, [50, 50, 50, 80, 100],
+                         [["L", "T", "P", "Credits", "Total Hours"], ["3", "0", "1", "4", "52"]])
+    om = [["COs", "PO", "PO", "PO", "PSO", "PSO"],
+          ["CO1", "3", "2", "", "1", ""], ["CO2", "", "3", "1", "", "2"]]
+    t3, l3 = ruled_table(40, 420, [50, 40, 40, 40, 40, 40], om)
+    text = [(40, 60, f"{code} Course Document"),
+            (40, 300, "2.1 Course Aims and Summary"), (40, 315, "• Aim one of the course • Aim two"),
+            (40, 330, "2.2 Course Objectives"), (40, 345, "• Objective one"),
+            (40, 360, "2.3 Course Outcomes"), (40, 375, "CO1 Understand things"),
+            (40, 390, "CO2 Apply things"), (40, 405, "Outcome Map")]
+    pages = [{"text": text + t1 + t2 + t3, "lines": l1 + l2 + l3}]
+
+    for e in range(extra_pages):
+        page = _text_page(["2.4 Course Content", "• Unit 1 topics • Unit 2 topics",
+                           "2.5 Course Resources", "Text Books: 1. Some book by author",
+                           "References: 1. Another reference book",
+                           "Other Resources: 1. Online material link"], top=60)
+        if _every(table_density, e):
+            rows = [["Unit", "Topic", "Hours"]] + [
+                [str(u), f"Unit {u} topic" + ("\nand its lab" if _every(wrapped, u) else ""), "8"]
+                for u in range(1, 6)]
+            t, l = ruled_table(40, 200, [60, 300, 60], rows)
+            page["text"] += t
+            page["lines"] += l
+        pages.append(page)
+
+    aw = [["CO", "Quiz", "Test", "Assignment", "SEE", "Total"]] + [
+        [f"CO{i}", "3", "4", "3", "7", "17"] for i in range(1, 7)]
+    t4, l4 = ruled_table(40, 100, [50, 50, 50, 80, 50, 50], aw)
+    te = [["Lecture Number", "Topic", "Slides", "Videos"]] + [
+        [str(i), f"Topic {i}" + ("\ncontinued" if _every(wrapped, i) else ""),
+         f"s{i}.ppt", f"v{i}"] for i in range(1, 11)]
+    t5, l5 = ruled_table(40, 250, [80, 200, 80, 80], te)
+    pages.append({"text": [(40, 60, "3. Teaching and Assessment"),
+                           (40, 80, "3.2 Assessment Weight")] + t4 + t5, "lines": l4 + l5})
+
+    rm = [["S. No.", "USN", "Student Name", "Quiz", "Test", "Assignment", "SEE",
+           "Marks Scored", "Grade obtained"]]
+    rm += [[str(i), f"1GM{i:03d}", f"Student {i}", "10", "20", "15", "30", "75", "A"]
+           for i in range(1, students + 1)]
+    rm += [["Total", "", "", "", "", "", "", "600", ""]]
+    t6, l6 = ruled_table(30, 80, [30, 50, 80, 40, 40, 60, 40, 60, 60], rm, row_height=14)
+    at = [["Attainment of Course Outcomes-COs", ""],
+          ["Outcomes- Targeted", "Targeted Attainment Level"],
+          ["70% of students will score C grade", "1"]]
+    t7, l7 = ruled_table(40, 100 + 14 * (students + 3), [300, 150], at)
+    pages.append({"text": [(40, 60, "3.4 Grading Criterion"), (40, 70, "Relative grading")]
+                  + t6 + t7
+                  + [(40, 780, "4.1 Assignment Details or Problem Based Learning: do work"),
+                     (40, 795, "4.2 Academic Integrity Policy: be honest")],
+                  "lines": l6 + l7})
+    return pages
+
+
+def cd_bundle_pages(pages: int = 12, table_density: float = 0.5,
+                    wrapped: float = 0.0, extra_pages: int = 1,
+                    students: int = 8) -> List[Page]:
+    """As many whole CDs as fit in `pages` (at least one), each 3 + extra_pages long."""
+    per_cd = 3 + extra_pages
+    ncd = max(1, pages // per_cd)
+    out: List[Page] = []
+    for c in range(ncd):
+        out += _cd_pages(c, extra_pages, students, wrapped, table_density)
+    return out
+
+
+def cd_bundle(path: str, pages: int = 12, table_density: float = 0.5,
+              wrapped: float = 0.0, extra_pages: int = 1, students: int = 8) -> None:
+    write_pdf(path, cd_bundle_pages(pages, table_density, wrapped, extra_pages, students))
+
+
+GENERATORS: Dict[str, Any] = {
+    "pd2024": pd2024,
+    "pd2026": pd2026,
+    "cd": cd_bundle,
+}
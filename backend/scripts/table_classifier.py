@@ -0,0 +1,167 @@
+"""
+CD Table Classifier
+Labels a table extracted from a course document (metadata, credits, outcome
+map, assessment weights, teaching schedule, recording marks, attainment
+targets) with one normalisation pass and one keyword scan per text, and
+says how sure it is.
+
+Each table is normalised once (its cell_matrix.CellMatrix, which the
+parser's table consumers read too). One compiled pattern then finds every
+keyword of every rule in the normalised text in a single finditer pass,
+and the rules below read that keyword set instead of re-scanning the text
+rule by rule.
+
+The pattern is the keyword trie as one regex inside a lookahead, so it is
+tried at every position and overlapping keywords are all seen. At each
+position it matches the longest keyword; the shorter keywords that one
+contains are added from a table built with the scanner.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from cell_matrix import CellMatrix
+
+# Searched in every cell of the table.
+BODY_KEYWORDS = {
+    "recording_marks": ("s. no", "s.no", "usn", "student name",
+                        "marks scored", "grade obtained", "marks\nscored"),
+    "attainment_targets": ("attainment of course outcomes", "outcomes- targeted",
+                           "targeted attainment level",
+                           "attainment", "outcomes", "targeted"),
+}
+
+# Searched in the header row only.
+HEADER_KEYWORDS = {
+    "metadata": ("course code", "program title", "school code"),
+    "credits": ("credits",),
+    "outcome": ("outcome map",),
+    "assessment": ("quiz", "test", "see", "weight", "outcome"),
+    "teaching": ("lecture", "topic", "number"),
+}
+
+_CO_HEADER_RE = re.compile(r'\bco[s]?\s')
+_PO_HEADER_RE = re.compile(r'\bpo\b|\bpo\d')
+
+
+def _trie_pattern(node: Dict[str, Any]) -> str:
+    """Regex for a keyword trie; "" marks the end of a keyword."""
+    branches = [re.escape(ch) + _trie_pattern(child)
+                for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    alt = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Greedy: the longest keyword through this node wins, shorter ones are implied.
+    return f"(?:{alt})?" if "" in node else alt
+
+
+class KeywordScanner:
+    """Set of the given keywords that occur anywhere in a text, in one pass."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        trie: Dict[str, Any] = {}
+        for keyword in self.keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._pattern = re.compile(f"(?=({_trie_pattern(trie)}))")
+        self._contained = {k: frozenset(j for j in self.keywords if j in k)
+                           for k in self.keywords}
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        contained = self._contained
+        return frozenset(k for found in set(self._pattern.findall(text))
+                         for k in contained[found])
+
+
+_BODY_SCANNER = KeywordScanner(k for ks in BODY_KEYWORDS.values() for k in ks)
+_HEADER_SCANNER = KeywordScanner(k for ks in HEADER_KEYWORDS.values() for k in ks)
+
+
+def normalise_table(table: CellMatrix) -> Tuple[str, List[str], str]:
+    """
+    (all cells text, header cells, header text), lowercased and stripped.
+    The body is lowercased once after joining; that only differs from
+    per-cell lowering in Greek final-sigma context, which no keyword uses.
+    """
+    header_cells = [c.lower() for c in table.stripped[0] if c is not None]
+    all_cells = " ".join(
+        c for row in table.stripped for c in row if c is not None
+    ).lower()
+    return all_cells, header_cells, " ".join(header_cells)
+
+
+def _recording_marks(body, header, header_cells, header_text):
+    return any(k in body for k in BODY_KEYWORDS["recording_marks"])
+
+
+def _attainment_targets(body, header, header_cells, header_text):
+    return ("attainment of course outcomes" in body or
+            "outcomes- targeted" in body or
+            "targeted attainment level" in body or
+            {"attainment", "outcomes", "targeted"} <= body)
+
+
+def _metadata(body, header, header_cells, header_text):
+    return any(k in header for k in HEADER_KEYWORDS["metadata"])
+
+
+def _credits(body, header, header_cells, header_text):
+    return ("credits" in header and
+            any(h in header_cells for h in ("l", "t", "p")))
+
+
+def _outcome(body, header, header_cells, header_text):
+    return bool((_CO_HEADER_RE.search(header_text) and
+                 _PO_HEADER_RE.search(header_text)) or
+                "outcome map" in header)
+
+
+def _assessment(body, header, header_cells, header_text):
+    return (("quiz" in header and ("test" in header or "see" in header)) or
+            ("weight" in header and "outcome" in header) or
+            ("co" in header_cells and "quiz" in header))
+
+
+def _teaching(body, header, header_cells, header_text):
+    return ("lecture" in header and
+            ("topic" in header or "number" in header))
+
+
+# Checked in this order; the first rule that fires wins. The order is the
+# tie-break: a recording-marks sheet also carries the assessment header
+# vocabulary (quiz / test / SEE columns), an attainment sheet mentions
+# outcomes. Every rule is evaluated, so the confidence can say when the
+# tie-break was needed.
+RULES = (
+    ("recording_marks", _recording_marks),
+    ("attainment_targets", _attainment_targets),
+    ("metadata", _metadata),
+    ("credits", _credits),
+    ("outcome", _outcome),
+    ("assessment", _assessment),
+    ("teaching", _teaching),
+)
+
+
+def classify_table(table) -> Tuple[Optional[str], float]:
+    """
+    (label, confidence) for one extracted table (rows or a CellMatrix).
+    The label is None when no rule fires, i.e. the table continues whatever
+    section came before it; its confidence is then 0.0. Otherwise the
+    confidence is 1.0 when only the winning rule fires and 1/n when n rules
+    fire and the rule order picked the label, so it compares across labels.
+    """
+    table = CellMatrix.of(table)
+    if not table.rows or not table.rows[0]:
+        return None, 0.0
+    all_cells, header_cells, header_text = normalise_table(table)
+    body = _BODY_SCANNER.scan(all_cells)
+    header = _HEADER_SCANNER.scan(header_text)
+    fired = [label for label, rule in RULES
+             if rule(body, header, header_cells, header_text)]
+    if not fired:
+        return None, 0.0
+    return fired[0], 1 / len(fired)
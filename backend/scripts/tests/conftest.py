@@ -0,0 +1,68 @@
+"""
+Shared fixtures for the parser tests: the scripts directory on sys.path (the
+parsers import each other as top-level modules), the on-disk result and
+page caches switched off, a recorder for the page caches pd_parser opens,
+and small PDFs from synthetic_pdfs.
+
+Run from backend/scripts:  python3 -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import pd_parser  # noqa: E402
+import synthetic_pdfs  # noqa: E402
+from page_cache import PageArtifactCache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_disk_caches(monkeypatch):
+    # Inherited by parser subprocesses too.
+    monkeypatch.setenv("PDMS_PARSE_CACHE", "0")
+    monkeypatch.setenv("PDMS_PAGE_CACHE", "0")
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    """Every PageArtifactCache pd_parser opens during the test."""
+    opened = []
+
+    class RecordingCache(PageArtifactCache):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(pd_parser, "PageArtifactCache", RecordingCache)
+    return opened
+
+
+@pytest.fixture(scope="session")
+def pdf_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("pdfs")
+
+
+@pytest.fixture(scope="session")
+def pd2024_pdf(pdf_dir):
+    path = str(pdf_dir / "pd2024.pdf")
+    synthetic_pdfs.pd2024(path, pages=20)
+    return path
+
+
+@pytest.fixture(scope="session")
+def pd2026_pdf(pdf_dir):
+    path = str(pdf_dir / "pd2026.pdf")
+    synthetic_pdfs.pd2026(path, pages=10)
+    return path
+
+
+@pytest.fixture(scope="session")
+def cd_bundle_pdf(pdf_dir):
+    path = str(pdf_dir / "cd_bundle.pdf")
+    synthetic_pdfs.cd_bundle(path, pages=12, wrapped=0.3)
+    return path
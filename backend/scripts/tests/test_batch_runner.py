@@ -0,0 +1,68 @@
+import json
+
+import pdfplumber
+import pytest
+
+import batch_runner
+import pd_parser
+from preflight import page_count
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Runs batch_runner._run_job in-process with a stub parser."""
+    monkeypatch.setattr(batch_runner, "_worker_job_fn", lambda job: {"success": True})
+    monkeypatch.setattr(batch_runner, "_worker_timeout", 0)
+
+
+def test_page_count_matches_pdfplumber(pd2024_pdf, pd2026_pdf, cd_bundle_pdf):
+    for path in (pd2024_pdf, pd2026_pdf, cd_bundle_pdf):
+        with pdfplumber.open(path) as pdf:
+            assert page_count(path) == len(pdf.pages)
+
+
+def test_record_pages_without_reopening_the_pdf(cd_bundle_pdf, worker, monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("pdfplumber.open called")
+    monkeypatch.setattr(pdfplumber, "open", refuse)
+
+    record = batch_runner._run_job({"id": 0, "file": cd_bundle_pdf})
+    assert (record["pages"], record["result"]) == (12, {"success": True})
+
+
+def test_unreadable_file_counts_no_pages(tmp_path, worker):
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(b"not a pdf")
+    assert batch_runner._run_job({"id": 0, "file": str(path)})["pages"] == 0
+
+
+def test_batch_summary_counts_pages(tmp_path, pd2024_pdf, pd2026_pdf, capsys):
+    manifest = tmp_path / "jobs.txt"
+    manifest.write_text(f"{pd2024_pdf}\n# comment\n{pd2026_pdf}\n")
+
+    assert batch_runner.run_batch(pd_parser.run_job, [str(manifest), "--workers", "1",
+                                                      "--no-cache"]) == 0
+    *records, summary = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(r["pages"] for r in records) == [10, 20]
+    assert summary["pages"] == 30 and summary["failed"] == 0
+
+
+def test_invalid_manifest_lines_fail_alone(tmp_path, pd2026_pdf, capsys):
+    manifest = tmp_path / "jobs.txt"
+    manifest.write_text("\n".join([
+        json.dumps({"file": pd2026_pdf, "id": "ok"}),
+        '{"schema": "2026"}',
+        '{"file": "broken.pdf"',
+        '{"file": 3}',
+    ]) + "\n")
+
+    assert batch_runner.run_batch(pd_parser.run_job, [str(manifest), "--workers", "1",
+                                                      "--no-cache"]) == 1
+    *records, summary = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    errors = {r["id"]: r["result"]["error"] for r in records if not r["result"]["success"]}
+    assert [r["id"] for r in records if r["result"]["success"]] == ["ok"]
+    assert sorted(errors) == [1, 2, 3]
+    assert errors[1] == 'jobs.txt line 2: invalid job: no "file" or "path"'
+    assert errors[2].startswith("jobs.txt line 3: invalid job: ")
+    assert errors[3] == 'jobs.txt line 4: invalid job: no "file" or "path"'
+    assert (summary["files"], summary["failed"], summary["pages"]) == (4, 3, 10)
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+import cd_parser
+from cd_parser import HTML_FIELDS, html_fields, render_cd_html
+
+
+@pytest.fixture(scope="module")
+def outputs(cd_bundle_pdf):
+    return {output: cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False, output=output)
+            for output in ("structured", "html", "both")}
+
+
+def test_structured_output_has_no_html(outputs):
+    for cd in outputs["structured"]["parsedData"]:
+        assert not [k for k in cd if k.endswith("Html")]
+        assert set(cd["attainmentCalculations"]) == {"recordingMarksRows",
+                                                     "settingTargetsRows"}
+
+
+def test_rendering_structured_output_matches_both(outputs):
+    # Through JSON, as a stored structured record would come back.
+    structured = json.loads(json.dumps(outputs["structured"]["parsedData"]))
+    rendered = [render_cd_html(cd) for cd in structured]
+
+    assert json.dumps(rendered) == json.dumps(outputs["both"]["parsedData"])
+    assert [html_fields(cd) for cd in rendered] == outputs["html"]["parsedData"]
+
+
+def test_html_output_is_identity_plus_html_fields(outputs):
+    for cd in outputs["html"]["parsedData"]:
+        assert list(cd) == ["courseCode", "courseTitle", *HTML_FIELDS]
+        assert all(cd[k] for k in HTML_FIELDS)
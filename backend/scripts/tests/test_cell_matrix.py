@@ -0,0 +1,97 @@
+"""
+CellMatrix normalises each CD table's cells once for every consumer. The
+views must match the per-consumer expressions they replaced, and the CD
+JSON must match what the per-consumer code produced.
+
+data/cd_bundle_cells.json holds parse_single_cd(..., output="both") for
+every CD of the generated bundle, with whitespace noise added to the table
+cells, as produced by the parser before CellMatrix.
+"""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+import cd_parser
+from cd_parser import clean_text
+from cell_matrix import CellMatrix
+
+EXPECTED = Path(__file__).with_name("data") / "cd_bundle_cells.json"
+
+_NOISE = [
+    lambda s: s,
+    lambda s: f"  {s} ",
+    lambda s: s.replace(" ", "  "),
+    lambda s: s.replace(" ", "\n", 1),
+    lambda s: s + "\t",
+]
+
+
+def _noisy(rows, rng):
+    # The first column keeps its inner spacing: the classifier matches keys there.
+    return [[c if not c else rng.choice(_NOISE[:2] if j == 0 else _NOISE)(c)
+             for j, c in enumerate(row)] for row in rows]
+
+
+def cd_inputs(parser, path, seed=25):
+    """(pages_text, tables) per CD of the bundle, table cells with whitespace noise."""
+    rng = random.Random(seed)
+    pages_text, pages_tables = parser.extract_all_pages(path, use_cache=False)
+    starts = [page for page, _ in parser.find_cd_boundaries(pages_text)]
+    for start, end in zip(starts, starts[1:] + [len(pages_text)]):
+        tables = [_noisy(t, rng) for pt in pages_tables[start:end] for t in pt]
+        yield pages_text[start:end], tables
+
+
+def test_consumers_match_per_consumer_normalisation(cd_bundle_pdf):
+    parsed = [cd_parser.parse_single_cd(text, tables, output="both")
+              for text, tables in cd_inputs(cd_parser, cd_bundle_pdf)]
+    assert json.loads(json.dumps(parsed)) == json.loads(EXPECTED.read_text("utf-8"))
+
+
+_CELLS = [None, "", "  ", "UE24CS301", " Course  Code ", "Data\nStructures",
+          "a\tb", "  CO1 ", "Lecture No.", "x \n y"]
+
+
+def test_views_match_the_replaced_expressions():
+    rng = random.Random(7)
+    rows = [[rng.choice(_CELLS) for _ in range(rng.randint(1, 5))] for _ in range(500)]
+    cells = CellMatrix.from_rows(rows)
+
+    assert cells.rows == rows
+    for row, stripped, text, lower, empty in zip(
+            rows, cells.stripped, cells.text, cells.lower, cells.row_empty):
+        assert stripped == tuple(str(c).strip() if c else None for c in row)
+        assert text == tuple(clean_text(str(c)) if c else "" for c in row)
+        assert lower == tuple(clean_text(str(c)).lower() if c else "" for c in row)
+        assert empty == (not any(clean_text(str(c)) if c else "" for c in row))
+
+
+def test_clean_rows_share_one_tuple():
+    cells = CellMatrix.from_rows([["CO1", "3"], ["CO  2", " 3"], ["CO3", None]])
+    assert cells.text[0] is cells.stripped[0]
+    assert cells.text[1] == ("CO 2", "3") and cells.text[1] is not cells.stripped[1]
+    assert cells.stripped[2] == ("CO3", None) and cells.text[2] == ("CO3", "")
+
+
+def test_concat_and_of():
+    a = CellMatrix.from_rows([["COs", "PO1"], ["CO1", "3"]])
+    b = CellMatrix.from_rows([[None, None], ["CO2", " 2 "]])
+    both = CellMatrix.concat([a, b])
+
+    assert CellMatrix.concat([a]) is a
+    assert CellMatrix.of(a) is a
+    assert len(both) == 4
+    assert both.text == a.text + b.text
+    assert both.row_empty == [False, False, True, False]
+    assert both.lower[0] == ("cos", "po1")
+    assert CellMatrix.of([["a"]]).text == [("a",)]
+
+
+@pytest.mark.parametrize("rows", [[], [[]], [[None, ""]]])
+def test_degenerate_tables(rows):
+    cells = CellMatrix.from_rows(rows)
+    assert len(cells) == len(rows)
+    assert cells.row_empty == [True] * len(rows)
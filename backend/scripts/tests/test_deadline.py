@@ -0,0 +1,80 @@
+"""
+A deadline stops reading pages and returns what fits as a `partial` result:
+the pages that were read are parsed exactly as in a full run, and the rest
+are listed in skippedPages / skippedCDs with a warning.
+"""
+
+import io
+import json
+
+import pytest
+
+import cd_parser
+import pd_parser
+from job_control import Deadline
+
+
+class PageBudget(Deadline):
+    """A deadline that runs out after `pages` pages instead of on the clock."""
+
+    def __init__(self, pages):
+        super().__init__(60_000)
+        self.left = pages
+
+    def allows_page(self):
+        self.left -= 1
+        return self.left >= 0
+
+
+@pytest.fixture(scope="module")
+def full_cd(cd_bundle_pdf):
+    return cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False)
+
+
+@pytest.mark.parametrize("pages, parsed", [(3, 0), (6, 1), (9, 2)])
+def test_partial_cd_bundle(cd_bundle_pdf, full_cd, pages, parsed):
+    result = cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False,
+                                    deadline=PageBudget(pages))
+    codes = [cd["courseCode"] for cd in full_cd["parsedData"]]
+
+    assert result["success"] and result["partial"]
+    assert result["skippedPages"] == list(range(pages + 1, 13))
+    assert result["skippedCDs"] == [codes[parsed]]
+    assert result["parsedData"] == full_cd["parsedData"][:parsed]
+    assert result["warnings"][0] == (
+        f"Deadline reached after {pages} of 12 pages; pages {pages + 1}-12 were not read.")
+
+
+def test_partial_cd_stream_matches_buffered(cd_bundle_pdf):
+    buffered = cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False,
+                                      deadline=PageBudget(6))
+    out = io.StringIO()
+    cd_parser.stream_cd_pdf(cd_bundle_pdf, out, use_cache=False, deadline=PageBudget(6))
+    *cds, summary = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [cd["data"] for cd in cds] == buffered["parsedData"]
+    for key in ("partial", "skippedPages", "skippedCDs", "warnings"):
+        assert summary[key] == buffered[key]
+
+
+def test_partial_pd(pd2026_pdf):
+    result = pd_parser.process_pdf(pd2026_pdf, "auto", use_cache=False,
+                                   deadline=PageBudget(4))
+    assert result["success"] and result["partial"]
+    assert result["schemaVersion"] == "2026"
+    assert result["skippedPages"] == [5, 6, 7, 8, 9, 10]
+    assert "Deadline reached after 4 of 10 pages; pages 5-10 were not read." in result["warnings"]
+
+
+def test_deadline_before_the_first_page(cd_bundle_pdf, pd2026_pdf):
+    assert cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False,
+                                  deadline=PageBudget(0)) == {
+        "success": False, "message": "Deadline reached before any page was read.",
+        "parsedData": []}
+    assert pd_parser.process_pdf(pd2026_pdf, "auto", use_cache=False,
+                                 deadline=PageBudget(0)) == {
+        "success": False, "error": "Deadline reached before any text was read."}
+
+
+def test_no_deadline_is_not_partial(full_cd):
+    assert "partial" not in full_cd and "skippedPages" not in full_cd
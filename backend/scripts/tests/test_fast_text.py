@@ -0,0 +1,46 @@
+"""
+fast_text mirrors pdfplumber's private word / line grouping (and imports its
+LIGATURES and tolerances), so any pdfplumber upgrade must keep page_text()
+equal to page.extract_text() on every page here.
+"""
+
+import pdfplumber
+import pytest
+
+import fast_text
+import synthetic_pdfs
+
+
+def _corpus():
+    pages = synthetic_pdfs.pd2026_pages(pages=12, table_density=0.3, wrapped=0.2)
+    pages[1]["text"] += [(40, 790, "Deﬁned workﬂows: ﬁrst ﬂoor ﬁeld trips")]
+    pages[2]["vertical"] = [(20, 700, "Programme Outcomes (vertical header)"),
+                            (32, 500, "ﬁnal ﬂag")]
+    pages[3]["rotate"] = 90
+    pages[4]["rotate"] = 270
+    pages[4]["vertical"] = [(20, 600, "Semester-4 side note")]
+    return pages
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["winansi", "differences"])
+def corpus_pdf(request, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("fast_text") / "pd2026-corpus.pdf")
+    synthetic_pdfs.write_pdf(path, _corpus(), differences=request.param)
+    return path
+
+
+def test_page_text_matches_extract_text_on_every_page(corpus_pdf):
+    with pdfplumber.open(corpus_pdf) as pdf:
+        for page in pdf.pages:
+            expected = page.extract_text()
+            assert fast_text.page_text(page) == expected, f"page {page.page_number}"
+
+
+def test_corpus_exercises_ligatures_and_rotation(tmp_path):
+    path = str(tmp_path / "corpus.pdf")
+    synthetic_pdfs.write_pdf(path, _corpus(), differences=True)
+    with pdfplumber.open(path) as pdf:
+        assert any(ch["text"] == "ﬁ" for ch in pdf.pages[1].chars)
+        assert "Defined workflows" in pdf.pages[1].extract_text()
+        assert not all(ch["upright"] for ch in pdf.pages[2].chars)
+        assert not any(ch["upright"] for ch in pdf.pages[3].chars)
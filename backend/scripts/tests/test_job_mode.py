@@ -0,0 +1,77 @@
+"""
+`<parser>.py --job` end to end: one job line on stdin, newline-delimited
+events on stdout, and a {"type": "cancel"} line stopping the parse at the
+next page.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import synthetic_pdfs
+from conftest import SCRIPTS_DIR
+
+
+def _start(parser, job):
+    proc = subprocess.Popen([sys.executable, parser, "--job"], cwd=SCRIPTS_DIR,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+    proc.stdin.write(json.dumps(job) + "\n")
+    proc.stdin.flush()
+    return proc
+
+
+def _events(proc):
+    return [json.loads(line) for line in proc.stdout]
+
+
+@pytest.fixture(scope="module")
+def large_bundle(pdf_dir):
+    path = str(pdf_dir / "cd_bundle_60.pdf")
+    synthetic_pdfs.cd_bundle(path, pages=60)
+    return path
+
+
+@pytest.mark.parametrize("parser, pdf", [("cd_parser.py", "cd_bundle_pdf"),
+                                         ("pd_parser.py", "pd2026_pdf")])
+def test_job_emits_progress_then_result(request, parser, pdf):
+    path = request.getfixturevalue(pdf)
+    proc = _start(parser, {"id": "job-1", "file": path, "schema": "auto"})
+    proc.stdin.close()
+    events = _events(proc)
+    assert proc.wait(timeout=120) == 0
+
+    assert {e["id"] for e in events} == {"job-1"}
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "started" and kinds[-1] == "result"
+    assert "stage" in kinds and "progress" in kinds
+    assert events[-1]["result"]["success"]
+
+
+def test_cancel_line_stops_the_job(large_bundle):
+    proc = _start("cd_parser.py", {"id": "job-2", "file": large_bundle})
+    events = []
+    for line in proc.stdout:
+        events.append(json.loads(line))
+        if events[-1]["event"] == "progress":
+            proc.stdin.write(json.dumps({"type": "cancel"}) + "\n")
+            proc.stdin.close()
+            break
+    events += _events(proc)
+    assert proc.wait(timeout=120) == 0
+
+    last = events[-1]
+    assert last["event"] == "cancelled"
+    assert not any(e["event"] == "result" for e in events)
+    assert 0 < last["done"] < last["total"] == 60
+
+
+def test_invalid_job_line_is_an_error():
+    proc = _start("cd_parser.py", {"id": "job-3"})
+    proc.stdin.close()
+    events = _events(proc)
+    assert proc.wait(timeout=60) == 1
+    assert [e["event"] for e in events] == ["error"]
+    assert events[0]["error"].startswith("Invalid job")
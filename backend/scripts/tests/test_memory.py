@@ -0,0 +1,49 @@
+"""
+Peak RSS must not grow with page count: each page's layout objects are
+released once its artifacts are read. Every parse runs in a fresh
+interpreter so ru_maxrss belongs to that document alone.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import synthetic_pdfs
+from conftest import SCRIPTS_DIR
+
+SMALL_PAGES, LARGE_PAGES = 20, 120
+# Allowed peak-RSS growth from the small to the large document.
+MAX_GROWTH = 0.25
+
+_PARSE = """
+import json, resource, sys
+kind, path = sys.argv[1:]
+if kind == "cd":
+    import cd_parser
+    result = cd_parser.parse_cd_pdf(path, use_cache=False)
+else:
+    import pd_parser
+    result = pd_parser.process_pdf(path, "auto", use_cache=False)
+print(json.dumps({"success": result.get("success"),
+                  "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def _peak_rss(kind, path):
+    proc = subprocess.run([sys.executable, "-c", _PARSE, kind, path], cwd=SCRIPTS_DIR,
+                          capture_output=True, text=True, timeout=300, check=True)
+    report = json.loads(proc.stdout.splitlines()[-1])
+    assert report["success"]
+    return report["peak_rss"]
+
+
+@pytest.mark.parametrize("kind", ["cd", "pd2024"])
+def test_peak_rss_does_not_grow_with_page_count(tmp_path, kind):
+    rss = {}
+    for pages in (SMALL_PAGES, LARGE_PAGES):
+        path = str(tmp_path / f"{kind}-p{pages}.pdf")
+        synthetic_pdfs.GENERATORS[kind](path, pages=pages)
+        rss[pages] = _peak_rss(kind, path)
+    assert rss[LARGE_PAGES] <= rss[SMALL_PAGES] * (1 + MAX_GROWTH), rss
@@ -0,0 +1,18 @@
+import pytest
+
+import pd_parser
+
+
+@pytest.mark.parametrize("pdf, schema", [("pd2024_pdf", "2024"), ("pd2026_pdf", "2026")])
+def test_each_page_is_laid_out_at_most_once_per_kind(request, caches, pdf, schema):
+    result = pd_parser.process_pdf(request.getfixturevalue(pdf), "auto", use_cache=False)
+    assert result["success"] and result["schemaVersion"] == schema
+
+    assert len(caches) == 1
+    pages = caches[0]
+    assert sorted(pages.layout_calls) == list(range(len(pages)))
+    for idx, calls in pages.layout_calls.items():
+        assert calls["text"] <= 1, f"page {idx + 1}: {calls}"
+        assert calls["tables"] <= 1, f"page {idx + 1}: {calls}"
+    if schema == "2024":
+        assert any(calls["tables"] for calls in pages.layout_calls.values())
@@ -0,0 +1,121 @@
+import time
+
+import pdfplumber
+import pytest
+
+import cd_parser
+import page_cache
+import synthetic_pdfs
+from page_cache import PageArtifactCache
+from page_guard import (NULL_GUARD, SKIPPED, TEXT_ONLY, PageBudgetExceeded, PageGuard,
+                        guard_from)
+from result_cache import ResultCache
+
+
+@pytest.fixture(scope="module")
+def rect_heavy_pdf(tmp_path_factory):
+    """Two CDs of four pages; page 4 (the first CD's last) also draws 6000 tiny rects."""
+    pages = synthetic_pdfs.cd_bundle_pages(pages=8)
+    pages[3]["rects"] = [(40 + (i % 60) * 8, 100 + (i // 60) * 6,
+                          46 + (i % 60) * 8, 104 + (i // 60) * 6) for i in range(6000)]
+    path = str(tmp_path_factory.mktemp("guard") / "rect-heavy.pdf")
+    synthetic_pdfs.write_pdf(path, pages)
+    return path
+
+
+def test_governor_is_opt_in():
+    assert guard_from(None) is NULL_GUARD
+    assert guard_from("") is NULL_GUARD
+    assert guard_from("off") is NULL_GUARD
+    assert guard_from("on").limits["rss_mb"] == 0
+    assert guard_from("rects=2000").limits["rects"] == 2000
+    with pytest.raises(ValueError):
+        guard_from("pixels=5")
+
+
+def test_rect_heavy_page_is_read_as_text_only(rect_heavy_pdf):
+    guarded = cd_parser.parse_cd_pdf(rect_heavy_pdf, use_cache=False, guard=guard_from("on"))
+    plain = cd_parser.parse_cd_pdf(rect_heavy_pdf, use_cache=False)
+
+    assert guarded["throttledPages"] == [
+        {"page": 4, "action": TEXT_ONLY, "reason": "6000 rects over the cap of 5000"}]
+    assert guarded["warnings"] == ["Page 4 read as text only (6000 rects over the cap of 5000)."]
+    assert "throttledPages" not in plain
+
+    first, second = guarded["parsedData"]
+    # The throttled page's text still counts; only its tables are gone.
+    assert first["courseCode"] == plain["parsedData"][0]["courseCode"]
+    assert first["attainmentCalculations"] != plain["parsedData"][0]["attainmentCalculations"]
+    assert second == plain["parsedData"][1]
+
+
+def test_normal_pages_are_unaffected(cd_bundle_pdf):
+    guarded = cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False, guard=guard_from("on"))
+    assert guarded == cd_parser.parse_cd_pdf(cd_bundle_pdf, use_cache=False)
+
+
+def test_object_caps_do_not_force_a_layout(rect_heavy_pdf):
+    guard = PageGuard()
+    with pdfplumber.open(rect_heavy_pdf) as pdf:
+        assert guard.over_objects(0, pdf.pages[0]) is None
+        assert guard.over_objects(3, pdf.pages[3]) == "6000 rects over the cap of 5000"
+        assert not any(hasattr(page, "_objects") for page in pdf.pages)
+
+
+@pytest.mark.parametrize("backend, guard", [("layout", "on"), ("fast", None)])
+def test_fast_text_is_not_persisted(rect_heavy_pdf, tmp_path, backend, guard):
+    store = ResultCache(str(tmp_path), 1 << 30)
+    with pdfplumber.open(rect_heavy_pdf) as pdf:
+        first = PageArtifactCache(pdf, store=store, text_backend=backend,
+                                  guard=guard_from(guard))
+        texts = [first.text(i) for i in range(len(first))]
+        first.tables(0)
+        first.flush()
+
+    with pdfplumber.open(rect_heavy_pdf) as pdf:
+        second = PageArtifactCache(pdf, store=store)
+        assert [second.text(i) for i in range(len(second))] == texts
+        laid_out = sorted(i for i, calls in second.layout_calls.items() if calls["text"])
+        assert second.tables(0) == first.tables(0)
+
+    # The guarded run stored layout text for every page but the throttled one;
+    # the fast run stored no text, only page 1's tables.
+    assert laid_out == ([3] if guard else list(range(8)))
+
+
+def test_budget_alarm_interrupts_a_slow_call():
+    guard = PageGuard({"page_ms": 50})
+    started = time.perf_counter()
+    with pytest.raises(PageBudgetExceeded):
+        with guard.budget(0):
+            time.sleep(2)
+    assert time.perf_counter() - started < 1
+    assert guard.out_of_time(0) == "over the 50 ms page budget"
+
+
+def _slow(fn):
+    def slow(*args, **kwargs):
+        time.sleep(0.2)
+        return fn(*args, **kwargs)
+    return slow
+
+
+def test_slow_text_skips_the_page_and_slow_tables_drop_to_text_only(
+        monkeypatch, cd_bundle_pdf):
+    guard = PageGuard({"page_ms": 100})
+    with pdfplumber.open(cd_bundle_pdf) as pdf:
+        pages = PageArtifactCache(pdf, guard=guard)
+        assert pages.text(0)
+        monkeypatch.setattr(page_cache, "find_table_cells",
+                            _slow(page_cache.find_table_cells))
+        assert pages.tables(0) == []
+        monkeypatch.setattr(pdfplumber.page.Page, "extract_text",
+                            _slow(pdfplumber.page.Page.extract_text))
+        assert pages.text(1) == ""
+
+    assert guard.action(0) == TEXT_ONLY
+    assert guard.action(1) == SKIPPED
+    result = guard.annotate({})
+    assert [(p["page"], p["action"]) for p in result["throttledPages"]] == [
+        (1, TEXT_ONLY), (2, SKIPPED)]
+    assert result["warnings"][1] == "Page 2 skipped (over the 100 ms page budget)."
@@ -0,0 +1,41 @@
+"""
+Page-parallel extraction (parse_cd_pdf(jobs=N)) must give output
+byte-identical to the serial path.
+"""
+
+import json
+
+import pytest
+
+import cd_parser
+import synthetic_pdfs
+
+
+@pytest.fixture(autouse=True)
+def four_cpus(monkeypatch):
+    # extract_all_pages caps jobs at the CPU count; the test machine may have one.
+    monkeypatch.setattr(cd_parser.os, "cpu_count", lambda: 4)
+
+
+@pytest.fixture(scope="module", params=[40, 37], ids=["even-shards", "short-last-shard"])
+def bundle(request, pdf_dir):
+    pages = request.param
+    path = str(pdf_dir / f"cd_bundle_{pages}_wrapped.pdf")
+    synthetic_pdfs.cd_bundle(path, pages=pages, wrapped=0.3)
+    return path, pages
+
+
+def test_bundle_is_sharded(bundle):
+    _, pages = bundle
+    sizes = [end - start for start, end in cd_parser._page_shards(pages, 4)]
+    assert len(sizes) > 1
+    assert (sizes[-1] < sizes[0]) == bool(pages % sizes[0])
+
+
+def test_sharded_output_is_byte_identical(bundle):
+    path, _ = bundle
+    serial = cd_parser.parse_cd_pdf(path, jobs=1, use_cache=False)
+    sharded = cd_parser.parse_cd_pdf(path, jobs=4, use_cache=False)
+
+    assert serial["success"] and len(serial["parsedData"]) > 1
+    assert json.dumps(sharded, ensure_ascii=False) == json.dumps(serial, ensure_ascii=False)
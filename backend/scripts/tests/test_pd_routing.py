@@ -0,0 +1,55 @@
+import pytest
+
+import pd_parser
+from pd_parser import (P24_ELECTIVE_SEMESTER_RE, P24_SEMESTER_RE, ROUTE_ELECTIVE,
+                       ROUTE_NARRATIVE, ROUTE_SEMESTER, route_2024_page)
+
+_HEADER = "Sl Course Code Course Title Credits\n1 UE24CS3001 Data Structures 4"
+
+
+@pytest.mark.parametrize("text, route", [
+    (f"Semester-3\n{_HEADER}", (ROUTE_SEMESTER,)),
+    (f"Semester 3 (continued)\n{_HEADER}", (ROUTE_SEMESTER,)),
+    (f"Professional Elective courses for 5th Semester\n{_HEADER}", (ROUTE_ELECTIVE,)),
+    (f"Open Elective, 6 Semester-6\n{_HEADER}", (ROUTE_SEMESTER, ROUTE_ELECTIVE)),
+    ("Sl. No. Program -Category Credits\n1. Basic Sciences 20 (BS)\nTotal 160",
+     (ROUTE_NARRATIVE,)),
+    ("Note 3: delivery in Semester-4 and professional / open elective options.",
+     (ROUTE_NARRATIVE,)),
+    ("Semester-4 courses are listed by title on the next page.", (ROUTE_NARRATIVE,)),
+    ("", (ROUTE_NARRATIVE,)),
+])
+def test_route_2024_page(text, route):
+    assert route_2024_page(text) == route
+
+
+def _route_by_extractor_gates(text):
+    """The page gates the semester and elective extractors applied before routing."""
+    low = text.lower()
+    routes = []
+    if "semester" in low and P24_SEMESTER_RE.search(text):
+        routes.append(ROUTE_SEMESTER)
+    if ("elective" in low and ("professional" in low or "open" in low)
+            and P24_ELECTIVE_SEMESTER_RE.findall(text)):
+        routes.append(ROUTE_ELECTIVE)
+    return tuple(routes) or (ROUTE_NARRATIVE,)
+
+
+def _table_pages(pages):
+    return sorted(idx for idx, calls in pages.layout_calls.items() if calls["tables"])
+
+
+def test_routing_skips_narrative_pages_without_changing_the_result(
+        pd2024_pdf, caches, monkeypatch):
+    routed = pd_parser.process_pdf(pd2024_pdf, "auto", use_cache=False)
+    routed_tables = _table_pages(caches[-1])
+
+    monkeypatch.setattr(pd_parser, "route_2024_page", _route_by_extractor_gates)
+    gated = pd_parser.process_pdf(pd2024_pdf, "auto", use_cache=False)
+    gated_tables = _table_pages(caches[-1])
+
+    assert routed["schemaVersion"] == "2024"
+    assert routed == gated
+    assert routed["data"]["semesters"] and routed["data"]["prof_electives"]
+    # The generated narrative pages name semesters and electives in passing.
+    assert set(routed_tables) < set(gated_tables)
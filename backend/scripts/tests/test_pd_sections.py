@@ -0,0 +1,90 @@
+"""
+The one-pass section and outcome-block scans must find exactly what the
+per-pattern searches they replaced found.
+"""
+
+import random
+import re
+
+import pdfplumber
+import pytest
+
+import pd_parser
+from page_cache import PageArtifactCache
+
+_ID = re.IGNORECASE | re.DOTALL
+
+
+def _section_spans_per_pattern(full_text):
+    """_get_section_spans as it was: a spaced then a tight search per heading."""
+    found = []
+    for sec_no, pattern in pd_parser.SECTION_HEADING_PATTERNS:
+        m = (re.search(rf"(?m)^\s*{sec_no}\s+(?={pattern})", full_text) or
+             re.search(rf"(?m)^\s*{sec_no}\s*{pattern}", full_text))
+        if m:
+            found.append((sec_no, m.start()))
+    found.sort(key=lambda x: x[1])
+    return {sec_no: (start, found[i + 1][1] if i + 1 < len(found) else len(full_text))
+            for i, (sec_no, start) in enumerate(found)}
+
+
+_OUTCOME_BLOCK_RES = {
+    "peo": re.compile(r'Program Educational Objectives.*?(?=Program Outcomes|Program Specific|$)', _ID),
+    "po": re.compile(r'Program Outcomes.*?(?=Program Specific|$)', _ID),
+    "pso": re.compile(r'Program Specific Outcomes.*?'
+                      r'(?=Programme Structure|Definition of Credit|Courses and Credits|$)', _ID),
+}
+
+
+def _outcome_blocks_per_pattern(full_text):
+    blocks = {}
+    for kind, block_re in _OUTCOME_BLOCK_RES.items():
+        m = block_re.search(full_text)
+        if m:
+            blocks[kind] = m.group(0)
+    return blocks
+
+
+_FRAGMENTS = [
+    "10 Program Overview\n", "10Program Overview\n", "  11 Program Educational Objectives\n",
+    "11Program  Educational Objectives\n", "12 Program Outcomes\n", "12Program Outcomes\n",
+    "13 Program Specific Outcomes\n", "14 Courses and Credits\n",
+    "15 List of Technical Competency Courses\n", "16 Program Delivery and Attainment\n",
+    "17 Teaching and Learning Methods\n", "18 Attendance\n", "19 Assessment and Grading\n",
+    "20 Award of the Degree\n", "21 Student Support for Learning\n",
+    "22 Quality Control Measures\n", "Program Educational Objectives\n",
+    "program outcomes\n", "Program Specific\n", "Programme Structure\n",
+    "Definition of Credit\n", "PEO-1: Graduates will lead\n", "PO-1: Engineering: apply\n",
+    "PSO-1: Build systems\n", "Semester-3 narrative text\n", "\n", "   ", "12 Outcomes\n",
+]
+
+
+def _random_texts(n=400, seed=7):
+    rng = random.Random(seed)
+    for _ in range(n):
+        text = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 14)))
+        yield text if rng.random() < 0.7 else text.rstrip("\n")
+
+
+@pytest.fixture(scope="module")
+def document_texts(pd2024_pdf, pd2026_pdf):
+    texts = []
+    for path in (pd2024_pdf, pd2026_pdf):
+        with pdfplumber.open(path) as pdf:
+            texts.append(PageArtifactCache(pdf).full_text())
+    return texts
+
+
+def test_section_spans_match_per_pattern_search(document_texts):
+    for text in [*document_texts, *_random_texts()]:
+        assert pd_parser._get_section_spans(text) == _section_spans_per_pattern(text), text
+
+
+def test_outcome_blocks_match_per_pattern_search(document_texts):
+    for text in [*document_texts, *_random_texts()]:
+        assert pd_parser._p24_outcome_blocks(text) == _outcome_blocks_per_pattern(text), text
+
+
+def test_generated_2026_document_has_every_section(document_texts):
+    spans = pd_parser._get_section_spans(document_texts[1])
+    assert sorted(spans) == [sec_no for sec_no, _ in pd_parser.SECTION_HEADING_PATTERNS]
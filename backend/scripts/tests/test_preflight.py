@@ -0,0 +1,85 @@
+import pdfplumber
+import pytest
+
+import cd_parser
+import pd_parser
+import synthetic_pdfs
+from page_guard import PageGuard, parse_limits
+from preflight import preflight
+
+def page_guard_on():
+    return PageGuard(parse_limits("on"))
+
+
+SCANNED = "No text found in PDF (might be scanned)."
+
+
+@pytest.fixture
+def no_layout(monkeypatch):
+    """Fail the test if a parser opens the PDF with pdfplumber."""
+    def refuse(*args, **kwargs):
+        raise AssertionError("pdfplumber.open called")
+    monkeypatch.setattr(pdfplumber, "open", refuse)
+
+
+def test_standard_encoding_is_decoded(pd2026_pdf, cd_bundle_pdf):
+    pd = preflight(pd2026_pdf)
+    assert (pd["schema"], pd["kind"]) == ("2026", "pd")
+    cd = preflight(cd_bundle_pdf)
+    assert (cd["kind"], cd["cd_markers"]) == ("cd_bundle", 3)
+
+
+def test_differences_encoding_leaves_schema_and_kind_undecided(tmp_path):
+    path = str(tmp_path / "pd2026-differences.pdf")
+    synthetic_pdfs.write_pdf(path, synthetic_pdfs.pd2026_pages(10), differences=True)
+
+    probe = preflight(path)
+    assert probe["has_text"]
+    assert probe["schema"] is None
+    assert probe["kind"] is None
+
+    result = pd_parser.process_pdf(path, "auto", use_cache=False)
+    assert result["schemaVersion"] == "2026"
+    assert result["confidence"] == 100
+    assert not any("Course Document" in w for w in result["data"]["parserWarnings"])
+
+
+def test_scanned_upload_is_rejected_before_layout(tmp_path, no_layout):
+    path = str(tmp_path / "scanned.pdf")
+    synthetic_pdfs.write_pdf(path, [{"text": [], "lines": [(36, 28, 560, 28)]}] * 3)
+
+    probe = preflight(path)
+    assert (probe["pages"], probe["has_text"], probe["error"]) == (3, False, None)
+
+    assert pd_parser.process_pdf(path, "auto", use_cache=False) == {
+        "success": False, "error": SCANNED}
+    assert cd_parser.parse_cd_pdf(path, use_cache=False) == {
+        "success": False, "message": SCANNED, "parsedData": []}
+
+
+def test_unreadable_upload_is_rejected_before_layout(tmp_path, no_layout):
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(b"<html>not a pdf</html>")
+
+    probe = preflight(str(path))
+    assert probe["error"].startswith("Cannot read PDF")
+
+    assert pd_parser.process_pdf(str(path), "auto", use_cache=False)["error"] == probe["error"]
+    assert cd_parser.parse_cd_pdf(str(path), use_cache=False)["message"] == probe["error"]
+
+
+def test_unreadable_stream_leaves_the_probe_undecided(tmp_path, pd2026_pdf):
+    pages = synthetic_pdfs.pd2026_pages(10)
+    pages[3]["broken_form"] = True
+    path = str(tmp_path / "pd2026-broken-form.pdf")
+    synthetic_pdfs.write_pdf(path, pages)
+
+    probe = preflight(path)
+    assert probe["error"] is None
+    assert (probe["pages"], probe["has_text"]) == (10, True)
+    assert (probe["schema"], probe["kind"]) == (None, None)
+
+    # pdfplumber never decodes the unused form, so the layout path parses it.
+    result = pd_parser.process_pdf(path, "auto", use_cache=False, guard=page_guard_on())
+    assert result == pd_parser.process_pdf(pd2026_pdf, "auto", use_cache=False)
+    assert cd_parser.parse_cd_pdf(path, use_cache=False)["success"]
@@ -0,0 +1,56 @@
+"""
+The result-cache fingerprint covers every local module a parser runs, so
+editing any of them invalidates cached results.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+from result_cache import local_sources, parser_fingerprint
+
+_LOADED = """
+import json, sys
+from pathlib import Path
+import {parser}
+here = Path({parser}.__file__).resolve().parent
+print(json.dumps(sorted(str(Path(m.__file__).resolve()) for m in list(sys.modules.values())
+                        if getattr(m, "__file__", None)
+                        and Path(m.__file__).resolve().parent == here)))
+"""
+
+
+@pytest.mark.parametrize("parser", ["pd_parser", "cd_parser"])
+def test_fingerprint_covers_every_loaded_module(parser):
+    proc = subprocess.run([sys.executable, "-c", _LOADED.format(parser=parser)],
+                          cwd=SCRIPTS_DIR, capture_output=True, text=True,
+                          timeout=60, check=True)
+    loaded = set(json.loads(proc.stdout))
+    sources = local_sources(str(SCRIPTS_DIR / f"{parser}.py"))
+
+    assert loaded <= set(sources)
+    # Modules used only from the parser's entry-point branches count too.
+    names = {Path(p).name for p in sources}
+    assert {"wire_format.py", "job_control.py", "batch_runner.py",
+            "parser_service.py"} <= names
+    assert not names & {"bench_parsers.py", "synthetic_pdfs.py"}
+
+
+def test_editing_an_imported_module_changes_the_fingerprint(tmp_path):
+    for path in SCRIPTS_DIR.glob("*.py"):
+        shutil.copy(path, tmp_path)
+    sources = local_sources(str(tmp_path / "cd_parser.py"))
+    before = parser_fingerprint(sources)
+
+    with open(tmp_path / "bench_parsers.py", "a") as f:
+        f.write("\n# not part of the parser\n")
+    assert parser_fingerprint(local_sources(str(tmp_path / "cd_parser.py"))) == before
+
+    with open(tmp_path / "wire_format.py", "a") as f:
+        f.write("\n# changed\n")
+    assert parser_fingerprint(local_sources(str(tmp_path / "cd_parser.py"))) != before
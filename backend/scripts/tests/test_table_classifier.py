@@ -0,0 +1,136 @@
+"""
+Table shapes as pdfplumber extracts them from course documents: None for
+the cells of a merged span, "\\n" where a cell's text wraps.
+"""
+
+import random
+
+import pytest
+
+import cd_parser
+from cell_matrix import CellMatrix
+from table_classifier import (BODY_KEYWORDS, HEADER_KEYWORDS, KeywordScanner,
+                              classify_table)
+
+METADATA = [
+    ["Course Code", "UE24CS251A", None, None],
+    ["Course Title", "Data Structures and its\nApplications", None, None],
+    ["Program Code", "UE24", "Program Title", "B.Tech CSE"],
+    ["School Code", "SOC", "Department", "Computer Science"],
+    ["Faculty Member", "Dr. A. Kumar", None, None],
+]
+
+CREDITS = [
+    ["L", "T", "P", "S", "Credits", "Total Hours"],
+    ["4", "0", "0", "0", "4", "56"],
+]
+
+OUTCOME_MAP = [
+    ["COs", "PO1", "PO2", "PO3", "PO4", "PSO1", "PSO2"],
+    ["CO1", "3", "2", "", "1", "2", ""],
+    ["CO2", "2", "3", "1", "", "", "2"],
+]
+
+OUTCOME_MAP_TITLED = [
+    ["Course Outcome Map", None, None, None, None],
+    ["COs", "PO", "PO", "PSO", "PSO"],
+    ["CO1", "3", "", "1", ""],
+]
+
+ASSESSMENT = [
+    ["CO", "Quiz 1", "Quiz 2", "Test 1", "Test 2", "Assignment", "SEE", "Total"],
+    ["CO1", "2", "2", "10", "", "5", "20", "39"],
+    ["CO2", "", "2", "", "10", "5", "30", "47"],
+]
+
+ASSESSMENT_WEIGHTS = [
+    ["Course Outcome", "Weight (%)", "Assessment Tool"],
+    ["CO1", "20", "Quiz, Test 1"],
+]
+
+TEACHING = [
+    ["Lecture\nNumber", "Topic", "Slides", "Videos"],
+    ["1", "Introduction to linear data\nstructures", "Slide 1", ""],
+    ["2", "Arrays and linked lists", "Slide 2", "https://example.edu/v2"],
+]
+
+RECORDING_MARKS = [
+    ["S. No", "USN", "Student Name", "Quiz 1\n(10)", "Test 1\n(20)",
+     "Assignment\n(10)", "SEE\n(50)", "Total\n(100)", "Marks\nScored", "Grade\nObtained"],
+    ["1", "PES1UG24CS001", "Student 1", "8", "15", "9", "40", "72", "72", "A"],
+    ["2", "PES1UG24CS002", "Student 2", "7", "14", "8", "35", "64", "64", "B"],
+    ["", "Total", "", "", "", "", "", "", "", ""],
+    ["Class Average: 68", None, None, None, None, None, None, None, None, None],
+]
+
+ATTAINMENT_TARGETS = [
+    ["Setting Attainment Targets", None],
+    ["Attainment of Course Outcomes", "Targeted Attainment Level"],
+    ["CO1", "70% of students will score C grade and above - Level 1"],
+]
+
+ATTAINMENT_TARGETS_SPLIT = [
+    ["Course Outcomes- Targeted", "Level"],
+    ["CO1 - CO4", "2"],
+]
+
+TEACHING_CONTINUED = [
+    ["12", "Graphs: breadth-first and depth-first\nsearch", "Slide 12", ""],
+]
+
+OUTCOME_MAP_CONTINUED = [
+    ["CO5", "2", "", "3", "1", "", ""],
+]
+
+
+@pytest.mark.parametrize("table, label, confidence", [
+    (METADATA, "metadata", 1.0),
+    (CREDITS, "credits", 1.0),
+    (OUTCOME_MAP, "outcome", 1.0),
+    (OUTCOME_MAP_TITLED, "outcome", 1.0),
+    (ASSESSMENT, "assessment", 1.0),
+    (ASSESSMENT_WEIGHTS, "assessment", 1.0),
+    (TEACHING, "teaching", 1.0),
+    # Its quiz / test / SEE columns fire the assessment rule too.
+    (RECORDING_MARKS, "recording_marks", 0.5),
+    (ATTAINMENT_TARGETS, "attainment_targets", 1.0),
+    (ATTAINMENT_TARGETS_SPLIT, "attainment_targets", 1.0),
+    (TEACHING_CONTINUED, None, 0.0),
+    (OUTCOME_MAP_CONTINUED, None, 0.0),
+    ([], None, 0.0),
+    ([[]], None, 0.0),
+])
+def test_real_table_shapes(table, label, confidence):
+    assert classify_table(table) == (label, confidence)
+    assert classify_table(CellMatrix.from_rows(table)) == (label, confidence)
+
+
+def test_keyword_scanner_finds_overlapping_keywords():
+    keywords = [k for ks in (*BODY_KEYWORDS.values(), *HEADER_KEYWORDS.values()) for k in ks]
+    scanner = KeywordScanner(keywords)
+    rng = random.Random(15)
+    # Keyword fragments run together, so keywords overlap, nest and straddle.
+    pieces = keywords + [k[:3] for k in keywords] + [" ", "\n", "-", ".", "s"]
+    for _ in range(3000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        assert scanner.scan(text) == {k for k in keywords if k in text}, text
+
+    assert scanner.scan("attainment of course outcomes- targeted") == {
+        "attainment of course outcomes", "attainment", "outcome", "outcomes",
+        "outcomes- targeted", "targeted"}
+    assert scanner.scan("") == frozenset()
+
+
+def test_continuation_tables_extend_the_previous_section():
+    data = cd_parser.parse_single_cd(
+        ["UE24CS251A Course Document"],
+        [METADATA, CREDITS, TEACHING, TEACHING_CONTINUED, OUTCOME_MAP,
+         OUTCOME_MAP_CONTINUED],
+        output="structured")
+
+    assert data["courseCode"] == "UE24CS251A"
+    assert data["courseTitle"] == "Data Structures and its Applications"
+    assert (data["credits"]["L"], data["credits"]["total"], data["totalHours"]) == (4, 4, 56)
+    assert [row["number"] for row in data["teaching"]] == ["1", "2", "12"]
+    assert data["teaching"][0]["topic"] == "Introduction to linear data structures"
+    assert [row[0] for row in data["outcomeMap"]["matrix"]] == ["COs", "CO1", "CO2", "CO5"]
@@ -0,0 +1,123 @@
+import io
+import json
+import math
+
+import pytest
+
+from wire_format import (ENCODINGS, decode_result, encode_result, frame, msgpack_dumps,
+                         msgpack_loads, read_frame)
+
+RESULT = {
+    "success": True,
+    "message": "Successfully parsed 2 Course Document(s).",
+    "parsedData": [
+        {"courseCode": "UE24CS251A", "totalHours": 56, "credits": {"L": 4, "T": 0},
+         "courseTitle": "Données et Structures — ಡೇಟಾ", "teaching": [],
+         "outcomeMap": {"raw": "", "matrix": [["COs", "PO1"], ["CO1", "3"]]},
+         "score": -1.5, "attainment": None, "flags": [True, False, 0, 1]},
+    ] * 2,
+    "warnings": ["x" * 300],
+}
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_round_trip(encoding):
+    payload = encode_result(RESULT, encoding)
+    assert decode_result(payload, encoding) == RESULT
+    assert decode_result(read_frame(io.BytesIO(frame(payload))), encoding) == RESULT
+
+
+def test_json_and_gzip_are_deterministic():
+    assert encode_result(RESULT) == json.dumps(
+        RESULT, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert encode_result(RESULT, "gzip") == encode_result(RESULT, "gzip")
+
+
+@pytest.mark.parametrize("value, encoded", [
+    (0, b"\x00"),
+    (127, b"\x7f"),                                    # largest positive fixint
+    (128, b"\xce\x00\x00\x00\x80"),
+    (-1, b"\xff"),
+    (-32, b"\xe0"),                                    # smallest negative fixint
+    (-33, b"\xd2\xff\xff\xff\xdf"),
+    ((1 << 32) - 1, b"\xce\xff\xff\xff\xff"),           # uint32
+    (1 << 32, b"\xcf\x00\x00\x00\x01\x00\x00\x00\x00"),  # uint64
+    ((1 << 64) - 1, b"\xcf" + b"\xff" * 8),
+    (-(1 << 31), b"\xd2\x80\x00\x00\x00"),              # int32
+    (-(1 << 31) - 1, b"\xd3\xff\xff\xff\xff\x7f\xff\xff\xff"),  # int64
+    (-(1 << 63), b"\xd3\x80" + b"\x00" * 7),
+    (True, b"\xc3"),
+    (False, b"\xc2"),
+    (None, b"\xc0"),
+    (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+    ("", b"\xa0"),
+    ("é", b"\xa2\xc3\xa9"),                            # length in UTF-8 bytes
+    ("a" * 31, b"\xbf" + b"a" * 31),
+    ("a" * 32, b"\xd9\x20" + b"a" * 32),
+    ("a" * 256, b"\xda\x01\x00" + b"a" * 256),
+    (b"\x00\xff", b"\xc4\x02\x00\xff"),
+    ([], b"\x90"),
+    ([0] * 16, b"\xdc\x00\x10" + b"\x00" * 16),
+    ({}, b"\x80"),
+    ({"a": [1, {"b": None}]}, b"\x81\xa1a\x92\x01\x81\xa1b\xc0"),
+])
+def test_msgpack_encoding(value, encoded):
+    assert msgpack_dumps(value) == encoded
+    decoded = msgpack_loads(encoded)
+    assert decoded == value and type(decoded) is type(value)
+
+
+def test_msgpack_keeps_bool_and_int_apart():
+    decoded = msgpack_loads(msgpack_dumps([True, 1, False, 0]))
+    assert [type(v) for v in decoded] == [bool, int, bool, int]
+
+
+def test_msgpack_large_containers_and_strings():
+    value = {f"k{i}": list(range(i)) for i in range(20)}  # map16, nested arrays
+    value["text"] = "ಡೇಟಾ" * 20000                         # over 64 KiB of UTF-8: str32
+    value["rows"] = [[None] * 3] * 70000                   # array32
+    value["blob"] = bytes(70000)                           # bin32
+    assert msgpack_loads(msgpack_dumps(value)) == value
+
+
+def test_msgpack_special_floats():
+    inf, nan = msgpack_loads(msgpack_dumps([math.inf, math.nan]))
+    assert inf == math.inf and math.isnan(nan)
+
+
+@pytest.mark.parametrize("value", [1 << 64, -(1 << 63) - 1])
+def test_msgpack_rejects_out_of_range_ints(value):
+    with pytest.raises(ValueError):
+        msgpack_dumps(value)
+
+
+def test_msgpack_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        msgpack_dumps({"when": object()})
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\xce\x00\x00",              # uint32 missing a byte
+    b"\xa5abc",                   # fixstr shorter than its length
+    b"\x92\x01",                  # array missing an item
+    b"\xc1",                      # never-used type byte
+    b"\x01\x02",                  # trailing bytes
+])
+def test_msgpack_rejects_malformed_data(data):
+    with pytest.raises(ValueError):
+        msgpack_loads(data)
+
+
+def test_read_frame_sequence_and_eof():
+    stream = io.BytesIO(frame(b"one") + frame(b"") + frame(b"three"))
+    assert [read_frame(stream) for _ in range(4)] == [b"one", b"", b"three", None]
+
+
+@pytest.mark.parametrize("data", [
+    b"\x00\x00",                           # header cut short
+    b"\x00\x00\x00\x05abc",                # payload cut short
+])
+def test_read_frame_truncated(data):
+    with pytest.raises(EOFError):
+        read_frame(io.BytesIO(data))
@@ -0,0 +1,236 @@
+"""
+Parser Result Wire Format
+How pd_parser.py / cd_parser.py write their result to stdout.
+
+Encodings (--encoding):
+  json     minified UTF-8 JSON (default); --pretty restores indented output
+  gzip     the minified JSON, gzip-compressed (deterministic: mtime 0)
+  msgpack  MessagePack (str / bin / int / float64 / bool / nil / array /
+           map subset), readable by any MessagePack decoder
+
+With --framed the payload is preceded by its length as a 4-byte big-endian
+unsigned integer, so a consumer reads exactly that many bytes instead of
+scanning the output for the outermost braces.
+"""
+
+import argparse
+import gzip
+import json
+import struct
+import sys
+from typing import Any, BinaryIO, Optional
+
+ENCODINGS = ("json", "gzip", "msgpack")
+
+_LENGTH = struct.Struct(">I")
+
+
+# ─────────────────────────────────────────────
+# MSGPACK (subset)
+# ─────────────────────────────────────────────
+
+def _pack(obj: Any, out: list) -> None:
+    if obj is None:
+        out.append(b"\xc0")
+    elif obj is True:
+        out.append(b"\xc3")
+    elif obj is False:
+        out.append(b"\xc2")
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(bytes((obj,)))
+        elif -32 <= obj < 0:
+            out.append(struct.pack(">b", obj))
+        elif 0 <= obj < 1 << 32:
+            out.append(struct.pack(">BI", 0xce, obj))
+        elif -(1 << 31) <= obj < 0:
+            out.append(struct.pack(">Bi", 0xd2, obj))
+        elif 0 <= obj < 1 << 64:
+            out.append(struct.pack(">BQ", 0xcf, obj))
+        elif -(1 << 63) <= obj < 0:
+            out.append(struct.pack(">Bq", 0xd3, obj))
+        else:
+            raise ValueError(f"Integer out of msgpack range: {obj}")
+    elif isinstance(obj, float):
+        out.append(struct.pack(">Bd", 0xcb, obj))
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(bytes((0xa0 | n,)))
+        elif n < 1 << 8:
+            out.append(struct.pack(">BB", 0xd9, n))
+        elif n < 1 << 16:
+            out.append(struct.pack(">BH", 0xda, n))
+        else:
+            out.append(struct.pack(">BI", 0xdb, n))
+        out.append(data)
+    elif isinstance(obj, (bytes, bytearray)):
+        n = len(obj)
+        if n < 1 << 8:
+            out.append(struct.pack(">BB", 0xc4, n))
+        elif n < 1 << 16:
+            out.append(struct.pack(">BH", 0xc5, n))
+        else:
+            out.append(struct.pack(">BI", 0xc6, n))
+        out.append(bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(bytes((0x90 | n,)))
+        elif n < 1 << 16:
+            out.append(struct.pack(">BH", 0xdc, n))
+        else:
+            out.append(struct.pack(">BI", 0xdd, n))
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(bytes((0x80 | n,)))
+        elif n < 1 << 16:
+            out.append(struct.pack(">BH", 0xde, n))
+        else:
+            out.append(struct.pack(">BI", 0xdf, n))
+        for key, value in obj.items():
+            _pack(str(key), out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"Cannot msgpack-encode {type(obj).__name__}")
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    out: list = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+def _unpack(data: bytes, pos: int):
+    b = data[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    if b >= 0xe0:
+        return b - 0x100, pos
+    if 0x80 <= b <= 0x8f or b in (0xde, 0xdf):
+        if b <= 0x8f:
+            n = b & 0x0f
+        else:
+            fmt = ">H" if b == 0xde else ">I"
+            n = struct.unpack_from(fmt, data, pos)[0]
+            pos += struct.calcsize(fmt)
+        obj = {}
+        for _ in range(n):
+            key, pos = _unpack(data, pos)
+            obj[key], pos = _unpack(data, pos)
+        return obj, pos
+    if 0x90 <= b <= 0x9f or b in (0xdc, 0xdd):
+        if b <= 0x9f:
+            n = b & 0x0f
+        else:
+            fmt = ">H" if b == 0xdc else ">I"
+            n = struct.unpack_from(fmt, data, pos)[0]
+            pos += struct.calcsize(fmt)
+        arr = []
+        for _ in range(n):
+            item, pos = _unpack(data, pos)
+            arr.append(item)
+        return arr, pos
+    if 0xa0 <= b <= 0xbf or b in (0xd9, 0xda, 0xdb, 0xc4, 0xc5, 0xc6):
+        if b <= 0xbf:
+            n = b & 0x1f
+        else:
+            fmt = {0xd9: ">B", 0xda: ">H", 0xdb: ">I",
+                   0xc4: ">B", 0xc5: ">H", 0xc6: ">I"}[b]
+            n = struct.unpack_from(fmt, data, pos)[0]
+            pos += struct.calcsize(fmt)
+        raw = data[pos:pos + n]
+        if len(raw) < n:
+            raise ValueError(f"Truncated msgpack data: expected {n} bytes at {pos}")
+        pos += n
+        return (bytes(raw) if b in (0xc4, 0xc5, 0xc6) else raw.decode("utf-8")), pos
+    fixed = {0xc0: None, 0xc2: False, 0xc3: True}
+    if b in fixed:
+        return fixed[b], pos
+    fmt = {0xcb: ">d", 0xce: ">I", 0xcf: ">Q", 0xd2: ">i", 0xd3: ">q"}.get(b)
+    if fmt is None:
+        raise ValueError(f"Unsupported msgpack type byte 0x{b:02x}")
+    return struct.unpack_from(fmt, data, pos)[0], pos + struct.calcsize(fmt)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    try:
+        obj, pos = _unpack(data, 0)
+    except (IndexError, struct.error) as e:
+        raise ValueError(f"Truncated msgpack data: {e}") from None
+    if pos != len(data):
+        raise ValueError("Trailing bytes after msgpack value")
+    return obj
+
+
+# ─────────────────────────────────────────────
+# ENCODE / DECODE
+# ─────────────────────────────────────────────
+
+def encode_result(result: Any, encoding: str = "json", pretty: bool = False) -> bytes:
+    if encoding == "msgpack":
+        return msgpack_dumps(result)
+    if pretty:
+        text = json.dumps(result, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+    data = text.encode("utf-8")
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding != "json":
+        raise ValueError(f"Unknown encoding: {encoding}")
+    return data
+
+
+def decode_result(payload: bytes, encoding: str = "json") -> Any:
+    if encoding == "msgpack":
+        return msgpack_loads(payload)
+    if encoding == "gzip":
+        payload = gzip.decompress(payload)
+    return json.loads(payload.decode("utf-8"))
+
+
+def frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """Next length-prefixed payload from `stream`, or None at a clean EOF."""
+    head = stream.read(_LENGTH.size)
+    if not head:
+        return None
+    if len(head) < _LENGTH.size:
+        raise EOFError(f"Frame header truncated: got {len(head)} of {_LENGTH.size} bytes")
+    (n,) = _LENGTH.unpack(head)
+    payload = stream.read(n)
+    if len(payload) < n:
+        raise EOFError(f"Frame truncated: expected {n} bytes, got {len(payload)}")
+    return payload
+
+
+def write_result(result: Any, args: argparse.Namespace,
+                 out: Optional[BinaryIO] = None) -> int:
+    """Writes `result` as selected by add_wire_arguments' flags; returns bytes written."""
+    payload = encode_result(result, args.encoding, args.pretty)
+    if args.framed:
+        payload = frame(payload)
+    elif args.encoding == "json":
+        payload += b"\n"
+    out = out or sys.stdout.buffer
+    out.write(payload)
+    out.flush()
+    return len(payload)
+
+
+def add_wire_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--encoding", choices=ENCODINGS, default="json",
+                    help="result encoding (default: minified JSON)")
+    ap.add_argument("--framed", action="store_true",
+                    help="prefix the result with its 4-byte big-endian length")
+    ap.add_argument("--pretty", action="store_true",
+                    help="indent JSON output for reading")
@@ -0,0 +1,224 @@
+import { spawn } from "child_process";
+import crypto from "crypto";
+import fs from "fs";
+import readline from "readline";
+
+// ─────────────────────────────────────────────────────────────────────────────
+// ASYNC PARSE JOBS
+// Runs `<parser>.py --job` in the background so an upload returns a job id at
+// once. The parser writes one JSON event per line (stage, page progress, CD
+// boundaries, then result / cancelled / error) and stops at the next page
+// boundary when it reads {"type":"cancel"} on stdin. Its deadline (DEADLINE_MS)
+// ends a long parse with a partial result well before the hard timeout cancels
+// it; "page_limits" turns on the per-page governor for this one-job process.
+// Jobs live in memory and are dropped FINISHED_TTL_MS after they finish.
+// ─────────────────────────────────────────────────────────────────────────────
+
+const FINISHED_TTL_MS = 15 * 60 * 1000;
+const HARD_TIMEOUT_MS = 15 * 60 * 1000;
+const CANCEL_GRACE_MS = 10 * 1000;
+const DEADLINE_MS = HARD_TIMEOUT_MS - 60 * 1000;
+
+const jobs = new Map();
+
+const pythonCommand = () =>
+  process.env.NODE_ENV === "production" ? "python3" : "python";
+
+const snapshot = (job) => ({
+  jobId: job.id,
+  kind: job.kind,
+  status: job.status, // running | done | failed | cancelled
+  stage: job.stage,
+  progress: job.progress,
+  boundaries: job.boundaries,
+  cancelRequested: job.cancelRequested,
+  error: job.error,
+  createdAt: job.createdAt,
+  updatedAt: job.updatedAt,
+  ...(job.status === "done" ? { result: job.result } : {}),
+});
+
+const publish = (job, event) => {
+  job.updatedAt = Date.now();
+  const state = snapshot(job);
+  for (const listener of job.listeners) listener(event, state);
+};
+
+const finish = (job, status, fields = {}) => {
+  if (job.status !== "running") return;
+  Object.assign(job, { status, ...fields });
+  clearTimeout(job.timeoutId);
+  clearTimeout(job.killId);
+  job.cleanup();
+  publish(job, { event: status });
+  job.listeners.clear();
+  setTimeout(() => jobs.delete(job.id), FINISHED_TTL_MS).unref();
+};
+
+// `mapResult(parserJson)` turns the parser's result into the API response
+// body, the same shape the synchronous import endpoint returns.
+export const startParseJob = ({
+  kind,
+  scriptPath,
+  filePath,
+  owner,
+  options = {},
+  mapResult,
+}) => {
+  const id = crypto.randomUUID();
+  const job = {
+    id,
+    kind,
+    owner,
+    status: "running",
+    stage: null,
+    progress: null,
+    boundaries: [],
+    cancelRequested: false,
+    result: null,
+    error: null,
+    createdAt: Date.now(),
+    updatedAt: Date.now(),
+    listeners: new Set(),
+    cleanup: () => {
+      try {
+        if (fs.existsSync(filePath)) fs.unlinkSync(filePath);
+      } catch (err) {
+        console.error(`Failed to delete temp file ${filePath}:`, err);
+      }
+    },
+  };
+  jobs.set(id, job);
+
+  const child = spawn(pythonCommand(), [scriptPath, "--job"]);
+  job.child = child;
+  job.timeoutId = setTimeout(() => cancelParseJob(job), HARD_TIMEOUT_MS);
+
+  let errorString = "";
+  child.stderr.on("data", (data) => {
+    errorString += data.toString();
+  });
+  // The parser may exit before reading a late cancel; ignore EPIPE.
+  child.stdin.on("error", () => {});
+  child.stdin.write(
+    JSON.stringify({
+      id,
+      file: filePath,
+      deadline_ms: DEADLINE_MS,
+      page_limits: "on",
+      ...options,
+    }) +
+      "\n",
+  );
+
+  readline.createInterface({ input: child.stdout }).on("line", (line) => {
+    let event;
+    try {
+      event = JSON.parse(line);
+    } catch (e) {
+      return;
+    }
+    switch (event.event) {
+      case "stage":
+        job.stage = event.stage;
+        job.progress = null;
+        break;
+      case "progress":
+        job.progress = { done: event.done, total: event.total };
+        break;
+      case "boundary":
+        job.boundaries.push({ page: event.page, courseCode: event.courseCode });
+        break;
+      case "result": {
+        const body = mapResult(event.result);
+        return body.success
+          ? finish(job, "done", { result: body })
+          : finish(job, "failed", { error: body.message });
+      }
+      case "cancelled":
+        return finish(job, "cancelled");
+      case "error":
+        return finish(job, "failed", { error: event.error });
+      default:
+        break;
+    }
+    publish(job, event);
+  });
+
+  child.on("error", (error) => {
+    finish(job, "failed", {
+      error: `Failed to start Python parser: ${error.message}`,
+    });
+  });
+  child.on("close", (code) => {
+    finish(job, job.cancelRequested ? "cancelled" : "failed", {
+      error: job.cancelRequested
+        ? null
+        : errorString || `Parser exited with code ${code}`,
+    });
+  });
+
+  return job;
+};
+
+// Asks the parser to stop at the next page; SIGKILL if it has not exited
+// within CANCEL_GRACE_MS.
+export const cancelParseJob = (job) => {
+  if (job.status !== "running" || job.cancelRequested) return false;
+  job.cancelRequested = true;
+  job.child.stdin.write(JSON.stringify({ type: "cancel" }) + "\n");
+  job.killId = setTimeout(() => job.child.kill("SIGKILL"), CANCEL_GRACE_MS);
+  publish(job, { event: "cancel_requested" });
+  return true;
+};
+
+const findJob = (req, res, kind) => {
+  const job = jobs.get(req.params.jobId);
+  if (!job || job.kind !== kind || job.owner !== req.id) {
+    res.status(404).json({ success: false, message: "Parse job not found" });
+    return null;
+  }
+  return job;
+};
+
+// ─────────────────────────────────────────────────────────────────────────────
+// ROUTE HANDLERS  (status poll, server-sent events, cancel)
+// ─────────────────────────────────────────────────────────────────────────────
+export const parseJobHandlers = (kind) => ({
+  status: (req, res) => {
+    const job = findJob(req, res, kind);
+    if (job) res.json({ success: true, job: snapshot(job) });
+  },
+
+  events: (req, res) => {
+    const job = findJob(req, res, kind);
+    if (!job) return;
+    res.writeHead(200, {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      Connection: "keep-alive",
+    });
+    const send = (event, state) => {
+      res.write(`event: ${event.event}\n`);
+      res.write(`data: ${JSON.stringify({ event, job: state })}\n\n`);
+      if (state.status !== "running") res.end();
+    };
+    send({ event: "snapshot" }, snapshot(job));
+    if (job.status !== "running") return;
+    job.listeners.add(send);
+    req.on("close", () => job.listeners.delete(send));
+  },
+
+  cancel: (req, res) => {
+    const job = findJob(req, res, kind);
+    if (!job) return;
+    const accepted = cancelParseJob(job);
+    res.status(accepted ? 202 : 409).json({
+      success: accepted,
+      message: accepted
+        ? "Cancellation requested"
+        : `Job is already ${job.cancelRequested ? "cancelling" : job.status}`,
+      job: snapshot(job),
+    });
+  },
+});
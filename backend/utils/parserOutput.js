@@ -0,0 +1,17 @@
+// ─────────────────────────────────────────────────────────────────────────────
+// PARSER OUTPUT
+// Parser results arrive as a 4-byte big-endian length followed by that many
+// bytes of JSON (--framed). Anything else, e.g. an error printed before the
+// parser got that far, falls back to the outermost braces.
+// ─────────────────────────────────────────────────────────────────────────────
+
+export const decodeParserOutput = (output) => {
+  if (output.length >= 4 && output.readUInt32BE(0) === output.length - 4) {
+    return JSON.parse(output.subarray(4).toString("utf8"));
+  }
+  const text = output.toString("utf8");
+  const start = text.indexOf("{");
+  const end = text.lastIndexOf("}") + 1;
+  if (start === -1) throw new Error("No JSON found in parser output");
+  return JSON.parse(text.slice(start, end));
+};